@@ -2,11 +2,23 @@
 """API 路由聚合"""
 from fastapi import APIRouter
 # 新增导入 apiall 路由
-from app.api.endpoints import persons, relationships, apiall
+from app.api.endpoints import persons, relationships, apiall, exports, tree, maintenance
+from app.api.endpoints import persons_async, relationships_async
+from config import Config
 
 api_router = APIRouter()
+# 异步数据库模式：异步读接口注册在同步路由之前，同路径的 GET 请求由异步接口处理
+if Config.API_ASYNC_DB:
+    api_router.include_router(persons_async.router)
+    api_router.include_router(relationships_async.router)
 # 保持原有路由不变
 api_router.include_router(persons.router)
 api_router.include_router(relationships.router)
 # 添加新的 apiall 路由
-api_router.include_router(apiall.router)
\ No newline at end of file
+api_router.include_router(apiall.router)
+# 数据导出路由
+api_router.include_router(exports.router)
+# 家族树子图路由
+api_router.include_router(tree.router)
+# 系统维护路由
+api_router.include_router(maintenance.router)
\ No newline at end of file
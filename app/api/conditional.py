@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""条件 GET（ETag / Last-Modified）：客户端缓存仍然有效时直接返回 304，不加载和序列化数据"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.api.dependencies import get_async_person_service, get_person_service
+from app.services.async_read_service import AsyncPersonService
+from app.services.person_service import PersonService
+
+# 数据版本号计数器（见 StatsService.VERSION_COUNTERS），人员/关系每次写入都会递增
+PERSONS = ('persons_version',)
+RELATIONSHIPS = ('relationships_version',)
+PERSONS_AND_RELATIONSHIPS = PERSONS + RELATIONSHIPS
+
+
+def make_etag(*parts) -> str:
+    """由若干组成部分生成弱 ETag（同一数据的 API 响应与网页层包装后的响应共用）"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def http_date(value: datetime) -> str:
+    """格式化为 HTTP 日期（数据库中的无时区时间按 UTC 处理）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """请求携带的验证器是否仍然有效（If-None-Match 优先，其次 If-Modified-Since）"""
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or etag.removeprefix('W/') in tags
+
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def apply_validators(request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """设置 ETag / Last-Modified 响应头，验证器仍然有效时抛出 304
+
+    Cache-Control: no-cache 要求客户端每次使用缓存前都重新校验（304 的代价只有一次版本号查询），
+    避免浏览器按 Last-Modified 做启发式缓存而读到旧数据。
+    """
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    if is_not_modified(request.headers, etag, last_modified):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def _version_etag(request: Request, counters, values: Mapping[str, int]) -> str:
+    return make_etag(request.url.path, request.url.query, *(values[name] for name in counters))
+
+
+# ========== 同步接口使用的依赖 ==========
+
+def versioned(*counters: str):
+    """列表/统计等接口的条件 GET 依赖：ETag 由请求路径、查询参数和数据版本号生成"""
+    def check_version(request: Request, response: Response,
+                      service: PersonService = Depends(get_person_service)):
+        apply_validators(request, response, _version_etag(request, counters, service.stats.get_counters()))
+
+    return check_version
+
+
+def check_person_version(person_id: int, request: Request, response: Response,
+                         service: PersonService = Depends(get_person_service)):
+    """人员详情的条件 GET 依赖：Last-Modified 取 updated_at，ETag 另含人员数据版本号
+
+    updated_at 只精确到秒，同一秒内的两次修改无法区分，因此 ETag 同时包含 persons_version。
+    人员不存在时不设置验证器（由接口返回 404）。
+    """
+    row = service.get_person_updated_at(person_id)
+    if row is None:
+        return
+    updated_at = row[0]
+    version = service.stats.get_counter('persons_version')
+    apply_validators(request, response, make_etag('person', person_id, updated_at, version), updated_at)
+
+
+# ========== 异步接口使用的依赖 ==========
+
+def versioned_async(*counters: str):
+    """versioned 的异步版本"""
+    async def check_version(request: Request, response: Response,
+                            service: AsyncPersonService = Depends(get_async_person_service)):
+        apply_validators(request, response, _version_etag(request, counters, await service.get_counters()))
+
+    return check_version
+
+
+async def check_person_version_async(person_id: int, request: Request, response: Response,
+                                     service: AsyncPersonService = Depends(get_async_person_service)):
+    """check_person_version 的异步版本"""
+    row = await service.get_person_updated_at(person_id)
+    if row is None:
+        return
+    updated_at = row[0]
+    version = await service.get_counter('persons_version')
+    apply_validators(request, response, make_etag('person', person_id, updated_at, version), updated_at)
@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 """API 依赖项配置：数据库会话、服务实例、权限校验等"""
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.services.database import DatabaseManager
+from app.services.async_read_service import AsyncPersonService, AsyncRelationshipService
 from app.services.person_service import PersonService
 from app.services.relationship_service import RelationshipService
+from app.services.person_import import PersonImportService
+from app.services.tree_service import FamilyTreeService
+from app.services.tree_layout import TreeLayoutService
 from app.models.person import Person
 from config import Config
 
 # 初始化数据库管理器（复用项目配置）
-db_manager = DatabaseManager(Config.SQLALCHEMY_DATABASE_URL)
+db_manager = DatabaseManager(
+    Config.SQLALCHEMY_DATABASE_URL,
+    async_pool_size=Config.ASYNC_DB_POOL_SIZE,
+    async_max_overflow=Config.ASYNC_DB_MAX_OVERFLOW
+)
 
 def get_db() -> Session:
     """获取数据库会话（请求结束后自动关闭）"""
@@ -19,6 +28,11 @@ def get_db() -> Session:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncSession:
+    """获取异步数据库会话（异步读接口使用，请求结束后自动关闭）"""
+    async with db_manager.get_async_session() as db:
+        yield db
+
 def get_person_service(db: Session = Depends(get_db)) -> PersonService:
     """获取人员服务实例"""
     return PersonService(db)
@@ -27,6 +41,26 @@ def get_relationship_service(db: Session = Depends(get_db)) -> RelationshipServi
     """获取关系服务实例"""
     return RelationshipService(db)
 
+def get_person_import_service(db: Session = Depends(get_db)) -> PersonImportService:
+    """获取人员导入服务实例"""
+    return PersonImportService(db)
+
+def get_family_tree_service(db: Session = Depends(get_db)) -> FamilyTreeService:
+    """获取家族树子图服务实例"""
+    return FamilyTreeService(db)
+
+def get_tree_layout_service(db: Session = Depends(get_db)) -> TreeLayoutService:
+    """获取家族树布局服务实例"""
+    return TreeLayoutService(db)
+
+def get_async_person_service(db: AsyncSession = Depends(get_async_db)) -> AsyncPersonService:
+    """获取人员异步读服务实例"""
+    return AsyncPersonService(db, db_manager.get_session)
+
+def get_async_relationship_service(db: AsyncSession = Depends(get_async_db)) -> AsyncRelationshipService:
+    """获取关系异步读服务实例"""
+    return AsyncRelationshipService(db, db_manager.get_session)
+
 def validate_person_exists(person_id: int, service: PersonService = Depends(get_person_service)) -> Person:
     """校验人员ID是否存在，不存在则抛出404异常"""
     person = service.get_person(person_id)
@@ -45,4 +79,16 @@ def validate_relationship_exists(rel_id: int, service: RelationshipService = Dep
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Relationship with ID {rel_id} not found"
         )
-    return rel
\ No newline at end of file
+    return rel
+
+async def validate_person_exists_async(
+        person_id: int, service: AsyncPersonService = Depends(get_async_person_service)
+) -> Person:
+    """校验人员ID是否存在（异步读接口使用），不存在则抛出404异常"""
+    person = await service.get_person(person_id)
+    if not person:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Person with ID {person_id} not found"
+        )
+    return person
\ No newline at end of file
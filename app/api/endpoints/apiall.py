@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Request, Response
-import json
+from fastapi.responses import ORJSONResponse
 from typing import Dict, List, Any
 
 router = APIRouter(tags=["API 信息"])
@@ -7,7 +7,7 @@ router = APIRouter(tags=["API 信息"])
 
 @router.get("/apiall", summary="Get All Api Endpoints")
 def get_all_api_endpoints(request: Request) -> Response:
-    """获取系统中所有 API 的路径、请求方法和摘要信息，返回格式化的 JSON"""
+    """获取系统中所有 API 的路径、请求方法和摘要信息"""
     openapi_schema = request.app.openapi()
     endpoints = []
 
@@ -44,8 +44,5 @@ def get_all_api_endpoints(request: Request) -> Response:
         "groups": groups
     }
 
-    # 返回带缩进的 JSON 响应（关键修改）
-    return Response(
-        content=json.dumps(response_data, ensure_ascii=False, indent=2),
-        media_type="application/json"
-    )
\ No newline at end of file
+    # 紧凑 JSON（需要阅读时由浏览器/客户端格式化）
+    return ORJSONResponse(response_data)
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""数据导出 API 接口"""
+from datetime import datetime
+from typing import Iterator, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.services.gedcom_service import GedcomExporter
+from app.services.ndjson_export import NdjsonExporter, gzip_chunks
+from app.api.dependencies import get_db
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"]
+)
+
+
+def _ndjson_response(request: Request, chunks: Iterator[bytes], filename: str) -> StreamingResponse:
+    """NDJSON 流式响应（客户端声明 Accept-Encoding: gzip 时边读边压缩）"""
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+
+# 1. 导出 GEDCOM（流式输出）
+@router.get("/gedcom")
+def export_gedcom(db: Session = Depends(get_db)):
+    """以 GEDCOM 5.5 格式流式导出全部人员及家庭关系"""
+    exporter = GedcomExporter(db)
+    return StreamingResponse(
+        (chunk.encode("utf-8") for chunk in exporter.iter_gedcom()),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="family_tree.ged"'}
+    )
+
+
+# 2. 导出人员（NDJSON，流式输出）
+@router.get("/persons.ndjson")
+def export_persons_ndjson(
+        request: Request,
+        updated_since: Optional[datetime] = Query(None, description="只导出此时间之后新建或修改的人员（ISO 8601）"),
+        db: Session = Depends(get_db)
+):
+    """按ID升序逐行导出人员，每行一个 JSON 对象（字段同人员详情接口）"""
+    return _ndjson_response(request, NdjsonExporter(db).iter_persons(updated_since), "persons.ndjson")
+
+
+# 3. 导出关系（NDJSON，流式输出）
+@router.get("/relationships.ndjson")
+def export_relationships_ndjson(
+        request: Request,
+        after_id: Optional[int] = Query(None, ge=0, description="只导出ID大于该值的关系（增量同步）"),
+        db: Session = Depends(get_db)
+):
+    """按ID升序逐行导出关系，每行一个 JSON 对象（字段同关系详情接口）"""
+    return _ndjson_response(request, NdjsonExporter(db).iter_relationships(after_id), "relationships.ndjson")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""系统维护 API 接口"""
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from app.schemas import IntegrityScanJob
+from app.services.integrity import integrity_jobs
+from app.api.dependencies import db_manager
+
+router = APIRouter(
+    prefix="/api/maintenance",
+    tags=["maintenance"],
+    default_response_class=ORJSONResponse
+)
+
+
+# 1. 提交关系数据完整性扫描（后台执行）
+@router.post("/integrity-scans", response_model=IntegrityScanJob, status_code=202)
+def submit_integrity_scan(
+        response: Response,
+        sample_limit: int = Query(100, ge=0, le=10000, description="每类问题列出的最多明细条数")
+):
+    """在后台扫描全部人员与关系，立即返回任务；已有扫描在进行时返回该任务"""
+    job = integrity_jobs.submit(db_manager.get_session, sample_limit)
+    response.headers["Location"] = f"{router.prefix}/integrity-scans/{job['job_id']}"
+    return job
+
+
+# 2. 查询完整性扫描任务（完成后带检查报告）
+@router.get("/integrity-scans/{job_id}", response_model=IntegrityScanJob,
+            responses={404: {"description": "Job not found"}})
+def get_integrity_scan(job_id: str):
+    """获取扫描任务的状态，status 为 succeeded 时 report 为检查报告"""
+    job = integrity_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Integrity scan {job_id} not found")
+    return job
@@ -1,24 +1,53 @@
 #!/usr/bin/env python3
 """人员相关 API 接口"""
-from fastapi import APIRouter, Depends, Query, HTTPException
+import io
+import tempfile
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict
 from datetime import date
 from sqlalchemy import and_, or_
 from app.services.person_service import PersonService
+from app.services.relationship_service import RelationshipService
+from app.services.person_import import PersonImportService
 from app.models.person import Person
-from app.api.dependencies import get_person_service, validate_person_exists
+from app.schemas import (
+    Page, PersonOut, PersonGenerations, PersonStats, PersonCreate, PersonUpdate, DescendantCount
+)
+from app.api.dependencies import (
+    get_person_service, get_relationship_service, get_person_import_service, validate_person_exists
+)
+from app.api.conditional import PERSONS, PERSONS_AND_RELATIONSHIPS, versioned, check_person_version
 
 router = APIRouter(
     prefix="/api/persons",
     tags=["persons"],
-    responses={404: {"description": "Person not found"}}
+    responses={404: {"description": "Person not found"}},
+    default_response_class=ORJSONResponse
 )
 
 
+def _page_response(persons: List[Person], total: Optional[int], skip: int, limit: int,
+                   next_cursor: Optional[str]) -> Dict:
+    """分页响应（total 为 None 表示未统计总数；next_cursor 用于获取下一页）
+
+    data 直接返回 ORM 对象，由路由的 response_model 按属性序列化。
+    """
+    return {
+        "data": persons,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
+    }
+
+
 # ========== 具体路由在前 ==========
 
-# 1. 搜索人员（模糊匹配姓名/电话/邮箱/出生地）- 添加分页
-@router.get("/search", response_model=Dict)
+# 1. 搜索人员（全文检索姓名/电话/邮箱/出生地，按相关度排序）- 添加分页
+@router.get("/search", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
 def search_persons(
         keyword: str = Query(..., description="搜索关键词", min_length=1),
         service: PersonService = Depends(get_person_service),
@@ -29,11 +58,10 @@ def search_persons(
     # 添加调试信息
     print(f"🔍 搜索关键词: '{keyword}', skip: {skip}, limit: {limit}")
 
-    persons = service.search_persons(keyword, skip=skip, limit=limit)
-    total = service.count_search_persons(keyword)
+    persons, total = service.search_persons_page(keyword, skip=skip, limit=limit)
 
     return {
-        "data": [p.to_dict() for p in persons],
+        "data": persons,
         "total": total,
         "skip": skip,
         "limit": limit,
@@ -42,178 +70,253 @@ def search_persons(
 
 
 # 2. 按性别筛选人员 - 添加分页
-@router.get("/filter/gender", response_model=Dict)
+@router.get("/filter/gender", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
 def get_persons_by_gender(
         gender: str = Query(..., pattern="^[MF]$", description="性别（M=男，F=女）"),
         service: PersonService = Depends(get_person_service),
         skip: int = Query(0, ge=0, description="跳过条数"),
-        limit: int = Query(10, ge=1, le=1000, description="每页条数")
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
 ):
     """按性别筛选人员"""
-    persons = service.get_persons_by_gender(gender, skip=skip, limit=limit)
-    total = service.count_persons_by_gender(gender)
-
-    return {
-        "data": [p.to_dict() for p in persons],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "has_more": skip + limit < total
-    }
+    try:
+        persons, next_cursor = service.get_persons_page(skip=skip, limit=limit, cursor=cursor, gender=gender)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = service.count_persons_by_gender(gender) if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
 
 
 # 2.5 组合查询人员（支持关键词搜索和性别筛选）
-@router.get("/filter/combined", response_model=Dict)
+@router.get("/filter/combined", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
 def filter_persons_combined(
         keyword: Optional[str] = Query(None, description="搜索关键词"),
         gender: Optional[str] = Query(None, pattern="^[MF]$", description="性别筛选"),
         service: PersonService = Depends(get_person_service),
         skip: int = Query(0, ge=0, description="跳过条数"),
-        limit: int = Query(10, ge=1, le=1000, description="每页条数")
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
 ):
     """组合筛选人员（支持关键词搜索和性别筛选）"""
     try:
         # 调试信息
         print(f"🔍 组合查询 - 关键词: '{keyword}', 性别: '{gender}', skip: {skip}, limit: {limit}")
 
-        persons, total = service.filter_persons_combined(keyword, gender, skip, limit)
-
-        return {
-            "data": [p.to_dict() for p in persons],
-            "total": total,
-            "skip": skip,
-            "limit": limit,
-            "has_more": skip + limit < total
-        }
+        persons, next_cursor, total = service.filter_persons_page(
+            keyword, gender, skip=skip, limit=limit, cursor=cursor, include_total=include_total
+        )
+        return _page_response(persons, total, skip, limit, next_cursor)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ 组合查询失败: {str(e)}")
         raise HTTPException(status_code=500, detail=f"组合查询失败: {str(e)}")
 
 
 # 3. 获取在世人员 - 添加分页
-@router.get("/filter/living", response_model=Dict)
+@router.get("/filter/living", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
 def get_living_persons(
         service: PersonService = Depends(get_person_service),
         skip: int = Query(0, ge=0, description="跳过条数"),
-        limit: int = Query(10, ge=1, le=1000, description="每页条数")
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
 ):
     """获取所有在世人员"""
-    persons = service.get_living_persons(skip=skip, limit=limit)
-    total = service.count_living_persons()
-
-    return {
-        "data": [p.to_dict() for p in persons],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "has_more": skip + limit < total
-    }
+    try:
+        persons, next_cursor = service.get_persons_page(skip=skip, limit=limit, cursor=cursor, is_living=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = service.count_living_persons() if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
 
 
 # 4. 人员统计
-@router.get("/stats", response_model=Dict)
+@router.get("/stats", response_model=PersonStats, dependencies=[Depends(versioned(*PERSONS))])
 def get_person_stats(
         service: PersonService = Depends(get_person_service)
 ):
-    """获取人员统计信息（总数、男女比例、在世人数）"""
-    total = service.count_persons()
-    male = service.count_persons_by_gender("M")
-    female = service.count_persons_by_gender("F")
-    living = service.count_living_persons()
+    """获取人员统计信息（总数、男女比例、在世人数；读取统计计数，一次查询）"""
+    counters = service.get_stats()
+    total = counters["persons_total"]
+    living = counters["persons_living"]
     return {
         "total": total,
-        "male": male,
-        "female": female,
+        "male": counters["persons_male"],
+        "female": counters["persons_female"],
         "living": living,
         "living_rate": round(living / total * 100, 2) if total > 0 else 0
     }
 
 
+# 4.1 按辈分获取人员（同一代按排行排序，一次索引查询）
+@router.get("/generation/{generation}", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
+def get_persons_by_generation(
+        generation: int,
+        service: PersonService = Depends(get_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """获取第 generation 代的全部人员（始祖为第 1 代），按在同父同母兄弟姐妹中的排行、ID 排序"""
+    try:
+        persons, next_cursor = service.get_generation_page(generation, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = service.count_generation(generation) if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
+
+
 # 5. 获取所有人员（支持分页、排序）
-@router.get("", response_model=Dict)
+@router.get("", response_model=Page[PersonOut], dependencies=[Depends(versioned(*PERSONS))])
 def get_all_persons(
         service: PersonService = Depends(get_person_service),
         skip: int = Query(0, ge=0, description="跳过条数"),
         limit: int = Query(10, ge=1, le=1000, description="每页条数"),
-        order_by: str = Query("id", description="排序字段（name/birth_date/id）")
+        order_by: str = Query("id", description="排序字段（name/birth_date/id）"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
 ):
-    """获取人员列表（支持分页和排序）"""
-    persons = service.get_all_persons(skip=skip, limit=limit, order_by=order_by)
-    total = service.count_persons()
-
-    return {
-        "data": [p.to_dict() for p in persons],
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-        "has_more": skip + limit < total
-    }
+    """获取人员列表（支持分页和排序；按 name/birth_date/id 排序时使用游标分页）"""
+    try:
+        persons, next_cursor = service.get_persons_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = service.count_persons() if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
 
 
 # ========== 参数路由在最后 ==========
 
 # 6. 获取单个人员详情
-@router.get("/{person_id}", response_model=Dict)
+@router.get("/{person_id}", response_model=PersonOut, dependencies=[Depends(check_person_version)])
 def get_person(
         person: Person = Depends(validate_person_exists)
 ):
     """根据ID获取人员详情"""
-    return person.to_dict()
+    return person
+
+
+# 6.1 获取祖先（按代数分层）
+@router.get("/{person_id}/ancestors", response_model=PersonGenerations,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_person_ancestors(
+        person: Person = Depends(validate_person_exists),
+        max_depth: int = Query(10, ge=1, le=50, description="最大追溯代数"),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取指定人员的祖先（depth=1 为父母，2 为祖父母……）"""
+    ancestors = service.get_ancestors(person.id, max_depth=max_depth)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "max_depth": max_depth,
+        "total": len(ancestors),
+        "data": ancestors
+    }
+
+
+# 6.2 获取后代（按代数分层）
+@router.get("/{person_id}/descendants", response_model=PersonGenerations,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_person_descendants(
+        person: Person = Depends(validate_person_exists),
+        max_depth: int = Query(10, ge=1, le=50, description="最大向下代数"),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取指定人员的后代（depth=1 为子女，2 为孙辈……）"""
+    descendants = service.get_descendants(person.id, max_depth=max_depth)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "max_depth": max_depth,
+        "total": len(descendants),
+        "data": descendants
+    }
+
+
+# 6.3 后代人数（读取祖先闭包表，一次查询）
+@router.get("/{person_id}/descendants/count", response_model=DescendantCount,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def count_person_descendants(
+        person: Person = Depends(validate_person_exists),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取指定人员的后代总人数及最远代数"""
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        **service.closure.count_descendants(person.id)
+    }
 
 
 # 7. 添加人员
-@router.post("", response_model=Dict, status_code=201)
+@router.post("", response_model=PersonOut, status_code=201)
 def create_person(
-        person_data: Dict,  # 实际项目可使用 Pydantic 模型校验字段
+        person: PersonCreate,
         service: PersonService = Depends(get_person_service)
 ):
-    """添加新人员"""
-    # 基础字段校验（实际可用 Pydantic 替代）
-    required_fields = ["name", "gender", "birth_date", "birth_date_type"]  # 修改：date_type -> birth_date_type
-    for field in required_fields:
-        if field not in person_data:
-            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+    """添加新人员（必填字段及取值由 PersonCreate 校验，未提交的字段使用数据库默认值）"""
+    person_data = person.model_dump(exclude_unset=True)
 
     # 处理 death_date_accuracy 逻辑
-    # 只有在填写了 death_date 时才需要 death_date_accuracy
-    if 'death_date' not in person_data or not person_data.get('death_date'):
-        # 如果没有逝世日期，确保 death_date_accuracy 为 None
-        person_data.pop('death_date_accuracy', None)
-    elif 'death_date_accuracy' not in person_data:
-        # 如果有逝世日期但没有填写精确度，设置默认值
-        person_data['death_date_accuracy'] = 'exact'
+    PersonService.apply_death_date_accuracy_defaults(person_data)
 
     try:
-        person = service.create_person(person_data)
-        return person.to_dict()
+        return service.create_person(person_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# 7.1 批量导入人员（CSV / JSON Lines）
+@router.post("/import", response_model=Dict)
+async def import_persons(
+        request: Request,
+        format: str = Query("csv", pattern="^(csv|ndjson)$", description="文件格式：csv 或 ndjson"),
+        service: PersonImportService = Depends(get_person_import_service)
+):
+    """批量导入人员（请求体为原始文件内容，UTF-8 编码）
+
+    请求体先流式写入临时文件（超过 SPOOL_SIZE 落盘），再逐行解析、分批写入，
+    不会把整个文件读入内存。返回导入统计、失败行明细及行号到新ID的映射。
+    """
+    with tempfile.SpooledTemporaryFile(max_size=PersonImportService.SPOOL_SIZE) as buffer:
+        async for chunk in request.stream():
+            buffer.write(chunk)
+        buffer.seek(0)
+
+        stream = io.TextIOWrapper(buffer, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(service.import_persons, stream, format)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            stream.detach()
+
+
 # 8. 更新人员信息
-@router.put("/{person_id}", response_model=Dict)
+@router.put("/{person_id}", response_model=PersonOut)
 def update_person(
         person_id: int,
-        update_data: Dict,
+        person: PersonUpdate,
         service: PersonService = Depends(get_person_service),
         _: Person = Depends(validate_person_exists)  # 先验证人员存在
 ):
     """更新人员信息（仅传需要修改的字段）"""
+    update_data = person.model_dump(exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
 
     # 处理 death_date_accuracy 逻辑
-    if 'death_date' in update_data:
-        if not update_data['death_date']:
-            # 如果清空了逝世日期，也清空精确度
-            update_data['death_date_accuracy'] = None
-        elif 'death_date_accuracy' not in update_data:
-            # 如果设置了逝世日期但没有精确度，设置默认值
-            update_data['death_date_accuracy'] = 'exact'
-
-    person = service.update_person(person_id, update_data)
-    return person.to_dict()
+    PersonService.apply_death_date_accuracy_defaults(update_data, partial=True)
+
+    return service.update_person(person_id, update_data)
 
 
 # 9. 删除人员
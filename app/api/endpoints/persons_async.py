@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""人员读接口（异步数据库模式，Config.API_ASYNC_DB 开启时注册在同步路由之前）"""
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import ORJSONResponse
+from typing import Optional
+from app.services.async_read_service import AsyncPersonService, AsyncRelationshipService
+from app.models.person import Person
+from app.schemas import Page, PersonOut, PersonGenerations, PersonStats
+from app.api.dependencies import (
+    get_async_person_service, get_async_relationship_service, validate_person_exists_async
+)
+from app.api.endpoints.persons import _page_response
+from app.api.conditional import (
+    PERSONS, PERSONS_AND_RELATIONSHIPS, versioned_async, check_person_version_async
+)
+
+# 路径参数使用 int 转换器：非数字路径（如 /import）不会被这里的路由截获，交给同步路由处理
+router = APIRouter(
+    prefix="/api/persons",
+    tags=["persons"],
+    responses={404: {"description": "Person not found"}},
+    default_response_class=ORJSONResponse
+)
+
+
+# ========== 具体路由在前 ==========
+
+# 1. 搜索人员
+@router.get("/search", response_model=Page[PersonOut], dependencies=[Depends(versioned_async(*PERSONS))])
+async def search_persons(
+        keyword: str = Query(..., description="搜索关键词", min_length=1),
+        service: AsyncPersonService = Depends(get_async_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数")
+):
+    """模糊搜索人员（支持姓名、电话、邮箱、出生地）"""
+    persons, total = await service.search_persons_page(keyword, skip=skip, limit=limit)
+    return {
+        "data": persons,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "has_more": skip + limit < total
+    }
+
+
+# 2. 按性别筛选人员
+@router.get("/filter/gender", response_model=Page[PersonOut], dependencies=[Depends(versioned_async(*PERSONS))])
+async def get_persons_by_gender(
+        gender: str = Query(..., pattern="^[MF]$", description="性别（M=男，F=女）"),
+        service: AsyncPersonService = Depends(get_async_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """按性别筛选人员"""
+    try:
+        persons, next_cursor = await service.get_persons_page(skip=skip, limit=limit, cursor=cursor, gender=gender)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await service.count_persons_filtered(gender=gender) if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
+
+
+# 2.5 组合查询人员
+@router.get("/filter/combined", response_model=Page[PersonOut], dependencies=[Depends(versioned_async(*PERSONS))])
+async def filter_persons_combined(
+        keyword: Optional[str] = Query(None, description="搜索关键词"),
+        gender: Optional[str] = Query(None, pattern="^[MF]$", description="性别筛选"),
+        service: AsyncPersonService = Depends(get_async_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """组合筛选人员（支持关键词搜索和性别筛选）"""
+    try:
+        persons, next_cursor, total = await service.filter_persons_page(
+            keyword, gender, skip=skip, limit=limit, cursor=cursor, include_total=include_total
+        )
+        return _page_response(persons, total, skip, limit, next_cursor)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ 组合查询失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"组合查询失败: {str(e)}")
+
+
+# 3. 获取在世人员
+@router.get("/filter/living", response_model=Page[PersonOut], dependencies=[Depends(versioned_async(*PERSONS))])
+async def get_living_persons(
+        service: AsyncPersonService = Depends(get_async_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """获取所有在世人员"""
+    try:
+        persons, next_cursor = await service.get_persons_page(skip=skip, limit=limit, cursor=cursor, is_living=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await service.count_persons_filtered(is_living=True) if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
+
+
+# 4. 人员统计
+@router.get("/stats", response_model=PersonStats, dependencies=[Depends(versioned_async(*PERSONS))])
+async def get_person_stats(
+        service: AsyncPersonService = Depends(get_async_person_service)
+):
+    """获取人员统计信息（读取统计计数，一次查询）"""
+    counters = await service.get_counters()
+    total = counters["persons_total"]
+    living = counters["persons_living"]
+    return {
+        "total": total,
+        "male": counters["persons_male"],
+        "female": counters["persons_female"],
+        "living": living,
+        "living_rate": round(living / total * 100, 2) if total > 0 else 0
+    }
+
+
+# 5. 获取所有人员
+@router.get("", response_model=Page[PersonOut], dependencies=[Depends(versioned_async(*PERSONS))])
+async def get_all_persons(
+        service: AsyncPersonService = Depends(get_async_person_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(10, ge=1, le=1000, description="每页条数"),
+        order_by: str = Query("id", description="排序字段（name/birth_date/id）"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """获取人员列表（支持分页和排序；按 name/birth_date/id 排序时使用游标分页）"""
+    try:
+        persons, next_cursor = await service.get_persons_page(
+            skip=skip, limit=limit, order_by=order_by, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await service.count_persons_filtered() if include_total else None
+    return _page_response(persons, total, skip, limit, next_cursor)
+
+
+# ========== 参数路由在最后 ==========
+
+# 6. 获取单个人员详情
+@router.get("/{person_id:int}", response_model=PersonOut, dependencies=[Depends(check_person_version_async)])
+async def get_person(
+        person: Person = Depends(validate_person_exists_async)
+):
+    """根据ID获取人员详情"""
+    return person
+
+
+# 6.1 获取祖先（按代数分层）
+@router.get("/{person_id:int}/ancestors", response_model=PersonGenerations,
+            dependencies=[Depends(versioned_async(*PERSONS_AND_RELATIONSHIPS))])
+async def get_person_ancestors(
+        person: Person = Depends(validate_person_exists_async),
+        max_depth: int = Query(10, ge=1, le=50, description="最大追溯代数"),
+        service: AsyncRelationshipService = Depends(get_async_relationship_service)
+):
+    """获取指定人员的祖先（depth=1 为父母，2 为祖父母……）"""
+    ancestors = await service.get_ancestors(person.id, max_depth=max_depth)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "max_depth": max_depth,
+        "total": len(ancestors),
+        "data": ancestors
+    }
+
+
+# 6.2 获取后代（按代数分层）
+@router.get("/{person_id:int}/descendants", response_model=PersonGenerations,
+            dependencies=[Depends(versioned_async(*PERSONS_AND_RELATIONSHIPS))])
+async def get_person_descendants(
+        person: Person = Depends(validate_person_exists_async),
+        max_depth: int = Query(10, ge=1, le=50, description="最大向下代数"),
+        service: AsyncRelationshipService = Depends(get_async_relationship_service)
+):
+    """获取指定人员的后代（depth=1 为子女，2 为孙辈……）"""
+    descendants = await service.get_descendants(person.id, max_depth=max_depth)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "max_depth": max_depth,
+        "total": len(descendants),
+        "data": descendants
+    }
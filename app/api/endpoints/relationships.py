@@ -1,25 +1,114 @@
 #!/usr/bin/env python3
 """关系相关 API 接口"""
 from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import List, Dict, Optional
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Optional, Union
 from app.services.relationship_service import RelationshipService
+from app.services.person_service import PersonService
 from app.models.relationship import Relationship
 from app.models.person import Person
+from app.schemas import Page, RelationshipOut, RelationshipStats, PersonRelationships
+from app.schemas import RelationshipCreate, RelationshipBulkCreate, RelationshipCreated
+from app.schemas import AncestryCheck, FounderDescendants
+from app.schemas import PersonSiblings, PersonCousins
 from app.api.dependencies import (
     get_relationship_service,
     get_person_service,
     validate_person_exists
 )
+from app.api.conditional import RELATIONSHIPS, PERSONS_AND_RELATIONSHIPS, versioned
 
 router = APIRouter(
     prefix="/api/relationships",
     tags=["relationships"],
-    responses={404: {"description": "Relationship not found"}}
+    responses={404: {"description": "Relationship not found"}},
+    default_response_class=ORJSONResponse
 )
 
 
+# 0. 计算两人之间的亲属关系（需在 /{rel_id} 之前注册）
+@router.get("/path", response_model=Dict, dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_relationship_path(
+        from_person_id: int = Query(..., alias="from", description="起点人员ID"),
+        to_person_id: int = Query(..., alias="to", description="目标人员ID"),
+        max_depth: int = Query(30, ge=1, le=100, description="最大搜索步数"),
+        person_service: PersonService = Depends(get_person_service),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """查询最短关系链及称谓（kinship_term 表示 to 是 from 的什么人）"""
+    for person_id in (from_person_id, to_person_id):
+        if not person_service.get_person(person_id):
+            raise HTTPException(status_code=404, detail=f"Person with ID {person_id} not found")
+
+    kinship = service.get_kinship(from_person_id, to_person_id, max_depth=max_depth)
+    if kinship is None:
+        return {
+            "from_person_id": from_person_id,
+            "to_person_id": to_person_id,
+            "found": False
+        }
+
+    return {
+        "from_person_id": from_person_id,
+        "to_person_id": to_person_id,
+        "found": True,
+        **kinship
+    }
+
+
+# 0.1 关系统计（需在 /{rel_id} 之前注册）
+@router.get("/stats", response_model=RelationshipStats, dependencies=[Depends(versioned(*RELATIONSHIPS))])
+def get_relationship_stats(
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取关系统计信息（总关系数及各类型数量；读取统计计数）"""
+    counters = service.stats.get_counters()
+    return {
+        "total_relationships": counters["relationships_total"],
+        "parent": counters["relationships_parent"],
+        "child": counters["relationships_child"],
+        "spouse": counters["relationships_spouse"]
+    }
+
+
+# 0.2 判断是否为祖先（读取祖先闭包表，需在 /{rel_id} 之前注册）
+@router.get("/ancestry", response_model=AncestryCheck, dependencies=[Depends(versioned(*RELATIONSHIPS))])
+def check_ancestry(
+        ancestor_id: int = Query(..., alias="ancestor", description="祖先人员ID"),
+        descendant_id: int = Query(..., alias="descendant", description="后代人员ID"),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """判断 ancestor 是否为 descendant 的祖先（depth 为最近的相隔代数）"""
+    depth = service.closure.ancestry_depth(ancestor_id, descendant_id)
+    return {
+        "ancestor_id": ancestor_id,
+        "descendant_id": descendant_id,
+        "is_ancestor": depth is not None,
+        "depth": depth
+    }
+
+
+# 0.3 各始祖的后代人数（需在 /{rel_id} 之前注册）
+@router.get("/founders", response_model=Page[FounderDescendants],
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_founders(
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: int = Query(100, ge=1, le=1000, description="每页条数"),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取始祖（有后代但没有父母的人）及各自的后代人数，按后代人数从多到少排列"""
+    total = service.closure.count_founders()
+    return {
+        "data": service.closure.get_founder_descendant_counts(skip=skip, limit=limit),
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "has_more": skip + limit < total
+    }
+
+
 # 1. 获取单个关系详情
-@router.get("/{rel_id}", response_model=Dict)
+@router.get("/{rel_id}", response_model=RelationshipOut, dependencies=[Depends(versioned(*RELATIONSHIPS))])
 def get_relationship(
         rel_id: int,
         service: RelationshipService = Depends(get_relationship_service)
@@ -28,53 +117,57 @@ def get_relationship(
     rel = service.get_relationship(rel_id)
     if not rel:
         raise HTTPException(status_code=404, detail=f"Relationship {rel_id} not found")
-    return rel.to_dict()
+    return rel
 
 
-# 2. 获取所有关系
-@router.get("", response_model=List[Dict])
+# 2. 获取所有关系（提供 limit 或 cursor 时分页返回）
+@router.get("", response_model=Union[List[RelationshipOut], Page[RelationshipOut]],
+            dependencies=[Depends(versioned(*RELATIONSHIPS))])
 def get_all_relationships(
-        service: RelationshipService = Depends(get_relationship_service)
+        service: RelationshipService = Depends(get_relationship_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="每页条数（不传则返回全部关系列表）"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        relationship_type: Optional[str] = Query(None, pattern="^(parent|child|spouse)$", description="关系类型筛选"),
+        include_total: bool = Query(True, description="是否统计总数")
 ):
-    """获取所有关系列表"""
-    rels = service.get_all_relationships()
-    return [r.to_dict() for r in rels]
+    """获取关系列表
+
+    不带 limit/cursor 时保持原有行为返回全部关系的列表；
+    带 limit 或 cursor 时按ID游标分页，返回 {data, total, has_more, next_cursor}。
+    """
+    if limit is None and cursor is None:
+        rels = service.get_relationships(relationship_type=relationship_type) if relationship_type \
+            else service.get_all_relationships()
+        return rels
+
+    limit = limit or 100
+    try:
+        rels, next_cursor = service.get_relationships_page(
+            skip=skip, limit=limit, cursor=cursor, relationship_type=relationship_type
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "data": rels,
+        "total": service.count_relationships_filtered(relationship_type) if include_total else None,
+        "skip": skip,
+        "limit": limit,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
+    }
 
 
 # 3. 添加关系（自动创建双向关系）
-@router.post("", response_model=Dict, status_code=201)
+@router.post("", response_model=RelationshipCreated, status_code=201)
 def create_relationship(
-        relationship_data: Dict,
+        relationship: RelationshipCreate,
         service: RelationshipService = Depends(get_relationship_service)
 ):
-    """添加关系（支持 parent/child/spouse，自动创建双向关系）"""
+    """添加关系（支持 parent/child/spouse，自动创建双向关系；字段及关系类型由 RelationshipCreate 校验）"""
+    relationship_data = relationship.model_dump()
     print(f"📥 收到关系创建请求: {relationship_data}")
 
-    required_fields = ["from_person_id", "to_person_id", "relationship_type"]
-    for field in required_fields:
-        if field not in relationship_data:
-            error_msg = f"Missing required field: {field}"
-            print(f"❌ {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-
-    # 校验关系类型合法
-    valid_types = ["parent", "child", "spouse"]
-    if relationship_data["relationship_type"] not in valid_types:
-        error_msg = f"Invalid relationship type. Must be one of {valid_types}"
-        print(f"❌ {error_msg}")
-        raise HTTPException(status_code=400, detail=error_msg)
-
-    # 验证人员ID是否为整数
-    try:
-        from_person_id = int(relationship_data["from_person_id"])
-        to_person_id = int(relationship_data["to_person_id"])
-    except (ValueError, TypeError) as e:
-        error_msg = f"Invalid person ID format: {e}"
-        print(f"❌ {error_msg}")
-        raise HTTPException(status_code=400, detail=error_msg)
-
-    print(f"✅ 请求数据验证通过")
-
     try:
         # 使用新的带追踪的方法
         rel, creation_messages = service.create_relationship_with_tracking(relationship_data)
@@ -86,7 +179,7 @@ def create_relationship(
 
         # 返回结果包含所有创建的关系信息
         return {
-            "relationship": rel.to_dict(),
+            "relationship": rel,
             "creation_messages": creation_messages,
             "total_created": actual_created_count,
             "success": True
@@ -99,6 +192,22 @@ def create_relationship(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 3.1 批量添加关系
+@router.post("/bulk", response_model=Dict, status_code=201)
+def create_relationships_bulk(
+        bulk_data: RelationshipBulkCreate,
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """批量添加关系（请求体：{"relationships": [{from_person_id, to_person_id, relationship_type}, ...]}，最多 10000 条）"""
+    try:
+        result = service.create_relationships_bulk(bulk_data.relationships)
+        print(f"✅ 批量创建完成: {result['succeeded']}/{result['total']} 成功，共创建 {result['total_created']} 个关系")
+        return result
+    except Exception as e:
+        print(f"❌ 批量创建失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # 4. 删除关系（同时删除双向关系）
 @router.delete("/{rel_id}", status_code=204)
 def delete_relationship(
@@ -113,7 +222,8 @@ def delete_relationship(
 
 
 # 5. 获取指定人员的所有关系
-@router.get("/person/{person_id}", response_model=Dict)
+@router.get("/person/{person_id}", response_model=PersonRelationships,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
 def get_person_relationships(
         person: Person = Depends(validate_person_exists),
         service: RelationshipService = Depends(get_relationship_service)
@@ -125,18 +235,44 @@ def get_person_relationships(
         "person_id": person.id,
         "person_name": person.name,
         "relationships": {
-            "parents": [p.to_dict() for p in relationships["parents"]],
-            "spouses": [p.to_dict() for p in relationships["spouses"]],
-            "children": [p.to_dict() for p in relationships["children"]]
+            "parents": relationships["parents"],
+            "spouses": relationships["spouses"],
+            "children": relationships["children"]
         }
     }
 
 
-# 6. 关系统计
-@router.get("/stats", response_model=Dict)
-def get_relationship_stats(
+# 5.1 获取指定人员的兄弟姐妹
+@router.get("/person/{person_id}/siblings", response_model=PersonSiblings,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_person_siblings(
+        person: Person = Depends(validate_person_exists),
         service: RelationshipService = Depends(get_relationship_service)
 ):
-    """获取关系统计信息（总关系数）"""
-    total = service.count_relationships()
-    return {"total_relationships": total}
\ No newline at end of file
+    """获取同父同母（full）与同父异母/同母异父（half）的兄弟姐妹，按出生日期排序"""
+    siblings = service.kin.get_siblings(person.id)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "full": siblings["full"],
+        "half": siblings["half"]
+    }
+
+
+# 5.2 获取指定人员的堂表兄弟姐妹
+@router.get("/person/{person_id}/cousins", response_model=PersonCousins,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_person_cousins(
+        person: Person = Depends(validate_person_exists),
+        degree: int = Query(1, ge=1, le=5, description="堂表亲的代数（1 为堂/表兄弟姐妹，2 为再从兄弟姐妹）"),
+        service: RelationshipService = Depends(get_relationship_service)
+):
+    """获取第 degree 代堂表兄弟姐妹（共同祖先为 degree + 1 代以上的祖辈），按出生日期排序"""
+    cousins = service.kin.get_cousins(person.id, degree=degree)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "degree": degree,
+        "total": len(cousins),
+        "data": cousins
+    }
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""关系读接口（异步数据库模式，Config.API_ASYNC_DB 开启时注册在同步路由之前）"""
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional, Union
+from app.services.async_read_service import AsyncRelationshipService
+from app.models.person import Person
+from app.schemas import Page, RelationshipOut, RelationshipStats, PersonRelationships
+from app.api.dependencies import get_async_relationship_service, validate_person_exists_async
+from app.api.conditional import RELATIONSHIPS, PERSONS_AND_RELATIONSHIPS, versioned_async
+
+# 路径参数使用 int 转换器：/path 等非数字路径交给同步路由处理
+router = APIRouter(
+    prefix="/api/relationships",
+    tags=["relationships"],
+    responses={404: {"description": "Relationship not found"}},
+    default_response_class=ORJSONResponse
+)
+
+
+# 0.1 关系统计
+@router.get("/stats", response_model=RelationshipStats,
+            dependencies=[Depends(versioned_async(*RELATIONSHIPS))])
+async def get_relationship_stats(
+        service: AsyncRelationshipService = Depends(get_async_relationship_service)
+):
+    """获取关系统计信息（总关系数及各类型数量；读取统计计数）"""
+    counters = await service.get_counters()
+    return {
+        "total_relationships": counters["relationships_total"],
+        "parent": counters["relationships_parent"],
+        "child": counters["relationships_child"],
+        "spouse": counters["relationships_spouse"]
+    }
+
+
+# 1. 获取单个关系详情
+@router.get("/{rel_id:int}", response_model=RelationshipOut,
+            dependencies=[Depends(versioned_async(*RELATIONSHIPS))])
+async def get_relationship(
+        rel_id: int,
+        service: AsyncRelationshipService = Depends(get_async_relationship_service)
+):
+    """根据ID获取关系详情"""
+    rel = await service.get_relationship(rel_id)
+    if not rel:
+        raise HTTPException(status_code=404, detail=f"Relationship {rel_id} not found")
+    return rel
+
+
+# 2. 获取关系（分页）
+@router.get("", response_model=Union[List[RelationshipOut], Page[RelationshipOut]],
+            dependencies=[Depends(versioned_async(*RELATIONSHIPS))])
+async def get_all_relationships(
+        service: AsyncRelationshipService = Depends(get_async_relationship_service),
+        skip: int = Query(0, ge=0, description="跳过条数"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="每页条数（不传则返回全部关系列表）"),
+        cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，提供时忽略 skip）"),
+        relationship_type: Optional[str] = Query(None, pattern="^(parent|child|spouse)$", description="关系类型筛选"),
+        include_total: bool = Query(True, description="是否统计总数")
+):
+    """获取关系列表（不带 limit/cursor 时返回全部关系的列表，否则按ID游标分页）"""
+    if limit is None and cursor is None:
+        rels = await service.get_all_relationships(relationship_type=relationship_type)
+        return rels
+
+    limit = limit or 100
+    try:
+        rels, next_cursor = await service.get_relationships_page(
+            skip=skip, limit=limit, cursor=cursor, relationship_type=relationship_type
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "data": rels,
+        "total": await service.count_relationships_filtered(relationship_type) if include_total else None,
+        "skip": skip,
+        "limit": limit,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
+    }
+
+
+# 5. 获取指定人员的所有关系
+@router.get("/person/{person_id:int}", response_model=PersonRelationships,
+            dependencies=[Depends(versioned_async(*PERSONS_AND_RELATIONSHIPS))])
+async def get_person_relationships(
+        person: Person = Depends(validate_person_exists_async),
+        service: AsyncRelationshipService = Depends(get_async_relationship_service)
+):
+    """获取指定人员的所有关系（父母/配偶/子女）"""
+    relationships = await service.get_person_relationships(person.id)
+    return {
+        "person_id": person.id,
+        "person_name": person.name,
+        "relationships": {
+            "parents": relationships["parents"],
+            "spouses": relationships["spouses"],
+            "children": relationships["children"]
+        }
+    }
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""家族树子图 API 接口"""
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
+from app.models.person import Person
+from app.schemas import FamilyTree, TreeLayout
+from app.services.tree_service import FamilyTreeService
+from app.services.tree_layout import TreeLayoutService
+from app.api.dependencies import get_family_tree_service, get_tree_layout_service, validate_person_exists
+from app.api.conditional import PERSONS_AND_RELATIONSHIPS, versioned
+
+router = APIRouter(
+    prefix="/api/tree",
+    tags=["tree"],
+    responses={404: {"description": "Person not found"}},
+    default_response_class=ORJSONResponse
+)
+
+
+# 1. 获取家族树子图
+@router.get("/{person_id}", response_model=FamilyTree,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_family_tree(
+        person: Person = Depends(validate_person_exists),
+        up: int = Query(3, ge=0, le=20, description="向上代数"),
+        down: int = Query(3, ge=0, le=20, description="向下代数"),
+        spouses: bool = Query(True, description="是否包含配偶"),
+        max_nodes: int = Query(500, ge=1, le=5000, description="节点上限（由近及远加入，超出时 truncated 为 true）"),
+        service: FamilyTreeService = Depends(get_family_tree_service)
+):
+    """获取以指定人员为中心的家族树（去重的 nodes + edges，一次请求即可绘制）"""
+    return service.get_tree(person.id, up=up, down=down, spouses=spouses, max_nodes=max_nodes)
+
+
+# 2. 获取家族树布局（节点带坐标）
+@router.get("/{person_id}/layout", response_model=TreeLayout,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_family_tree_layout(
+        person: Person = Depends(validate_person_exists),
+        up: int = Query(3, ge=0, le=20, description="向上代数"),
+        down: int = Query(3, ge=0, le=20, description="向下代数"),
+        spouses: bool = Query(True, description="是否包含配偶"),
+        max_nodes: int = Query(500, ge=1, le=5000, description="节点上限（由近及远加入，超出时 truncated 为 true）"),
+        include_svg: bool = Query(True, description="是否附带 SVG 渲染结果"),
+        service: TreeLayoutService = Depends(get_tree_layout_service)
+):
+    """获取服务端计算好的家族树布局（按代分层，兄弟姐妹按出生先后排列，配偶并排）"""
+    layout = service.get_layout(person.id, up=up, down=down, spouses=spouses, max_nodes=max_nodes)
+    return layout if include_svg else {**layout, "svg": None}
+
+
+# 3. 获取家族树 SVG（静态展示）
+@router.get("/{person_id}/layout.svg", response_class=Response,
+            dependencies=[Depends(versioned(*PERSONS_AND_RELATIONSHIPS))])
+def get_family_tree_svg(
+        person: Person = Depends(validate_person_exists),
+        up: int = Query(3, ge=0, le=20, description="向上代数"),
+        down: int = Query(3, ge=0, le=20, description="向下代数"),
+        spouses: bool = Query(True, description="是否包含配偶"),
+        max_nodes: int = Query(500, ge=1, le=5000, description="节点上限"),
+        service: TreeLayoutService = Depends(get_tree_layout_service)
+):
+    """获取家族树布局的 SVG 渲染结果"""
+    layout = service.get_layout(person.id, up=up, down=down, spouses=spouses, max_nodes=max_nodes)
+    return Response(content=layout["svg"], media_type="image/svg+xml")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""进程内 API 调用：Web 层与 API 同进程部署时，控制器直接调用 API 路由函数，不经过 HTTP"""
+import inspect
+import json
+import logging
+import typing
+from contextlib import ExitStack
+from typing import Annotated, Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from fastapi import HTTPException, params
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessResponse:
+    """进程内调用的响应（提供与 requests.Response 相同的 status_code / headers / json() / text）"""
+
+    def __init__(self, status_code: int, payload: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.headers = Headers(headers=headers or {})
+        self._payload = payload
+
+    def json(self) -> Any:
+        if self._payload is None:
+            raise ValueError("Response has no JSON body")
+        return self._payload
+
+    @property
+    def text(self) -> str:
+        if self._payload is None:
+            return ''
+        return json.dumps(self._payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class InProcessAPIClient:
+    """按方法和路径匹配 API 路由并直接调用路由函数
+
+    路径/查询参数按路由函数的类型注解和 Query 约束校验（与 HTTP 调用一致，校验失败返回 422），
+    路由级 dependencies 先于路由函数参数解析；Depends 依赖在每次调用内按需创建并缓存
+    （与 FastAPI 一致，同一请求共享数据库会话），调用结束后关闭生成器依赖。Request / Response 参数分别对应本次调用的请求（含请求头）
+    和响应头。声明了 response_model 的路由按模型转换返回值（与 HTTP 响应的 JSON 内容一致），
+    不做 JSON 编码。只调用同步路由函数，异步路由跳过。
+    """
+
+    def __init__(self, router):
+        self.router = router
+        # (函数, 参数名) -> 参数校验器
+        self._adapters: Dict[Tuple[Any, str], TypeAdapter] = {}
+        # 路由函数 -> 响应模型转换器
+        self._response_adapters: Dict[Any, TypeAdapter] = {}
+
+    def request(self, method: str, url_path: str, params: Optional[Dict[str, Any]] = None,
+                json_data: Any = None, headers: Optional[Dict[str, str]] = None) -> InProcessResponse:
+        """调用 API（url_path 可带查询字符串），返回 InProcessResponse"""
+        url = urlsplit(url_path)
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+        query.update({key: value for key, value in (params or {}).items() if value is not None})
+
+        route, path_params = self._match(method.upper(), url.path)
+        if route is None:
+            if path_params is None:
+                return InProcessResponse(404, {"detail": "Not Found"})
+            return InProcessResponse(405, {"detail": "Method Not Allowed"})
+
+        request = Request({
+            'type': 'http', 'method': method.upper(), 'path': url.path, 'root_path': '',
+            'query_string': urlencode(query).encode('ascii'),
+            'headers': [(key.lower().encode('latin-1'), str(value).encode('latin-1'))
+                        for key, value in (headers or {}).items()]
+        })
+        response = Response()
+        del response.headers['content-length']
+
+        try:
+            with ExitStack() as stack:
+                context = {'path': path_params, 'query': query, 'body': json_data,
+                           'request': request, 'response': response, 'cache': {}, 'stack': stack}
+                for dependency in route.dependencies:
+                    self._resolve_dependency(dependency, context)
+                result = route.endpoint(**self._solve(route.endpoint, context))
+                # 在依赖（数据库会话）关闭前转换，提交后过期的 ORM 属性仍可重新加载
+                if route.response_model is not None and route.status_code != 204 \
+                        and not isinstance(result, Response):
+                    result = self._serialize(route, result)
+        except HTTPException as e:
+            if e.status_code == 304:
+                return InProcessResponse(304, headers=e.headers)
+            return InProcessResponse(e.status_code, {"detail": e.detail}, e.headers)
+        except ValidationError as e:
+            return InProcessResponse(422, {"detail": e.errors(include_url=False, include_context=False)})
+        except Exception as e:
+            logger.error(f"In-process API call failed: {method} {url_path}: {e}")
+            return InProcessResponse(500, {"detail": "Internal Server Error"})
+
+        if isinstance(result, Response):
+            body = json.loads(result.body) if result.body else None
+            return InProcessResponse(result.status_code, body, dict(result.headers))
+        status_code = route.status_code or 200
+        return InProcessResponse(status_code, None if status_code == 204 else result, dict(response.headers))
+
+    def _match(self, method: str, path: str) -> Tuple[Optional[APIRoute], Optional[Dict[str, Any]]]:
+        """匹配同步路由，返回 (路由, 路径参数)；路径存在但方法不匹配时返回 (None, {})"""
+        scope = {'type': 'http', 'path': path, 'root_path': '', 'method': method}
+        partial = False
+        for route in self.router.routes:
+            if not isinstance(route, APIRoute) or inspect.iscoroutinefunction(route.endpoint):
+                continue
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route, child_scope.get('path_params', {})
+            partial = partial or match == Match.PARTIAL
+        return None, ({} if partial else None)
+
+    def _solve(self, call, context: Dict[str, Any]) -> Dict[str, Any]:
+        """解析函数参数：依赖、路径参数、查询参数、请求体"""
+        kwargs = {}
+        for name, param in inspect.signature(call).parameters.items():
+            default = param.default
+            if isinstance(default, params.Depends):
+                kwargs[name] = self._resolve_dependency(default, context)
+            elif param.annotation is Request:
+                kwargs[name] = context['request']
+            elif param.annotation is Response:
+                kwargs[name] = context['response']
+            elif name in context['path']:
+                kwargs[name] = self._validate(call, name, param, context['path'][name])
+            elif default is inspect.Parameter.empty and self._is_body(param.annotation):
+                body = context['body']
+                kwargs[name] = self._validate(call, name, param, body) if self._is_model(param.annotation) else body
+            else:
+                key = default.alias if isinstance(default, params.Param) and default.alias else name
+                if key in context['query']:
+                    kwargs[name] = self._validate(call, name, param, context['query'][key])
+                elif isinstance(default, params.Param):
+                    if default.is_required():
+                        raise HTTPException(status_code=422, detail=f"Missing query parameter: {key}")
+                    kwargs[name] = default.get_default(call_default_factory=True)
+                elif default is inspect.Parameter.empty:
+                    raise HTTPException(status_code=422, detail=f"Missing query parameter: {key}")
+        return kwargs
+
+    def _resolve_dependency(self, depends: params.Depends, context: Dict[str, Any]) -> Any:
+        """创建依赖（同一次调用内缓存），生成器依赖在调用结束后关闭"""
+        dependency = depends.dependency
+        if depends.use_cache and dependency in context['cache']:
+            return context['cache'][dependency]
+        if inspect.iscoroutinefunction(dependency) or inspect.isasyncgenfunction(dependency):
+            raise TypeError(f"Async dependency {dependency.__name__} cannot be called in-process")
+
+        kwargs = self._solve(dependency, context)
+        if inspect.isgeneratorfunction(dependency):
+            generator = dependency(**kwargs)
+            value = next(generator)
+            context['stack'].callback(generator.close)
+        else:
+            value = dependency(**kwargs)
+        context['cache'][dependency] = value
+        return value
+
+    def _validate(self, call, name: str, param: inspect.Parameter, value: Any) -> Any:
+        """按类型注解及 Query/Path 约束转换并校验参数"""
+        key = (call, name)
+        adapter = self._adapters.get(key)
+        if adapter is None:
+            annotation = Any if param.annotation is inspect.Parameter.empty else param.annotation
+            if isinstance(param.default, params.Param):
+                annotation = Annotated[annotation, param.default]
+            adapter = self._adapters[key] = TypeAdapter(annotation)
+        return adapter.validate_python(value)
+
+    def _serialize(self, route: APIRoute, result: Any) -> Any:
+        """按路由的 response_model 校验返回值（可直接读取 ORM 对象属性）并转换为 JSON 兼容数据"""
+        adapter = self._response_adapters.get(route.endpoint)
+        if adapter is None:
+            adapter = self._response_adapters[route.endpoint] = TypeAdapter(route.response_model)
+        try:
+            value = adapter.validate_python(result, from_attributes=True)
+        except ValidationError as e:
+            # 返回值不符合响应模型属于服务端错误（与 FastAPI 一致返回 500，而不是 422）
+            raise RuntimeError(f"Response validation failed: {e}") from e
+        return adapter.dump_python(value, mode='json', by_alias=True)
+
+    @staticmethod
+    def _is_model(annotation) -> bool:
+        return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+    @classmethod
+    def _is_body(cls, annotation) -> bool:
+        """无默认值的 Pydantic 模型及 dict/list 参数视为 JSON 请求体"""
+        return (cls._is_model(annotation) or annotation in (dict, list)
+                or typing.get_origin(annotation) in (dict, list))
+
+
+_client: Optional[InProcessAPIClient] = None
+
+
+def get_inprocess_client() -> InProcessAPIClient:
+    """获取进程内 API 客户端（首次调用时创建）"""
+    global _client
+    if _client is None:
+        from app.api import api_router
+        _client = InProcessAPIClient(api_router)
+    return _client
@@ -7,6 +7,8 @@ from .base_cli import BaseCLI
 from .person_cli import PersonCLI
 from .relationship_cli import RelationshipCLI
 from .query_cli import QueryCLI
+from .maintenance_cli import MaintenanceCLI
+from .import_export_cli import ImportExportCLI
 from .family_tree_cli import FamilyTreeCLI
 
 __all__ = [
@@ -14,6 +16,8 @@ __all__ = [
     'PersonCLI',
     'RelationshipCLI',
     'QueryCLI',
+    'MaintenanceCLI',
+    'ImportExportCLI',
     'FamilyTreeCLI'
 ]
 
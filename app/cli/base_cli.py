@@ -182,11 +182,16 @@ class BaseCLI(ABC):
         :param order_type: 类型（sibling/child），主要用于日志区分
         :return: 排行称谓映射
         """
-        # 按出生日期从大到小排序（年龄从大到小）
-        sorted_people = sorted(
-            people_list,
-            key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
-        )
+        orders = sorted(person.birth_order or 0 for person in people_list)
+        if orders == list(range(1, len(people_list) + 1)):
+            # 恰好是一组完整的同父同母兄弟姐妹：直接使用已存储的排行
+            sorted_people = sorted(people_list, key=lambda x: x.birth_order)
+        else:
+            # 按出生日期从大到小排序（年龄从大到小）
+            sorted_people = sorted(
+                people_list,
+                key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
+            )
 
         # 排行称谓映射（1-10）
         order_map = {
@@ -213,6 +218,27 @@ class BaseCLI(ABC):
         """计算子女的排行称谓"""
         return self.get_order_title(children, "child")
 
+    def display_siblings(self, person):
+        """显示兄弟姐妹：同父同母的带排行称谓，同父异母/同母异父的注明共同的父亲或母亲"""
+        siblings = self.relationship_service.kin.get_siblings(person.id)
+        full = [sibling for sibling, _ in siblings['full']]
+        if full:
+            print(f"  👫 兄弟姐妹:")
+            # 获取排行称谓（已按出生日期排序）
+            title_map = self.get_sibling_order_title(person, full)
+            for sibling in full:
+                print(f"    — {sibling.name} ({title_map[sibling.id]})")
+
+        if siblings['half']:
+            print(f"  👫 同父异母/同母异父兄弟姐妹:")
+            for sibling, parent_ids in siblings['half']:
+                parents = [self.person_service.get_person(parent_id) for parent_id in parent_ids]
+                if len(parents) == 1:
+                    kind = "同父异母" if parents[0].gender == 'M' else "同母异父"
+                else:
+                    kind = "部分父母相同"
+                print(f"    — {sibling.name} ({kind}，共同父母: {'、'.join(p.name for p in parents)})")
+
     @abstractmethod
     def run(self):
         """运行命令行界面"""
@@ -7,6 +7,8 @@ from .base_cli import BaseCLI
 from .person_cli import PersonCLI
 from .relationship_cli import RelationshipCLI
 from .query_cli import QueryCLI
+from .maintenance_cli import MaintenanceCLI
+from .import_export_cli import ImportExportCLI
 
 
 class FamilyTreeCLI(BaseCLI):
@@ -20,6 +22,8 @@ class FamilyTreeCLI(BaseCLI):
         print("1. 人员管理")
         print("2. 关系管理")
         print("3. 查询统计")
+        print("4. 系统维护")
+        print("5. 导入导出")
         print("0. 退出系统")
         print("=" * 50)
 
@@ -29,7 +33,7 @@ class FamilyTreeCLI(BaseCLI):
 
         while True:
             self.display_menu()
-            choice = self.get_choice("\n请选择操作 (0-3): ", ['0', '1', '2', '3'])
+            choice = self.get_choice("\n请选择操作 (0-5): ", ['0', '1', '2', '3', '4', '5'])
 
             if choice == '0':
                 print("👋 感谢使用，再见！")
@@ -42,4 +46,10 @@ class FamilyTreeCLI(BaseCLI):
                 relationship_cli.run()
             elif choice == '3':
                 query_cli = QueryCLI()
-                query_cli.run()
\ No newline at end of file
+                query_cli.run()
+            elif choice == '4':
+                maintenance_cli = MaintenanceCLI()
+                maintenance_cli.run()
+            elif choice == '5':
+                import_export_cli = ImportExportCLI()
+                import_export_cli.run()
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+导入导出命令行界面
+"""
+
+import os
+
+from app.services.gedcom_service import GedcomExporter, GedcomImporter
+from app.services.person_import import PersonImportService
+from .base_cli import BaseCLI
+
+
+class ImportExportCLI(BaseCLI):
+    """导入导出CLI"""
+
+    def __init__(self):
+        super().__init__()
+        self.person_import_service = PersonImportService(self.session)
+
+    def display_menu(self):
+        """显示导入导出菜单"""
+        print("\n" + "-" * 30)
+        print("          导入导出")
+        print("-" * 30)
+        print("1. 批量导入人员 (CSV / JSON Lines)")
+        print("2. 导入 GEDCOM 文件")
+        print("3. 导出 GEDCOM 文件")
+        print("0. 返回主菜单")
+
+    def _input_file_path(self):
+        """输入文件路径"""
+        path = input("请输入文件路径: ").strip().strip('"')
+        if not path:
+            print("❌ 文件路径不能为空")
+            return None
+        if not os.path.isfile(path):
+            print(f"❌ 文件不存在: {path}")
+            return None
+        return path
+
+    def import_persons(self):
+        """从 CSV / JSON Lines 文件批量导入人员"""
+        path = self._input_file_path()
+        if not path:
+            return
+
+        ext = os.path.splitext(path)[1].lower()
+        fmt = 'ndjson' if ext in ('.ndjson', '.jsonl') else 'csv'
+        print(f"📄 文件格式: {fmt}")
+
+        try:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                result = self.person_import_service.import_persons(f, fmt)
+        except UnicodeDecodeError:
+            print("❌ 文件必须为 UTF-8 编码")
+            return
+        except ValueError as e:
+            print(f"❌ 导入失败: {e}")
+            return
+
+        print(f"\n✅ 导入完成，用时 {result['elapsed_seconds']} 秒")
+        print(f"  总行数: {result['total_rows']}")
+        print(f"  成功: {result['imported']}")
+        print(f"  失败: {result['failed']}")
+        if result['errors']:
+            print("\n❌ 失败明细:")
+            for error in result['errors'][:20]:
+                print(f"  第 {error['row']} 行: {error['error']}")
+            if result['failed'] > 20:
+                print(f"  ... 共 {result['failed']} 行失败")
+
+    def import_gedcom(self):
+        """导入 GEDCOM 5.5 文件（人员及父母/子女/配偶关系）"""
+        path = self._input_file_path()
+        if not path:
+            return
+
+        print("⏳ 正在导入，请稍候...")
+        try:
+            with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                result = GedcomImporter(self.session).import_gedcom(f)
+        except Exception as e:
+            print(f"❌ 导入失败: {e}")
+            return
+
+        print(f"\n✅ 导入完成，用时 {result['elapsed_seconds']} 秒 ({result['persons_per_second']} 人/秒)")
+        print(f"  个人记录: {result['individuals']}")
+        print(f"  家庭记录: {result['families']}")
+        print(f"  新增人员: {result['persons_created']}")
+        print(f"  新增关系: {result['relationships_created']}")
+        if result['skipped']:
+            print(f"\n⚠️  跳过 {result['skipped']} 人（缺少姓名、性别或出生日期）:")
+            for item in result['skipped_details'][:20]:
+                print(f"  {item['xref']} {item['name']}: {item['reason']}")
+            if result['skipped'] > 20:
+                print(f"  ... 共 {result['skipped']} 人")
+
+    def export_gedcom(self):
+        """导出全部人员及家庭关系为 GEDCOM 5.5 文件"""
+        path = input("请输入导出文件路径 (默认 family_tree.ged): ").strip().strip('"') or 'family_tree.ged'
+
+        print("⏳ 正在导出，请稍候...")
+        try:
+            result = GedcomExporter(self.session).export_to_file(path)
+        except Exception as e:
+            print(f"❌ 导出失败: {e}")
+            return
+        print(f"✅ 已导出到 {result['path']}，用时 {result['elapsed_seconds']} 秒")
+
+    def run(self):
+        """运行导入导出界面"""
+        while True:
+            self.display_menu()
+            choice = self.get_choice("\n请选择操作 (0-3): ", ['0', '1', '2', '3'])
+
+            if choice == '0':
+                break
+            elif choice == '1':
+                self.import_persons()
+            elif choice == '2':
+                self.import_gedcom()
+            elif choice == '3':
+                self.export_gedcom()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+系统维护命令行界面
+"""
+
+import orjson
+
+from app.services.integrity import IntegrityScanner
+from app.services.query_plan import QueryPlanChecker
+from .base_cli import BaseCLI
+
+
+class MaintenanceCLI(BaseCLI):
+    """系统维护CLI"""
+
+    def display_menu(self):
+        """显示系统维护菜单"""
+        print("\n" + "-" * 30)
+        print("          系统维护")
+        print("-" * 30)
+        print("1. 校验关系索引一致性")
+        print("2. 重建关系索引")
+        print("3. 重建人员搜索索引")
+        print("4. 统计计数对账")
+        print("5. 检查热点查询执行计划")
+        print("6. 重建祖先闭包表")
+        print("7. 重算辈分与排行")
+        print("8. 关系数据完整性检查")
+        print("0. 返回主菜单")
+
+    def verify_graph_index(self):
+        """校验内存关系索引与数据库是否一致"""
+        result = self.relationship_service.verify_graph_index()
+
+        print("\n🔍 关系索引校验结果:")
+        print(f"  数据库关系数: {result['table_edges']}")
+        print(f"  索引关系数: {result['index_edges']}")
+        if result['consistent']:
+            print("✅ 索引与数据库一致")
+            return
+
+        print(f"❌ 索引缺失 {result['missing_in_index']} 条，多余 {result['stale_in_index']} 条")
+        for from_id, to_id, rel_type in result['missing_samples']:
+            print(f"    缺失: {from_id} → {to_id} ({rel_type})")
+        for from_id, to_id, rel_type in result['stale_samples']:
+            print(f"    多余: {from_id} → {to_id} ({rel_type})")
+        print("💡 可选择「重建关系索引」修复")
+
+    def rebuild_graph_index(self):
+        """重建内存关系索引"""
+        edge_count = self.relationship_service.rebuild_graph_index()
+        print(f"✅ 关系索引已重建，共 {edge_count} 条关系")
+
+    def rebuild_search_index(self):
+        """重建人员全文检索索引"""
+        search_index = self.person_service.search_index
+        search_index.rebuild(self.session)
+        print(f"✅ 人员搜索索引已重建，共 {search_index.document_count()} 人")
+
+    def reconcile_stats(self):
+        """按实际数量校正统计计数"""
+        drift = self.person_service.stats.reconcile()
+        if not drift:
+            print("✅ 统计计数与实际数据一致")
+            return
+        print(f"⚠️  已修正 {len(drift)} 项统计计数:")
+        for name, values in drift.items():
+            print(f"    {name}: {values['stored']} → {values['actual']}")
+
+    def check_query_plans(self):
+        """检查热点查询是否使用预期的索引"""
+        result = QueryPlanChecker(self.session).check()
+        self.session.rollback()
+
+        print("\n🔍 热点查询执行计划:")
+        for query in result['queries']:
+            used = ', '.join(query['used']) or '无（全表扫描）'
+            print(f"  {'✅' if query['ok'] else '❌'} {query['name']}: {used}")
+            if not query['ok']:
+                print(f"      预期索引: {', '.join(query['expected'])}")
+                for line in query['plan']:
+                    print(f"      {line}")
+        if result['ok']:
+            print("✅ 所有热点查询均使用了预期的索引")
+        else:
+            print("💡 请确认已执行数据库迁移（alembic upgrade head），并更新表的统计信息")
+
+    def rebuild_ancestry_closure(self):
+        """按关系表全量重建祖先闭包表"""
+        row_count = self.relationship_service.rebuild_ancestry_closure()
+        print(f"✅ 祖先闭包表已重建，共 {row_count} 条祖先记录")
+
+    def rebuild_generations(self):
+        """按祖先闭包与关系表全量重算辈分与排行"""
+        person_count = self.relationship_service.rebuild_generations()
+        print(f"✅ 辈分与排行已重算，共 {person_count} 人")
+
+    def scan_integrity(self):
+        """扫描全部人员与关系，显示问题汇总，可将完整报告保存为 JSON 文件"""
+        print("⏳ 正在扫描，请稍候...")
+        report = IntegrityScanner(self.session).scan()
+        self.session.rollback()
+
+        print(f"\n🔍 完整性检查结果（{report['persons']} 人，{report['relationships']} 条关系，"
+              f"用时 {report['elapsed_ms']} 毫秒）:")
+        for issue_type, label in IntegrityScanner.ISSUE_TYPES.items():
+            count = report['issue_counts'][issue_type]
+            print(f"  {'✅' if count == 0 else '❌'} {label}: {count}")
+            for issue in report['issues'][issue_type][:5]:
+                if issue_type == 'ancestry_cycle':
+                    print(f"      {issue['size']} 人: {', '.join(map(str, issue['person_ids'][:10]))}")
+                else:
+                    print(f"      关系 {issue['relationship_id']}: {issue['from_person_id']} → "
+                          f"{issue['to_person_id']} ({issue['relationship_type']})")
+        if report['ok']:
+            print("✅ 未发现问题")
+
+        path = input("\n保存 JSON 报告的文件路径（回车跳过）: ").strip().strip('"')
+        if path:
+            try:
+                with open(path, 'wb') as f:
+                    f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            except OSError as e:
+                print(f"❌ 保存失败: {e}")
+                return
+            print(f"✅ 报告已保存到 {path}")
+
+    def run(self):
+        """运行系统维护界面"""
+        while True:
+            self.display_menu()
+            choice = self.get_choice("\n请选择操作 (0-8): ", ['0', '1', '2', '3', '4', '5', '6', '7', '8'])
+
+            if choice == '0':
+                break
+            elif choice == '1':
+                self.verify_graph_index()
+            elif choice == '2':
+                self.rebuild_graph_index()
+            elif choice == '3':
+                self.rebuild_search_index()
+            elif choice == '4':
+                self.reconcile_stats()
+            elif choice == '5':
+                self.check_query_plans()
+            elif choice == '6':
+                self.rebuild_ancestry_closure()
+            elif choice == '7':
+                self.rebuild_generations()
+            elif choice == '8':
+                self.scan_integrity()
@@ -29,11 +29,12 @@ class QueryCLI(BaseCLI):
 
     def show_statistics(self):
         """显示统计信息"""
-        person_count = self.person_service.count_persons()
-        relationship_count = self.relationship_service.count_relationships()
-        male_count = len(self.person_service.get_persons_by_gender('M'))
-        female_count = len(self.person_service.get_persons_by_gender('F'))
-        living_count = len(self.person_service.get_living_persons())
+        counters = self.person_service.get_stats()
+        person_count = counters['persons_total']
+        relationship_count = counters['relationships_total']
+        male_count = counters['persons_male']
+        female_count = counters['persons_female']
+        living_count = counters['persons_living']
 
         print("\n📊 系统统计信息:")
         print(f"  总人数: {person_count}")
@@ -68,7 +69,8 @@ class QueryCLI(BaseCLI):
         if not person:
             return
 
-        relationships = self.relationship_service.get_person_relationships(person.id)
+        details = self.relationship_service.get_person_relationship_details(person.id)
+        relationships = {category: [p for p, _ in entries] for category, entries in details.items()}
         if not any(relationships.values()):
             print("📭 该人员暂无关系数据")
             return
@@ -82,14 +84,11 @@ class QueryCLI(BaseCLI):
                 relationships['parents'],
                 key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
             )
+            parent_rels = {p.id: rel for p, rel in details['parents']}
             for parent in sorted_parents:
-                rel = self.relationship_service.get_relationships(
-                    from_person_id=parent.id,
-                    to_person_id=person.id,
-                    relationship_type='parent'
-                )
-                if rel:
-                    relationship_display = self.format_relationship_display(rel[0].relationship_type, rel[0].sub_type)
+                rel = parent_rels[parent.id]
+                if rel.relationship_type == 'parent':
+                    relationship_display = self.format_relationship_display(rel.relationship_type, rel.sub_type)
                     print(f"    ← {parent.name} ({relationship_display})")
                 else:
                     print(f"    ← {parent.name}")
@@ -109,31 +108,18 @@ class QueryCLI(BaseCLI):
             # 获取子女排行称谓
             child_title_map = self.get_child_order_title(sorted_children)
 
+            child_rels = {c.id: rel for c, rel in details['children']}
             for child in sorted_children:
                 # 获取父母关系类型（父亲/母亲）
-                rel = self.relationship_service.get_relationships(
-                    from_person_id=person.id,
-                    to_person_id=child.id,
-                    relationship_type='parent'
-                )
-                if rel:
-                    relationship_display = self.format_relationship_display(rel[0].relationship_type, rel[0].sub_type)
+                rel = child_rels[child.id]
+                if rel.relationship_type == 'parent':
+                    relationship_display = self.format_relationship_display(rel.relationship_type, rel.sub_type)
                     # 显示格式：（父亲 老大 男）
                     print(f"    → {child.name} ({relationship_display} {child_title_map[child.id]})")
                 else:
                     print(f"    → {child.name} ({child_title_map[child.id]})")
 
-        if relationships['siblings']:
-            print(f"  👫 兄弟姐妹:")
-            # 获取排行称谓
-            title_map = self.get_sibling_order_title(person, relationships['siblings'])
-            # 按年龄排序显示
-            sorted_siblings = sorted(
-                relationships['siblings'],
-                key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
-            )
-            for sibling in sorted_siblings:
-                print(f"    — {sibling.name} ({title_map[sibling.id]})")
+        self.display_siblings(person)
 
     def run(self):
         """运行查询统计界面"""
@@ -118,7 +118,7 @@ class RelationshipCLI(BaseCLI):
 
     def list_all_relationships(self):
         """查看所有关系"""
-        relationships = self.relationship_service.get_all_relationships()
+        relationships = self.relationship_service.get_all_relationships(load_persons=True)
         if not relationships:
             print("📭 暂无关系数据")
             return
@@ -127,8 +127,9 @@ class RelationshipCLI(BaseCLI):
         print("-" * 80)
 
         for rel in relationships:
-            from_person = self.person_service.get_person(rel.from_person_id)
-            to_person = self.person_service.get_person(rel.to_person_id)
+            # 关联人员已随关系行联表加载
+            from_person = rel.from_person
+            to_person = rel.to_person
             if from_person and to_person:
                 relationship_display = self.format_relationship_display(rel.relationship_type, rel.sub_type)
                 print(f"ID: {rel.id}, {from_person.name} → {to_person.name}, 关系: {relationship_display}")
@@ -140,7 +141,8 @@ class RelationshipCLI(BaseCLI):
         if not person:
             return
 
-        relationships = self.relationship_service.get_person_relationships(person.id)
+        details = self.relationship_service.get_person_relationship_details(person.id)
+        relationships = {category: [p for p, _ in entries] for category, entries in details.items()}
 
         if not any(relationships.values()):
             print("📭 该人员暂无关系数据")
@@ -155,14 +157,11 @@ class RelationshipCLI(BaseCLI):
                 relationships['parents'],
                 key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
             )
+            parent_rels = {p.id: rel for p, rel in details['parents']}
             for parent in sorted_parents:
-                rel = self.relationship_service.get_relationships(
-                    from_person_id=parent.id,
-                    to_person_id=person.id,
-                    relationship_type='parent'
-                )
-                if rel:
-                    relationship_display = self.format_relationship_display(rel[0].relationship_type, rel[0].sub_type)
+                rel = parent_rels[parent.id]
+                if rel.relationship_type == 'parent':
+                    relationship_display = self.format_relationship_display(rel.relationship_type, rel.sub_type)
                     print(f"    ← {parent.name} ({relationship_display})")
                 else:
                     print(f"    ← {parent.name}")
@@ -182,31 +181,18 @@ class RelationshipCLI(BaseCLI):
             # 获取子女排行称谓
             child_title_map = self.get_child_order_title(sorted_children)
 
+            child_rels = {c.id: rel for c, rel in details['children']}
             for child in sorted_children:
                 # 获取父母关系类型（父亲/母亲）
-                rel = self.relationship_service.get_relationships(
-                    from_person_id=person.id,
-                    to_person_id=child.id,
-                    relationship_type='parent'
-                )
-                if rel:
-                    relationship_display = self.format_relationship_display(rel[0].relationship_type, rel[0].sub_type)
+                rel = child_rels[child.id]
+                if rel.relationship_type == 'parent':
+                    relationship_display = self.format_relationship_display(rel.relationship_type, rel.sub_type)
                     # 显示格式：（父亲 老大 男）
                     print(f"    → {child.name} ({relationship_display} {child_title_map[child.id]})")
                 else:
                     print(f"    → {child.name} ({child_title_map[child.id]})")
 
-        if relationships['siblings']:
-            print(f"  👫 兄弟姐妹:")
-            # 获取排行称谓
-            title_map = self.get_sibling_order_title(person, relationships['siblings'])
-            # 按年龄排序显示
-            sorted_siblings = sorted(
-                relationships['siblings'],
-                key=lambda x: (x.birth_date.year, x.birth_date.month, x.birth_date.day)
-            )
-            for sibling in sorted_siblings:
-                print(f"    — {sibling.name} ({title_map[sibling.id]})")
+        self.display_siblings(person)
 
     def delete_relationship(self):
         """删除关系（同时删除双向关系）"""
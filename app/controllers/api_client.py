@@ -0,0 +1,164 @@
+"""
+API 客户端 - 人员/关系控制器共用，调用已有的 FastAPI 接口
+"""
+import threading
+import time
+import requests
+from flask import Response, g, has_request_context, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.api.inprocess import get_inprocess_client
+from config import Config
+
+
+class APIClient:
+    """API 客户端工具类
+
+    进程内共享一个 requests.Session：连接池复用 keep-alive 连接，避免每次调用新建 TCP 连接；
+    连接失败及 502/503/504 时对幂等请求（GET/PUT/DELETE）自动重试。
+    连接池大小、超时、重试次数见 Config.API_*。
+    浏览器的 GET 请求携带的条件请求头（If-None-Match / If-Modified-Since）会透传给 API，
+    API 返回 304 时网页层同样直接返回 304（见 apply_api_validators）。
+    """
+
+    # 透传给 API 的条件请求头，及回传给浏览器的验证器响应头
+    CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+    VALIDATOR_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+    # 允许自动重试的请求方法（POST 非幂等，不重试）
+    RETRY_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE'})
+    RETRY_STATUS = (502, 503, 504)
+
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """获取共享会话（首次调用时创建连接池）"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(
+                        total=Config.API_RETRIES,
+                        backoff_factor=Config.API_RETRY_BACKOFF,
+                        status_forcelist=cls.RETRY_STATUS,
+                        allowed_methods=cls.RETRY_METHODS,
+                        raise_on_status=False
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=Config.API_POOL_CONNECTIONS,
+                        pool_maxsize=Config.API_POOL_SIZE,
+                        max_retries=retry
+                    )
+                    session = requests.Session()
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def close(cls):
+        """关闭共享会话及其连接池"""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    @classmethod
+    def _conditional_headers(cls, method):
+        """当前浏览器 GET 请求携带的条件请求头
+
+        只透传给本次网页请求的第一个 API GET 调用：一个页面调用多个 API 时，
+        浏览器的验证器只对应其中一个，不能据此判断整个页面未修改。
+        """
+        if method != 'GET' or not has_request_context() or request.method != 'GET':
+            return {}
+        g.api_get_calls = g.get('api_get_calls', 0) + 1
+        if g.api_get_calls > 1:
+            g.pop('api_not_modified', None)
+            g.pop('api_validators', None)
+            return {}
+        return {name: request.headers[name] for name in cls.CONDITIONAL_HEADERS if name in request.headers}
+
+    @classmethod
+    def _send(cls, method, url_path, data=None, params=None):
+        """发送请求（单进程部署时直接调用 API 路由函数）"""
+        headers = cls._conditional_headers(method)
+        if Config.WEB_API_MODE == 'inprocess':
+            return get_inprocess_client().request(method, url_path, params=params, json_data=data, headers=headers)
+        return cls.get_session().request(
+            method,
+            f"{Config.API_BASE_URL}{url_path}",
+            params=params,
+            json=data,
+            headers=headers,
+            timeout=(Config.API_CONNECT_TIMEOUT, Config.API_READ_TIMEOUT)
+        )
+
+    @classmethod
+    def _remember_validators(cls, response, not_modified=False):
+        """记录 API 返回的验证器，由 apply_api_validators 写入网页层的响应"""
+        if not has_request_context() or request.method != 'GET' or g.get('api_get_calls', 0) > 1:
+            return
+        validators = {name: response.headers[name] for name in cls.VALIDATOR_HEADERS if name in response.headers}
+        if not_modified:
+            g.api_not_modified = validators
+        elif validators:
+            g.api_validators = validators
+
+    @classmethod
+    def _request(cls, method, url_path, data=None, params=None):
+        """统一的请求方法"""
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            return {"success": False, "error": f"不支持的HTTP方法: {method}"}
+
+        try:
+            print(f"🌐 API调用: {method} {url_path}, 参数: {params}")
+            started = time.perf_counter()
+            response = cls._send(method, url_path, data=data, params=params)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"📡 API响应状态: {response.status_code}, 耗时: {elapsed_ms:.1f}ms")
+
+            # 处理响应
+            if response.status_code == 304:  # Not Modified：浏览器缓存仍然有效
+                cls._remember_validators(response, not_modified=True)
+                return {"success": True}
+            elif response.status_code == 204:  # No Content
+                return {"success": True}
+            elif 200 <= response.status_code < 300:
+                cls._remember_validators(response)
+                try:
+                    result = response.json()
+                except ValueError:
+                    return {"success": True}
+                if isinstance(result, dict):
+                    result["success"] = True
+                return result
+            else:
+                error_msg = f"API请求失败: {response.status_code} - {response.text}"
+                print(f"❌ {error_msg}")
+                return {
+                    "success": False,
+                    "error": error_msg
+                }
+
+        except requests.exceptions.RequestException as e:
+            error_msg = f"API请求异常: {str(e)}"
+            print(f"❌ {error_msg}")
+            return {"success": False, "error": error_msg}
+        except Exception as e:
+            error_msg = f"处理响应时发生错误: {str(e)}"
+            print(f"❌ {error_msg}")
+            return {"success": False, "error": error_msg}
+
+
+def apply_api_validators(response):
+    """Flask after_request 钩子：API 返回 304 时网页层也返回 304（不带响应体），否则透传 ETag 等验证器"""
+    not_modified = g.pop('api_not_modified', None)
+    if not_modified is not None:
+        return Response(status=304, headers=not_modified)
+    validators = g.pop('api_validators', None)
+    if validators and response.status_code == 200:
+        response.headers.update(validators)
+    return response
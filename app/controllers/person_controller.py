@@ -1,70 +1,13 @@
 """
 人员控制器 - 直接调用已有的 FastAPI 接口
 """
-import requests
 from flask import Blueprint, jsonify, request
+from app.controllers.api_client import APIClient
+from app.services.person_service import PersonService
 
 # 创建人员相关的蓝图
 person_bp = Blueprint('person', __name__, url_prefix='/api/persons')
 
-# FastAPI 服务地址
-API_BASE_URL = "http://localhost:8000"
-
-
-class APIClient:
-    """API 客户端工具类"""
-
-    @staticmethod
-    def _request(method, url_path, data=None, params=None):
-        """统一的请求方法"""
-        try:
-            url = f"{API_BASE_URL}{url_path}"
-            print(f"🌐 API调用: {method} {url}, 参数: {params}")
-
-            if method.upper() == 'GET':
-                response = requests.get(url, params=params, timeout=10)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=data, timeout=10)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, json=data, timeout=10)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, timeout=10)
-            else:
-                return {"success": False, "error": f"不支持的HTTP方法: {method}"}
-
-            print(f"📡 API响应状态: {response.status_code}")
-
-            # 处理响应
-            if response.status_code == 204:  # No Content
-                return {"success": True}
-            elif response.status_code == 201:  # Created
-                try:
-                    result = response.json()
-                    result["success"] = True
-                    return result
-                except:
-                    return {"success": True}
-            elif 200 <= response.status_code < 300:
-                result = response.json()
-                result["success"] = True
-                return result
-            else:
-                error_msg = f"API请求失败: {response.status_code} - {response.text}"
-                print(f"❌ {error_msg}")
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
-
-        except requests.exceptions.RequestException as e:
-            error_msg = f"API请求异常: {str(e)}"
-            print(f"❌ {error_msg}")
-            return {"success": False, "error": error_msg}
-        except Exception as e:
-            error_msg = f"处理响应时发生错误: {str(e)}"
-            print(f"❌ {error_msg}")
-            return {"success": False, "error": error_msg}
-
 
 def handle_api_response(result):
     """统一处理API响应格式"""
@@ -77,7 +20,8 @@ def handle_api_response(result):
                 "total": result.get('total', 0),
                 "skip": result.get('skip', 0),
                 "limit": result.get('limit', 10),
-                "has_more": result.get('has_more', False)
+                "has_more": result.get('has_more', False),
+                "next_cursor": result.get('next_cursor')
             })
         elif 'success' in result and not result['success']:
             # 错误响应
@@ -90,10 +34,22 @@ def handle_api_response(result):
         "total": len(result) if isinstance(result, list) else 0,
         "skip": 0,
         "limit": 10,
-        "has_more": False
+        "has_more": False,
+        "next_cursor": None
     })
 
 
+def add_pagination_params(params):
+    """透传游标分页参数（cursor、include_total）"""
+    cursor = request.args.get('cursor', '').strip()
+    if cursor:
+        params['cursor'] = cursor
+    include_total = request.args.get('include_total', '').strip()
+    if include_total:
+        params['include_total'] = include_total
+    return params
+
+
 # 人员相关路由
 @person_bp.route('', methods=['GET'])
 def get_all_persons():
@@ -121,6 +77,8 @@ def get_all_persons():
         if gender:
             params['gender'] = gender
 
+        add_pagination_params(params)
+
         # 调用组合查询端点
         result = APIClient._request('GET', '/api/persons/filter/combined', params=params)
 
@@ -142,13 +100,7 @@ def create_person():
         return jsonify({"success": False, "error": "请求体不能为空"})
 
     # 处理 death_date_accuracy 逻辑
-    # 只有在填写了 death_date 时才需要 death_date_accuracy
-    if 'death_date' not in person_data or not person_data.get('death_date'):
-        # 如果没有逝世日期，确保 death_date_accuracy 为 None
-        person_data.pop('death_date_accuracy', None)
-    elif 'death_date_accuracy' not in person_data:
-        # 如果有逝世日期但没有填写精确度，设置默认值
-        person_data['death_date_accuracy'] = 'exact'
+    PersonService.apply_death_date_accuracy_defaults(person_data)
 
     result = APIClient._request('POST', '/api/persons', person_data)
 
@@ -194,13 +146,7 @@ def update_person(person_id):
         return jsonify({"success": False, "error": "更新数据不能为空"})
 
     # 处理 death_date_accuracy 逻辑
-    if 'death_date' in update_data:
-        if not update_data['death_date']:
-            # 如果清空了逝世日期，也清空精确度
-            update_data['death_date_accuracy'] = None
-        elif 'death_date_accuracy' not in update_data:
-            # 如果设置了逝世日期但没有精确度，设置默认值
-            update_data['death_date_accuracy'] = 'exact'
+    PersonService.apply_death_date_accuracy_defaults(update_data, partial=True)
 
     result = APIClient._request('PUT', f'/api/persons/{person_id}', update_data)
     return jsonify(result)
@@ -213,6 +159,22 @@ def delete_person(person_id):
     return jsonify(result)
 
 
+@person_bp.route('/<int:person_id>/ancestors', methods=['GET'])
+def get_person_ancestors(person_id):
+    """获取祖先 - 调用 GET /api/persons/{person_id}/ancestors"""
+    params = {'max_depth': request.args.get('max_depth', 10, type=int)}
+    result = APIClient._request('GET', f'/api/persons/{person_id}/ancestors', params=params)
+    return jsonify(result)
+
+
+@person_bp.route('/<int:person_id>/descendants', methods=['GET'])
+def get_person_descendants(person_id):
+    """获取后代 - 调用 GET /api/persons/{person_id}/descendants"""
+    params = {'max_depth': request.args.get('max_depth', 10, type=int)}
+    result = APIClient._request('GET', f'/api/persons/{person_id}/descendants', params=params)
+    return jsonify(result)
+
+
 @person_bp.route('/search', methods=['GET'])
 def search_persons():
     """搜索人员 - 调用组合查询端点"""
@@ -230,6 +192,8 @@ def search_persons():
         'limit': limit
     }
 
+    add_pagination_params(params)
+
     # 使用组合查询端点
     result = APIClient._request('GET', '/api/persons/filter/combined', params=params)
     return handle_api_response(result)
@@ -252,6 +216,8 @@ def get_persons_by_gender():
         'limit': limit
     }
 
+    add_pagination_params(params)
+
     # 使用组合查询端点
     result = APIClient._request('GET', '/api/persons/filter/combined', params=params)
     return handle_api_response(result)
@@ -269,6 +235,8 @@ def get_living_persons():
         'limit': limit
     }
 
+    add_pagination_params(params)
+
     result = APIClient._request('GET', '/api/persons/filter/living', params=params)
 
     # 处理响应
@@ -276,7 +244,9 @@ def get_living_persons():
         return jsonify({
             "success": True,
             "data": result.get('data', []),
-            "total": result.get('total', 0)
+            "total": result.get('total', 0),
+            "has_more": result.get('has_more', False),
+            "next_cursor": result.get('next_cursor')
         })
     elif isinstance(result, dict) and 'success' in result:
         return jsonify(result)
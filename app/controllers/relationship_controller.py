@@ -1,55 +1,22 @@
 """
 关系控制器 - 直接调用已有的 FastAPI 接口
 """
-import requests
+from urllib.parse import urlencode
 from flask import Blueprint, jsonify, request
+from app.controllers.api_client import APIClient
 
 # 创建关系相关的蓝图
 relationship_bp = Blueprint('relationship', __name__, url_prefix='/api')
 
-# FastAPI 服务地址
-API_BASE_URL = "http://localhost:8000"
-
-
-class APIClient:
-    """API 客户端工具类"""
-
-    @staticmethod
-    def _request(method, url_path, data=None):
-        """统一的请求方法"""
-        try:
-            url = f"{API_BASE_URL}{url_path}"
-            if method.upper() == 'GET':
-                response = requests.get(url, timeout=10)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=data, timeout=10)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, timeout=10)
-            else:
-                return {"success": False, "error": f"不支持的HTTP方法: {method}"}
-
-            # 处理响应
-            if response.status_code == 204:  # No Content
-                return {"success": True}
-            elif 200 <= response.status_code < 300:
-                return response.json()
-            else:
-                return {
-                    "success": False,
-                    "error": f"API请求失败: {response.status_code} - {response.text}"
-                }
-
-        except requests.exceptions.RequestException as e:
-            return {"success": False, "error": f"API请求异常: {str(e)}"}
-        except Exception as e:
-            return {"success": False, "error": f"处理响应时发生错误: {str(e)}"}
-
 
 # 关系相关路由
 @relationship_bp.route('/relationships', methods=['GET'])
 def get_all_relationships():
-    """获取所有关系 - 调用 GET /api/relationships"""
-    result = APIClient._request('GET', '/api/relationships')
+    """获取所有关系 - 调用 GET /api/relationships（透传 skip/limit/cursor 等分页参数）"""
+    params = {key: request.args[key] for key in ('skip', 'limit', 'cursor', 'relationship_type', 'include_total')
+              if request.args.get(key)}
+    url_path = f"/api/relationships?{urlencode(params)}" if params else '/api/relationships'
+    result = APIClient._request('GET', url_path)
     return jsonify(result)
 
 
@@ -70,6 +37,29 @@ def create_relationship():
     return jsonify(result)
 
 
+@relationship_bp.route('/relationships/bulk', methods=['POST'])
+def create_relationships_bulk():
+    """批量创建关系 - 调用 POST /api/relationships/bulk"""
+    bulk_data = request.get_json()
+    if not bulk_data or not bulk_data.get('relationships'):
+        return jsonify({"success": False, "error": "缺少必需字段: relationships"})
+
+    result = APIClient._request('POST', '/api/relationships/bulk', bulk_data)
+    return jsonify(result)
+
+
+@relationship_bp.route('/relationships/path', methods=['GET'])
+def get_relationship_path():
+    """查询两人之间的亲属关系 - 调用 GET /api/relationships/path"""
+    from_person_id = request.args.get('from', type=int)
+    to_person_id = request.args.get('to', type=int)
+    if from_person_id is None or to_person_id is None:
+        return jsonify({"success": False, "error": "缺少必需参数: from / to"})
+
+    result = APIClient._request('GET', f'/api/relationships/path?from={from_person_id}&to={to_person_id}')
+    return jsonify(result)
+
+
 @relationship_bp.route('/relationships/<int:relationship_id>', methods=['GET'])
 def get_relationship(relationship_id):
     """获取关系详情 - 调用 GET /api/relationships/{rel_id}"""
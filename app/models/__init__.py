@@ -4,6 +4,8 @@
 
 from .base import Base
 from .person import Person
-from .relationship import Relationship
+from .relationship import Relationship, RelationshipEdge
+from .stats_counter import StatsCounter
+from .ancestry_closure import AncestryClosure
 
-__all__ = ["Base", "Person", "Relationship"]
\ No newline at end of file
+__all__ = ["Base", "Person", "Relationship", "RelationshipEdge", "StatsCounter", "AncestryClosure"]
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+祖先闭包数据模型
+"""
+
+from sqlalchemy import Column, Integer, Index
+from .base import Base
+
+
+class AncestryClosure(Base):
+    __tablename__ = "ancestry_closure"
+
+    # 每个 (祖先, 后代, 代数) 一行；同一对人员可能经由不同路径相隔不同代数（如近亲通婚），
+    # path_count 记录该代数下的路径条数，删除一条父子关系时按路径数扣减，减到 0 才删除该行
+    ancestor_id = Column(Integer, primary_key=True, autoincrement=False, comment="祖先ID")
+    descendant_id = Column(Integer, primary_key=True, autoincrement=False, comment="后代ID")
+    depth = Column(Integer, primary_key=True, autoincrement=False, comment="相隔代数（1 为父母与子女）")
+    path_count = Column(Integer, nullable=False, default=1, comment="路径条数")
+
+    # 主键覆盖按祖先查询后代；按后代查询祖先使用反向索引
+    __table_args__ = (
+        Index('idx_ancestry_descendant', 'descendant_id', 'ancestor_id', 'depth'),
+    )
+
+    def __repr__(self):
+        return f"<AncestryClosure({self.ancestor_id}->{self.descendant_id}, depth={self.depth})>"
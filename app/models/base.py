@@ -3,8 +3,11 @@
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 Base = declarative_base()
 
@@ -12,7 +15,18 @@ Base = declarative_base()
 class DatabaseManager:
     """数据库管理类"""
 
-    def __init__(self, database_url: str, echo: bool = False):
+    # 同步驱动 -> 异步驱动
+    ASYNC_DRIVERS = {
+        'mysql': 'mysql+aiomysql',
+        'mysql+pymysql': 'mysql+aiomysql',
+        'sqlite': 'sqlite+aiosqlite',
+        'sqlite+pysqlite': 'sqlite+aiosqlite'
+    }
+
+    def __init__(self, database_url: str, echo: bool = False,
+                 async_pool_size: int = 20, async_max_overflow: int = 40):
+        self.database_url = database_url
+        self.echo = echo
         self.engine = create_engine(
             database_url,
             echo=echo,
@@ -21,10 +35,58 @@ class DatabaseManager:
         )
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
 
+        # 异步引擎按需创建（未启用异步模式时无需安装异步驱动）
+        self.async_pool_size = async_pool_size
+        self.async_max_overflow = async_max_overflow
+        self._async_engine = None
+        self._AsyncSessionLocal = None
+
     def create_tables(self):
         """创建所有数据表"""
         Base.metadata.create_all(bind=self.engine)
 
     def get_session(self):
         """获取数据库会话"""
-        return self.SessionLocal()
\ No newline at end of file
+        return self.SessionLocal()
+
+    @classmethod
+    def to_async_url(cls, database_url: str):
+        """将同步数据库URL转换为对应的异步驱动URL"""
+        url = make_url(database_url)
+        if url.drivername in cls.ASYNC_DRIVERS.values():
+            return url
+        driver = cls.ASYNC_DRIVERS.get(url.drivername)
+        if driver is None:
+            raise ValueError(f"No async driver configured for '{url.drivername}'")
+        return url.set(drivername=driver)
+
+    @property
+    def async_engine(self):
+        """异步引擎（首次访问时创建）"""
+        if self._async_engine is None:
+            url = self.to_async_url(self.database_url)
+            options = {'echo': self.echo, 'pool_pre_ping': True, 'pool_recycle': 3600}
+            if url.get_backend_name() != 'sqlite':
+                options.update(pool_size=self.async_pool_size, max_overflow=self.async_max_overflow)
+            elif url.database not in (None, '', ':memory:'):
+                # aiosqlite 文件库默认不使用连接池，每个会话都要新开连接（及其驱动线程）
+                options.update(poolclass=AsyncAdaptedQueuePool,
+                               pool_size=self.async_pool_size, max_overflow=self.async_max_overflow)
+            self._async_engine = create_async_engine(url, **options)
+            self._AsyncSessionLocal = async_sessionmaker(
+                self._async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return self._async_engine
+
+    def get_async_session(self) -> AsyncSession:
+        """获取异步数据库会话"""
+        if self._AsyncSessionLocal is None:
+            _ = self.async_engine
+        return self._AsyncSessionLocal()
+
+    async def dispose_async_engine(self):
+        """关闭异步连接池"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._AsyncSessionLocal = None
@@ -33,10 +33,24 @@ class Person(Base):
     is_living = Column(Boolean, default=True, comment="是否在世")
     biography = Column(Text, comment="生平简介")
 
+    # 辈分与排行（由 GenerationService 随父子关系、出生日期的变化维护；为空表示尚未计算）
+    generation = Column(Integer, default=1, comment="辈分：所在世代（没有父母记录的人为第 1 代）")
+    birth_order = Column(Integer, default=1, comment="排行：在同父同母的兄弟姐妹中的出生顺序")
+
     # 时间戳
     created_at = Column(TIMESTAMP, default=func.now(), comment="创建时间")
     updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), comment="更新时间")
 
+    # 创建索引（InnoDB / SQLite 的二级索引都隐含主键，可直接满足按 (列, id) 的排序和游标分页）
+    __table_args__ = (
+        Index('idx_person_name', 'name'),
+        Index('idx_person_birth_date', 'birth_date'),
+        Index('idx_person_gender', 'gender'),
+        Index('idx_person_is_living', 'is_living'),
+        Index('idx_person_updated_at', 'updated_at'),
+        Index('idx_person_generation_birth_order', 'generation', 'birth_order'),
+    )
+
     def __repr__(self):
         return f"<Person(id={self.id}, name='{self.name}', gender='{self.gender}')>"
 
@@ -58,6 +72,8 @@ class Person(Base):
             'avatar_path': self.avatar_path,
             'is_living': self.is_living,
             'biography': self.biography,
+            'generation': self.generation,
+            'birth_order': self.birth_order,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -1,9 +1,14 @@
 """
 关系数据模型 - 修复双向关系显示版本
+
+每条家庭关系只存一行（父母→子女为 parent，配偶按 ID 小→大为 spouse），
+读取时由 RelationshipEdge 展开为两个方向（子女→父母的 child 关系、配偶的另一方向）。
 """
 
+from typing import List, Tuple
+
 from sqlalchemy import Column, Integer, String, ForeignKey, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, backref
 from .base import Base
 
 
@@ -13,22 +18,124 @@ class Relationship(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, comment="Relationship ID")
     from_person_id = Column(Integer, ForeignKey('persons.id'), nullable=False, comment="Source person ID")
     to_person_id = Column(Integer, ForeignKey('persons.id'), nullable=False, comment="Target person ID")
-    relationship_type = Column(String(20), nullable=False, comment="Relationship type: parent, child, spouse")
-    sub_type = Column(String(20), comment="Relationship sub-type: father, mother, son, daughter, husband, wife")
+    relationship_type = Column(String(20), nullable=False, comment="Relationship type: parent, spouse")
+    sub_type = Column(String(20), comment="Relationship sub-type: father, mother, husband, wife")
+    opposite_sub_type = Column(String(20), comment="Sub-type of the reverse direction: son, daughter, husband, wife")
 
-    # 关系引用
-    from_person = relationship("Person", foreign_keys=[from_person_id], backref="outgoing_relationships")
-    to_person = relationship("Person", foreign_keys=[to_person_id], backref="incoming_relationships")
+    # 关系引用：默认按需加载，需要关联人员的查询用 relationship_edges.with_persons 联表带出
+    # （列表、存在性检查等只用ID的查询不联表）；人员上的关系集合按需加载
+    from_person = relationship(
+        "Person", foreign_keys=[from_person_id],
+        backref=backref("outgoing_relationships", lazy="select")
+    )
+    to_person = relationship(
+        "Person", foreign_keys=[to_person_id],
+        backref=backref("incoming_relationships", lazy="select")
+    )
 
-    # 创建索引
+    # 创建索引：(from, to, type) 唯一，同一关系只能存在一行（也覆盖按 from_person_id 的查询）；
+    # 按 to_person_id 查询的索引带上 relationship_type / from_person_id，无需回表
     __table_args__ = (
-        Index('idx_relationship_from_to', 'from_person_id', 'to_person_id'),
+        Index('uq_relationship_from_to_type', 'from_person_id', 'to_person_id', 'relationship_type', unique=True),
+        Index('idx_relationship_to_type_from', 'to_person_id', 'relationship_type', 'from_person_id'),
         Index('idx_relationship_type', 'relationship_type'),
     )
 
+    # 关系类型 -> 反方向的关系类型
+    OPPOSITE_TYPES = {'parent': 'child', 'child': 'parent', 'spouse': 'spouse'}
+    # 存储的关系类型（child 关系存为反方向的 parent 行）
+    STORED_TYPES = ('parent', 'spouse')
+
     def __repr__(self):
         return f"<Relationship(id={self.id}, {self.from_person_id}->{self.to_person_id}, {self.relationship_type})>"
 
+    @classmethod
+    def canonical(cls, from_person_id: int, to_person_id: int, relationship_type: str) -> Tuple[int, int, str, bool]:
+        """某个方向的关系对应的存储行 (from, to, type)，以及该方向是否为存储行的反方向"""
+        if relationship_type == 'child' or (relationship_type == 'spouse' and from_person_id > to_person_id):
+            return to_person_id, from_person_id, cls.OPPOSITE_TYPES[relationship_type], True
+        return from_person_id, to_person_id, relationship_type, False
+
+    @classmethod
+    def edge_types(cls, relationship_type: str) -> Tuple[str, str]:
+        """一行存储的关系展开后两个方向的关系类型"""
+        return relationship_type, cls.OPPOSITE_TYPES.get(relationship_type, relationship_type)
+
+    @staticmethod
+    def edge_id(link_id: int, reverse: bool) -> int:
+        """方向关系的ID：存储行ID × 2（正方向）或 × 2 + 1（反方向）"""
+        return link_id * 2 + (1 if reverse else 0)
+
+    @staticmethod
+    def split_edge_id(edge_id: int) -> Tuple[int, bool]:
+        """由方向关系的ID得到 (存储行ID, 是否反方向)"""
+        return edge_id // 2, edge_id % 2 == 1
+
+    def edge(self, reverse: bool = False) -> "RelationshipEdge":
+        """本行的一个方向"""
+        return RelationshipEdge(self, reverse)
+
+    def edges(self) -> List["RelationshipEdge"]:
+        """本行的两个方向"""
+        return [RelationshipEdge(self, False), RelationshipEdge(self, True)]
+
+    def to_dict(self):
+        """转换为字典格式"""
+        return {
+            'id': self.id,
+            'from_person_id': self.from_person_id,
+            'to_person_id': self.to_person_id,
+            'relationship_type': self.relationship_type,
+            'sub_type': self.sub_type,
+            'opposite_sub_type': self.opposite_sub_type
+        }
+
+
+class RelationshipEdge:
+    """关系的一个方向（只读）
+
+    字段与每个方向各存一行时的关系行一致：ID 由存储行ID导出（见 Relationship.edge_id），
+    反方向交换 from/to，类型取反方向类型（parent → child），子类型取 opposite_sub_type。
+    """
+
+    __slots__ = ('link', 'reverse')
+
+    def __init__(self, link: Relationship, reverse: bool = False):
+        self.link = link
+        self.reverse = reverse
+
+    @property
+    def id(self) -> int:
+        return Relationship.edge_id(self.link.id, self.reverse)
+
+    @property
+    def from_person_id(self) -> int:
+        return self.link.to_person_id if self.reverse else self.link.from_person_id
+
+    @property
+    def to_person_id(self) -> int:
+        return self.link.from_person_id if self.reverse else self.link.to_person_id
+
+    @property
+    def relationship_type(self) -> str:
+        return Relationship.OPPOSITE_TYPES[self.link.relationship_type] if self.reverse \
+            else self.link.relationship_type
+
+    @property
+    def sub_type(self):
+        return self.link.opposite_sub_type if self.reverse else self.link.sub_type
+
+    @property
+    def from_person(self):
+        return self.link.to_person if self.reverse else self.link.from_person
+
+    @property
+    def to_person(self):
+        return self.link.from_person if self.reverse else self.link.to_person
+
+    def __repr__(self):
+        return f"<RelationshipEdge(id={self.id}, {self.from_person_id}->{self.to_person_id}, {self.relationship_type})>"
+
     def to_dict(self):
         """转换为字典格式"""
         return {
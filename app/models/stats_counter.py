@@ -0,0 +1,18 @@
+"""
+统计计数数据模型
+"""
+
+from sqlalchemy import Column, String, BigInteger, TIMESTAMP
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class StatsCounter(Base):
+    __tablename__ = "stats_counters"
+
+    name = Column(String(50), primary_key=True, comment="计数器名称")
+    value = Column(BigInteger, nullable=False, default=0, comment="计数值")
+    updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    def __repr__(self):
+        return f"<StatsCounter(name='{self.name}', value={self.value})>"
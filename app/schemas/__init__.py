@@ -0,0 +1,27 @@
+"""
+接口数据模型包（Pydantic）
+"""
+
+from .common import Page
+from .person import (
+    PersonOut, PersonWithDepth, PersonGenerations, PersonStats, PersonCreate, PersonUpdate
+)
+from .relationship import (
+    RelationshipOut, RelationshipStats, RelationshipGroups, PersonRelationships,
+    KinPerson, PersonSiblings, PersonCousins,
+    RelationshipCreate, RelationshipBulkCreate, RelationshipCreated,
+    AncestryCheck, DescendantCount, FounderDescendants
+)
+from .tree import TreeNode, TreeEdge, FamilyTree, TreeLayoutNode, TreeLayout
+from .maintenance import IntegrityReport, IntegrityScanJob
+
+__all__ = [
+    "Page",
+    "PersonOut", "PersonWithDepth", "PersonGenerations", "PersonStats", "PersonCreate", "PersonUpdate",
+    "RelationshipOut", "RelationshipStats", "RelationshipGroups", "PersonRelationships",
+    "KinPerson", "PersonSiblings", "PersonCousins",
+    "RelationshipCreate", "RelationshipBulkCreate", "RelationshipCreated",
+    "AncestryCheck", "DescendantCount", "FounderDescendants",
+    "TreeNode", "TreeEdge", "FamilyTree", "TreeLayoutNode", "TreeLayout",
+    "IntegrityReport", "IntegrityScanJob",
+]
@@ -0,0 +1,19 @@
+"""
+通用接口数据模型
+"""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """分页响应（total 为 None 表示未统计总数；next_cursor 用于获取下一页）"""
+    data: List[T]
+    total: Optional[int] = None
+    skip: int = 0
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = None
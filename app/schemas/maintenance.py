@@ -0,0 +1,32 @@
+"""
+系统维护接口数据模型
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class IntegrityReport(BaseModel):
+    """关系数据完整性检查报告（issues 中每类问题最多列出 sample_limit 条明细）"""
+    ok: bool
+    scanned_at: str
+    elapsed_ms: int
+    persons: int
+    relationships: int
+    parent_links: int
+    issue_total: int
+    issue_counts: Dict[str, int]
+    issues: Dict[str, List[Dict[str, Any]]]
+
+
+class IntegrityScanJob(BaseModel):
+    """完整性扫描后台任务（成功后 report 为检查报告，失败时 error 为错误信息）"""
+    job_id: str
+    status: Literal['pending', 'running', 'succeeded', 'failed']
+    sample_limit: int
+    submitted_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    report: Optional[IntegrityReport] = None
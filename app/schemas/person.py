@@ -0,0 +1,114 @@
+"""
+人员接口数据模型
+"""
+
+from datetime import date, datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+Gender = Literal['M', 'F']
+DateType = Literal['solar', 'lunar']
+DateAccuracy = Literal['exact', 'year_month', 'year_only']
+
+
+class PersonOut(BaseModel):
+    """人员（直接从 ORM 对象属性读取，字段与 Person.to_dict 一致）"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    gender: str
+    birth_date: Optional[date] = None
+    birth_date_type: Optional[str] = None
+    birth_date_accuracy: Optional[str] = None
+    death_date: Optional[date] = None
+    death_date_type: Optional[str] = None
+    death_date_accuracy: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    birth_place: Optional[str] = None
+    avatar_path: Optional[str] = None
+    is_living: Optional[bool] = None
+    biography: Optional[str] = None
+    generation: Optional[int] = None
+    birth_order: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class PersonWithDepth(PersonOut):
+    """祖先/后代中的人员（depth 为与查询人员相隔的代数，generation 仍为人员本身的世代）"""
+    depth: int
+
+    @model_validator(mode='before')
+    @classmethod
+    def _from_entry(cls, value):
+        """接受服务层返回的 (人员, 代数) 元组"""
+        if isinstance(value, tuple):
+            person, depth = value
+            value = {name: getattr(person, name) for name in PersonOut.model_fields}
+            value['depth'] = depth
+        return value
+
+
+class PersonGenerations(BaseModel):
+    """祖先/后代查询结果"""
+    person_id: int
+    person_name: str
+    max_depth: int
+    total: int
+    data: List[PersonWithDepth]
+
+
+class PersonStats(BaseModel):
+    """人员统计"""
+    total: int
+    male: int
+    female: int
+    living: int
+    living_rate: float
+
+
+class PersonCreate(BaseModel):
+    """新建人员请求体（未提交的字段使用数据库默认值）"""
+    name: str = Field(..., min_length=1, max_length=100)
+    gender: Gender
+    birth_date: date
+    birth_date_type: DateType
+    birth_date_accuracy: Optional[DateAccuracy] = None
+    death_date: Optional[date] = None
+    death_date_type: Optional[DateType] = None
+    death_date_accuracy: Optional[DateAccuracy] = None
+    phone: Optional[str] = Field(None, max_length=20)
+    email: Optional[str] = Field(None, max_length=100)
+    birth_place: Optional[str] = Field(None, max_length=200)
+    avatar_path: Optional[str] = Field(None, max_length=500)
+    is_living: Optional[bool] = None
+    biography: Optional[str] = None
+
+
+class PersonUpdate(BaseModel):
+    """更新人员请求体（仅包含需要修改的字段）"""
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    gender: Optional[Gender] = None
+    birth_date: Optional[date] = None
+    birth_date_type: Optional[DateType] = None
+    birth_date_accuracy: Optional[DateAccuracy] = None
+    death_date: Optional[date] = None
+    death_date_type: Optional[DateType] = None
+    death_date_accuracy: Optional[DateAccuracy] = None
+    phone: Optional[str] = Field(None, max_length=20)
+    email: Optional[str] = Field(None, max_length=100)
+    birth_place: Optional[str] = Field(None, max_length=200)
+    avatar_path: Optional[str] = Field(None, max_length=500)
+    is_living: Optional[bool] = None
+    biography: Optional[str] = None
+
+    @field_validator('name', 'gender', 'birth_date', 'birth_date_type')
+    @classmethod
+    def _not_null(cls, value):
+        """必填列可以不提交，但不能显式置为 null"""
+        if value is None:
+            raise ValueError('不能为空')
+        return value
@@ -0,0 +1,124 @@
+"""
+关系接口数据模型
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from .person import PersonOut
+
+RelationshipType = Literal['parent', 'child', 'spouse']
+
+
+class RelationshipOut(BaseModel):
+    """关系的一个方向（直接从 RelationshipEdge 属性读取，字段与 RelationshipEdge.to_dict 一致）"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    from_person_id: int
+    to_person_id: int
+    relationship_type: str
+    sub_type: Optional[str] = None
+
+
+class RelationshipStats(BaseModel):
+    """关系统计"""
+    total_relationships: int
+    parent: int
+    child: int
+    spouse: int
+
+
+class RelationshipGroups(BaseModel):
+    """按类别分组的关联人员"""
+    parents: List[PersonOut]
+    spouses: List[PersonOut]
+    children: List[PersonOut]
+
+
+class KinPerson(PersonOut):
+    """旁系亲属（附带共同的父母或祖先）"""
+    common_ancestor_ids: List[int]
+
+    @model_validator(mode='before')
+    @classmethod
+    def _from_entry(cls, value):
+        """接受服务层返回的 (人员, 共同父母/祖先ID) 元组"""
+        if isinstance(value, tuple):
+            person, common_ancestor_ids = value
+            value = {name: getattr(person, name) for name in PersonOut.model_fields}
+            value['common_ancestor_ids'] = common_ancestor_ids
+        return value
+
+
+class PersonSiblings(BaseModel):
+    """兄弟姐妹（full 为同父同母，half 为同父异母/同母异父；common_ancestor_ids 为共同的父母）"""
+    person_id: int
+    person_name: str
+    full: List[KinPerson]
+    half: List[KinPerson]
+
+
+class PersonCousins(BaseModel):
+    """堂表兄弟姐妹（common_ancestor_ids 为共同的祖先）"""
+    person_id: int
+    person_name: str
+    degree: int
+    total: int
+    data: List[KinPerson]
+
+
+class PersonRelationships(BaseModel):
+    """指定人员的所有关系"""
+    person_id: int
+    person_name: str
+    relationships: RelationshipGroups
+
+
+class RelationshipCreate(BaseModel):
+    """新建关系请求体"""
+    from_person_id: int
+    to_person_id: int
+    relationship_type: RelationshipType
+
+
+class RelationshipBulkCreate(BaseModel):
+    """批量新建关系请求体
+
+    单条关系不在这里校验：create_relationships_bulk 逐条校验并在结果中返回每条的失败原因，
+    一条数据有误不影响其他关系。
+    """
+    relationships: List[Dict[str, Any]] = Field(..., min_length=1, max_length=10000)
+
+
+class RelationshipCreated(BaseModel):
+    """新建关系结果"""
+    relationship: RelationshipOut
+    creation_messages: List[str]
+    total_created: int
+    success: bool = True
+
+
+class AncestryCheck(BaseModel):
+    """祖先判断结果（depth 为最近的相隔代数，不是祖先时为空）"""
+    ancestor_id: int
+    descendant_id: int
+    is_ancestor: bool
+    depth: Optional[int] = None
+
+
+class DescendantCount(BaseModel):
+    """后代人数"""
+    person_id: int
+    person_name: str
+    descendant_count: int
+    max_depth: int
+
+
+class FounderDescendants(BaseModel):
+    """始祖及其后代人数"""
+    person_id: int
+    name: str
+    descendant_count: int
+    max_depth: int
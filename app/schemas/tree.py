@@ -0,0 +1,56 @@
+"""
+家族树子图接口数据模型
+"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TreeNode(BaseModel):
+    """子图节点（只包含绘图所需的字段）"""
+    id: int
+    name: str
+    gender: str
+    birth_year: Optional[int] = None
+    is_living: Optional[bool] = None
+    generation: Optional[int] = None
+    depth: int
+
+
+class TreeEdge(BaseModel):
+    """子图关系边（parent 为父母→子女，spouse 每对配偶一条）"""
+    from_id: int = Field(..., alias='from')
+    to_id: int = Field(..., alias='to')
+    type: Literal['parent', 'spouse']
+
+
+class FamilyTree(BaseModel):
+    """家族树子图"""
+    root_id: int
+    up: int
+    down: int
+    total: int
+    truncated: bool
+    nodes: List[TreeNode]
+    edges: List[TreeEdge]
+
+
+class TreeLayoutNode(TreeNode):
+    """布局节点（x/y 为节点框左上角坐标，单位像素）"""
+    x: float
+    y: float
+
+
+class TreeLayout(BaseModel):
+    """家族树布局（节点带坐标，svg 为静态展示用的渲染结果）"""
+    root_id: int
+    up: int
+    down: int
+    total: int
+    truncated: bool
+    width: float
+    height: float
+    nodes: List[TreeLayoutNode]
+    edges: List[TreeEdge]
+    svg: Optional[str] = None
@@ -0,0 +1,351 @@
+"""
+祖先闭包服务（ancestry_closure 表的维护与查询）
+"""
+
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, distinct, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.ancestry_closure import AncestryClosure
+from app.models.person import Person
+from app.models.relationship import Relationship
+
+logger = logging.getLogger(__name__)
+
+# 闭包行的键：(祖先ID, 后代ID, 代数)
+ClosureKey = Tuple[int, int, int]
+
+
+def _drop_back_edges(parents: Dict[int, Set[int]], children: Dict[int, Set[int]]) -> int:
+    """迭代深度优先遍历，去掉指回当前路径上祖先的父子关系（使图无环），返回去掉的关系数"""
+    state: Dict[int, int] = {}  # 1 = 在当前路径上，2 = 已完成
+    dropped = 0
+    for root in sorted(children):
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(sorted(children[root])))]
+        while stack:
+            node, pending_children = stack[-1]
+            child_id = next(pending_children, None)
+            if child_id is None:
+                state[node] = 2
+                stack.pop()
+            elif state.get(child_id) == 1:
+                children[node].discard(child_id)
+                parents[child_id].discard(node)
+                dropped += 1
+            elif child_id not in state:
+                state[child_id] = 1
+                stack.append((child_id, iter(sorted(children[child_id]))))
+    return dropped
+
+
+def compute_closure(pairs: Iterable[Tuple[int, int]]) -> Counter:
+    """在内存中由 (父母ID, 子女ID) 计算闭包，返回 {(祖先, 后代, 代数): 路径条数}
+
+    先去掉构成环（自己成为自己祖先）的父子关系，再按拓扑顺序（从没有父母的人开始）逐人合并父母的祖先。
+    """
+    parents: Dict[int, Set[int]] = defaultdict(set)
+    children: Dict[int, Set[int]] = defaultdict(set)
+    for parent_id, child_id in pairs:
+        parents[child_id].add(parent_id)
+        children[parent_id].add(child_id)
+
+    dropped = _drop_back_edges(parents, children)
+    if dropped:
+        logger.warning(f"Ancestry closure skipped {dropped} parent/child relationships that form cycles")
+
+    nodes = set(parents) | set(children)
+    pending = {node: len(parents[node]) for node in nodes}
+    queue = deque(node for node, count in pending.items() if count == 0)
+    # 每个人的祖先：{(祖先ID, 代数): 路径条数}
+    ancestors: Dict[int, Counter] = {}
+    closure: Counter = Counter()
+    while queue:
+        node = queue.popleft()
+        paths = Counter()
+        for parent_id in parents[node]:
+            paths[(parent_id, 1)] += 1
+            for (ancestor_id, depth), count in ancestors[parent_id].items():
+                paths[(ancestor_id, depth + 1)] += count
+        ancestors[node] = paths
+        for (ancestor_id, depth), count in paths.items():
+            closure[(ancestor_id, node, depth)] = count
+        for child_id in children[node]:
+            pending[child_id] -= 1
+            if pending[child_id] == 0:
+                queue.append(child_id)
+    return closure
+
+
+class AncestryClosureService:
+    """祖先闭包服务
+
+    ancestry_closure 保存每个人的全部祖先（带相隔代数），由 RelationshipService 在写入父子关系的
+    同一事务内增量维护：新增父母 P → 子女 C 时，P 及其祖先与 C 及其后代两两组合得到新增路径；
+    删除时按同样的组合扣减路径条数。祖先判断、后代计数因此都是一次索引查询。
+    会让人成为自己祖先的父子关系（环）不计入闭包。
+    表为空而已有父子关系时（如旧库升级），首次使用会先全量重建一次。
+    """
+
+    # 批量读写闭包行时每批的行数
+    BATCH_SIZE = 2000
+
+    # 已确认闭包表已建立的数据库（进程级）
+    _built = set()
+    _build_lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def parent_pairs(edges: Iterable[Tuple[int, int, str]]) -> Set[Tuple[int, int]]:
+        """由关系边得到 (父母ID, 子女ID)（parent 与 child 两个方向表示同一对父子）"""
+        pairs = set()
+        for from_id, to_id, rel_type in edges:
+            if rel_type == 'parent':
+                pairs.add((from_id, to_id))
+            elif rel_type == 'child':
+                pairs.add((to_id, from_id))
+        return pairs
+
+    # ========== 建立 ==========
+
+    def _bind_key(self) -> str:
+        return str(self.db.get_bind().url)
+
+    def _load_parent_pairs(self) -> Set[Tuple[int, int]]:
+        """读取数据库中全部父子关系"""
+        rows = self.db.execute(
+            select(Relationship.from_person_id, Relationship.to_person_id, Relationship.relationship_type)
+            .where(Relationship.relationship_type.in_(('parent', 'child')))
+        )
+        return self.parent_pairs(rows)
+
+    def ensure_built(self, commit_rebuild: bool = False):
+        """闭包表为空而已有父子关系时先全量重建
+
+        写入路径（commit_rebuild=False）重建结果随调用方的事务提交；只读路径用独立会话重建并立即提交。
+        """
+        key = self._bind_key()
+        if key in self._built:
+            return
+        with self._build_lock:
+            if key in self._built:
+                return
+            has_closure = self.db.execute(select(AncestryClosure.ancestor_id).limit(1)).first() is not None
+            has_pairs = self.db.execute(
+                select(Relationship.id).where(Relationship.relationship_type.in_(('parent', 'child'))).limit(1)
+            ).first() is not None
+            if has_closure or not has_pairs:
+                self._built.add(key)
+            elif not commit_rebuild:
+                self.rebuild(commit=False)
+            else:
+                with Session(bind=self.db.get_bind()) as session:
+                    AncestryClosureService(session).rebuild()
+
+    def rebuild(self, commit: bool = True) -> int:
+        """按 relationships 表全量重建闭包，返回闭包行数"""
+        closure = compute_closure(self._load_parent_pairs())
+        self.db.execute(delete(AncestryClosure))
+        self._insert_rows(closure)
+        if commit:
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self._built.add(self._bind_key())
+        logger.info(f"Ancestry closure rebuilt: {len(closure)} rows")
+        return len(closure)
+
+    def _insert_rows(self, closure: Dict[ClosureKey, int]):
+        """批量插入闭包行"""
+        rows = [{'ancestor_id': a, 'descendant_id': d, 'depth': depth, 'path_count': count}
+                for (a, d, depth), count in closure.items()]
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            self.db.execute(insert(AncestryClosure), rows[start:start + self.BATCH_SIZE])
+
+    # ========== 增量维护（不提交，随调用方的事务提交） ==========
+
+    def _load_paths(self, key_column, other_column, person_ids: Set[int]) -> Dict[int, Counter]:
+        """按 key_column IN person_ids 批量读取闭包行：{本人ID: {(另一端ID, 代数): 路径条数}}"""
+        paths: Dict[int, Counter] = defaultdict(Counter)
+        ids = sorted(person_ids)
+        for start in range(0, len(ids), self.BATCH_SIZE):
+            rows = self.db.execute(
+                select(key_column, other_column, AncestryClosure.depth, AncestryClosure.path_count)
+                .where(key_column.in_(ids[start:start + self.BATCH_SIZE]))
+            )
+            for person_id, other_id, depth, count in rows:
+                paths[person_id][(other_id, depth)] += count
+        return paths
+
+    @staticmethod
+    def _current_paths(person_id: int, stored: Dict[int, Counter], deltas: Counter,
+                       touched: Iterable[ClosureKey], other_end: int) -> Counter:
+        """本人（代数 0）加上已读取的闭包行与本批已累计的增减：{(另一端ID, 代数): 路径条数}
+
+        other_end 为闭包键中另一端所在的位置（0 = 祖先，1 = 后代）。
+        """
+        paths = Counter({(person_id, 0): 1})
+        paths.update(stored.get(person_id, {}))
+        for key in touched:
+            paths[(key[other_end], key[2])] += deltas[key]
+        return Counter({path: count for path, count in paths.items() if count > 0})
+
+    def _pair_deltas(self, pairs: Iterable[Tuple[int, int]], sign: int) -> Counter:
+        """按顺序合并一批父子关系经过的全部祖先路径（sign=1 新增，-1 删除），返回闭包行的增减
+
+        全部父母的祖先、全部子女的后代各用一次 IN 查询读出，之后在内存中逐条合并，
+        后一条可用到前一条新增（或扣减）的路径；构成环（子女已是父母的祖先）的关系跳过。
+        """
+        pairs = list(pairs)
+        deltas: Counter = Counter()
+        if not pairs:
+            return deltas
+        ancestors = self._load_paths(AncestryClosure.descendant_id, AncestryClosure.ancestor_id,
+                                     {parent_id for parent_id, _ in pairs})
+        descendants = self._load_paths(AncestryClosure.ancestor_id, AncestryClosure.descendant_id,
+                                       {child_id for _, child_id in pairs})
+        # 本批已累计增减的闭包键，按后代、祖先分别索引
+        by_descendant: Dict[int, Set[ClosureKey]] = defaultdict(set)
+        by_ancestor: Dict[int, Set[ClosureKey]] = defaultdict(set)
+        for parent_id, child_id in pairs:
+            up = self._current_paths(parent_id, ancestors, deltas, by_descendant[parent_id], 0)
+            if any(ancestor_id == child_id for ancestor_id, _ in up):
+                if sign > 0:
+                    logger.warning(f"Parent relationship {parent_id} → {child_id} forms a cycle, not added to closure")
+                continue
+            down = self._current_paths(child_id, descendants, deltas, by_ancestor[child_id], 1)
+            for (ancestor_id, up_depth), up_count in up.items():
+                for (descendant_id, down_depth), down_count in down.items():
+                    key = (ancestor_id, descendant_id, up_depth + down_depth + 1)
+                    deltas[key] += sign * up_count * down_count
+                    by_descendant[descendant_id].add(key)
+                    by_ancestor[ancestor_id].add(key)
+        return deltas
+
+    def _apply(self, deltas: Dict[ClosureKey, int]):
+        """按路径条数增减闭包行（减到 0 的行删除）"""
+        keys = [key for key, delta in deltas.items() if delta]
+        existing = {}
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            batch = keys[start:start + self.BATCH_SIZE]
+            rows = self.db.execute(
+                select(AncestryClosure.ancestor_id, AncestryClosure.descendant_id,
+                       AncestryClosure.depth, AncestryClosure.path_count)
+                .where(tuple_(AncestryClosure.ancestor_id, AncestryClosure.descendant_id,
+                              AncestryClosure.depth).in_(batch))
+            )
+            for ancestor_id, descendant_id, depth, count in rows:
+                existing[(ancestor_id, descendant_id, depth)] = count
+
+        inserts, updates, deletes = {}, [], []
+        for key in keys:
+            count = existing.get(key, 0) + deltas[key]
+            params = {'b_ancestor': key[0], 'b_descendant': key[1], 'b_depth': key[2]}
+            if count <= 0:
+                if key in existing:
+                    deletes.append(params)
+            elif key in existing:
+                updates.append({**params, 'b_count': count})
+            else:
+                inserts[key] = count
+
+        # 按主键逐行执行（executemany），直接使用表对象而不经过 ORM 的批量 UPDATE/DELETE
+        table = AncestryClosure.__table__
+        match = (
+            (table.c.ancestor_id == bindparam('b_ancestor'))
+            & (table.c.descendant_id == bindparam('b_descendant'))
+            & (table.c.depth == bindparam('b_depth'))
+        )
+        if deletes:
+            self.db.execute(table.delete().where(match), deletes)
+        if updates:
+            self.db.execute(table.update().where(match).values(path_count=bindparam('b_count')), updates)
+        if inserts:
+            self._insert_rows(inserts)
+
+    def add_pairs(self, pairs: Iterable[Tuple[int, int]]):
+        """新增父子关系 (父母ID, 子女ID)，按顺序合并后一次写入（后一条可用到前一条新增的路径）"""
+        self.ensure_built()
+        self._apply(self._pair_deltas(pairs, 1))
+
+    def remove_pairs(self, pairs: Iterable[Tuple[int, int]]):
+        """删除父子关系 (父母ID, 子女ID)（构成环而未计入闭包的关系跳过）"""
+        self.ensure_built()
+        self._apply(self._pair_deltas(pairs, -1))
+
+    def add_new_pairs(self, pairs: Iterable[Tuple[int, int]]) -> Counter:
+        """新增只涉及新建人员的父子关系（如导入）：在内存中计算闭包后批量插入，无需逐条查询；返回新增的闭包"""
+        self.ensure_built()
+        closure = compute_closure(pairs)
+        self._insert_rows(closure)
+        return closure
+
+    def remove_person(self, person_id: int):
+        """删除人员时清除其闭包行"""
+        self.db.execute(delete(AncestryClosure).where(
+            (AncestryClosure.ancestor_id == person_id) | (AncestryClosure.descendant_id == person_id)
+        ))
+
+    # ========== 查询 ==========
+
+    def ancestry_depth(self, ancestor_id: int, descendant_id: int) -> Optional[int]:
+        """ancestor_id 是 descendant_id 的祖先时返回最近的相隔代数，否则返回 None"""
+        self.ensure_built(commit_rebuild=True)
+        return self.db.execute(
+            select(func.min(AncestryClosure.depth))
+            .where(AncestryClosure.ancestor_id == ancestor_id, AncestryClosure.descendant_id == descendant_id)
+        ).scalar()
+
+    def is_ancestor(self, ancestor_id: int, descendant_id: int) -> bool:
+        """判断 ancestor_id 是否为 descendant_id 的祖先"""
+        return self.ancestry_depth(ancestor_id, descendant_id) is not None
+
+    def count_descendants(self, person_id: int) -> Dict[str, int]:
+        """后代人数及最远代数"""
+        self.ensure_built(commit_rebuild=True)
+        total, max_depth = self.db.execute(
+            select(func.count(distinct(AncestryClosure.descendant_id)), func.max(AncestryClosure.depth))
+            .where(AncestryClosure.ancestor_id == person_id)
+        ).one()
+        return {'descendant_count': total, 'max_depth': max_depth or 0}
+
+    def _founders_query(self):
+        """始祖（有后代但没有父母的人）"""
+        has_parent = select(AncestryClosure.descendant_id).where(AncestryClosure.depth == 1)
+        return select(AncestryClosure.ancestor_id).where(AncestryClosure.ancestor_id.not_in(has_parent)) \
+            .group_by(AncestryClosure.ancestor_id)
+
+    def count_founders(self) -> int:
+        """始祖人数"""
+        self.ensure_built(commit_rebuild=True)
+        return self.db.execute(select(func.count()).select_from(self._founders_query().subquery())).scalar()
+
+    def get_founder_descendant_counts(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """各始祖的后代人数（按后代人数从多到少），一次分组查询"""
+        self.ensure_built(commit_rebuild=True)
+        has_parent = select(AncestryClosure.descendant_id).where(AncestryClosure.depth == 1)
+        descendant_count = func.count(distinct(AncestryClosure.descendant_id))
+        rows = self.db.execute(
+            select(AncestryClosure.ancestor_id, Person.name, descendant_count.label('descendant_count'),
+                   func.max(AncestryClosure.depth).label('max_depth'))
+            .join(Person, Person.id == AncestryClosure.ancestor_id)
+            .where(AncestryClosure.ancestor_id.not_in(has_parent))
+            .group_by(AncestryClosure.ancestor_id, Person.name)
+            .order_by(descendant_count.desc(), AncestryClosure.ancestor_id)
+            .offset(skip).limit(limit)
+        )
+        return [
+            {'person_id': row.ancestor_id, 'name': row.name,
+             'descendant_count': row.descendant_count, 'max_depth': row.max_depth}
+            for row in rows
+        ]
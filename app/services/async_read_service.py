@@ -0,0 +1,233 @@
+"""
+异步读服务（API 异步数据库模式下的人员/关系读路径）
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.models.relationship import Relationship, RelationshipEdge
+from app.models.stats_counter import StatsCounter
+from app.services import relationship_edges
+from app.services.graph_index import graph_index
+from app.services.pagination import keyset_page, keyset_query, offset_page, offset_query, paginate_list
+from app.services.person_service import PersonService
+from app.services.relationship_service import RelationshipService
+from app.services.search_index import search_index
+from app.services.stats_service import StatsService
+
+
+class AsyncReadService:
+    """异步读服务基类
+
+    查询通过 AsyncSession 执行，等待数据库期间不占用工作线程。
+    进程级内存索引（全文检索、关系图）和统计计数表的首次加载/补齐仍使用同步会话，
+    放到线程池中执行，避免阻塞事件循环（只发生一次）。
+    """
+
+    def __init__(self, db: AsyncSession, session_factory: Callable[[], Session]):
+        self.db = db
+        # 同步会话工厂（用于内存索引首次加载）
+        self.session_factory = session_factory
+
+    async def _run_with_sync_session(self, fn: Callable[[Session], Any]) -> Any:
+        """在线程池中用独立的同步会话执行 fn"""
+        def run():
+            db = self.session_factory()
+            try:
+                return fn(db)
+            finally:
+                db.close()
+
+        return await run_in_threadpool(run)
+
+    async def _ensure_index_loaded(self, index):
+        """确保进程级内存索引已加载"""
+        if not index.is_loaded:
+            await self._run_with_sync_session(index.ensure_loaded)
+
+    async def get_counters(self) -> Dict[str, int]:
+        """获取全部统计计数（一次查询；计数表尚未初始化时回退到同步服务补齐）"""
+        rows = (await self.db.execute(select(StatsCounter.name, StatsCounter.value))).all()
+        stored = {name: int(value) for name, value in rows}
+        if not set(StatsService.COUNTERS) <= set(stored):
+            return await self._run_with_sync_session(lambda db: StatsService(db).get_counters())
+        return {name: stored[name] for name in StatsService.COUNTERS}
+
+    async def get_counter(self, name: str) -> int:
+        """获取单个统计计数"""
+        value = await self.db.scalar(select(StatsCounter.value).where(StatsCounter.name == name))
+        if value is None:
+            return (await self.get_counters()).get(name, 0)
+        return int(value)
+
+
+class AsyncPersonService(AsyncReadService):
+    """人员异步读服务（与 PersonService 的读接口对应）"""
+
+    async def get_person(self, person_id: int) -> Optional[Person]:
+        """根据ID获取人员"""
+        return await self.db.get(Person, person_id)
+
+    async def get_person_updated_at(self, person_id: int):
+        """只查询人员的更新时间，人员不存在时返回 None，否则返回 (updated_at,)"""
+        return (await self.db.execute(select(Person.updated_at).where(Person.id == person_id))).first()
+
+    @staticmethod
+    def _filtered_select(gender: Optional[str] = None, is_living: Optional[bool] = None):
+        """按性别/在世状态筛选的人员查询"""
+        stmt = select(Person)
+        if gender in ('M', 'F'):
+            stmt = stmt.where(Person.gender == gender)
+        if is_living is not None:
+            stmt = stmt.where(Person.is_living == is_living)
+        return stmt
+
+    async def get_persons_page(self, skip: int = 0, limit: int = 100, order_by: str = "id",
+                               cursor: Optional[str] = None, gender: Optional[str] = None,
+                               is_living: Optional[bool] = None) -> Tuple[List[Person], Optional[str]]:
+        """分页获取人员，返回 (当前页人员, 下一页游标)；分页规则同 PersonService.get_persons_page"""
+        stmt = self._filtered_select(gender, is_living)
+        if order_by in PersonService.KEYSET_ORDER_FIELDS:
+            order_column = getattr(Person, order_by)
+            stmt = keyset_query(stmt, order_column, Person.id, limit, cursor=cursor, skip=skip)
+            rows = (await self.db.scalars(stmt)).all()
+            return keyset_page(list(rows), order_column, Person.id, limit)
+
+        order_column = getattr(Person, order_by, Person.id)
+        order_key = f"offset:{order_by}"
+        stmt, skip = offset_query(stmt, [order_column.asc(), Person.id], order_key, limit,
+                                  cursor=cursor, skip=skip)
+        rows = (await self.db.scalars(stmt)).all()
+        return offset_page(list(rows), order_key, limit, skip)
+
+    async def count_persons_filtered(self, gender: Optional[str] = None, is_living: Optional[bool] = None) -> int:
+        """按性别/在世状态统计人员数（单一条件读取统计计数，组合条件查询数据库）"""
+        if is_living is None:
+            if gender == 'M':
+                return await self.get_counter('persons_male')
+            if gender == 'F':
+                return await self.get_counter('persons_female')
+            return await self.get_counter('persons_total')
+        if is_living is True and gender not in ('M', 'F'):
+            return await self.get_counter('persons_living')
+
+        stmt = select(func.count(Person.id)).where(Person.is_living == is_living)
+        if gender in ('M', 'F'):
+            stmt = stmt.where(Person.gender == gender)
+        return await self.db.scalar(stmt)
+
+    async def _search_ids(self, search_term: str, fields=None, gender: Optional[str] = None) -> List[int]:
+        """通过全文检索索引搜索，返回按相关度排序的人员ID"""
+        await self._ensure_index_loaded(search_index)
+        return search_index.search(search_term, fields=fields or PersonService.SEARCH_FIELDS, gender=gender)
+
+    async def _load_persons_in_order(self, person_ids: List[int]) -> List[Person]:
+        """按给定ID顺序批量加载人员"""
+        persons = {}
+        for start in range(0, len(person_ids), PersonService.LOAD_BATCH_SIZE):
+            batch = person_ids[start:start + PersonService.LOAD_BATCH_SIZE]
+            for person in await self.db.scalars(select(Person).where(Person.id.in_(batch))):
+                persons[person.id] = person
+        return [persons[person_id] for person_id in person_ids if person_id in persons]
+
+    async def search_persons_page(self, search_term: str, skip: int = 0,
+                                  limit: int = 100) -> Tuple[List[Person], int]:
+        """搜索人员（按相关度排序），返回 (当前页人员, 总数)"""
+        person_ids = await self._search_ids(search_term)
+        return await self._load_persons_in_order(person_ids[skip:skip + limit]), len(person_ids)
+
+    async def filter_persons_page(
+            self,
+            keyword: Optional[str] = None,
+            gender: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            include_total: bool = True
+    ) -> Tuple[List[Person], Optional[str], Optional[int]]:
+        """组合筛选人员，返回 (当前页人员, 下一页游标, 总数)；规则同 PersonService.filter_persons_page"""
+        gender = gender if gender in ('M', 'F') else None
+        if keyword and keyword.strip():
+            person_ids = await self._search_ids(keyword, fields=search_index.FIELDS, gender=gender)
+            page_ids, next_cursor = paginate_list(person_ids, limit, cursor=cursor, skip=skip)
+            return await self._load_persons_in_order(page_ids), next_cursor, len(person_ids)
+
+        persons, next_cursor = await self.get_persons_page(skip=skip, limit=limit, cursor=cursor, gender=gender)
+        total = await self.count_persons_filtered(gender=gender) if include_total else None
+        return persons, next_cursor, total
+
+
+class AsyncRelationshipService(AsyncReadService):
+    """关系异步读服务（与 RelationshipService 的读接口对应）"""
+
+    async def get_relationship(self, relationship_id: int) -> Optional[RelationshipEdge]:
+        """根据ID获取关系（ID 对应存储行的一个方向，见 Relationship.edge_id）"""
+        link_id, reverse = Relationship.split_edge_id(relationship_id)
+        link = await self.db.scalar(select(Relationship).where(Relationship.id == link_id))
+        return link.edge(reverse) if link else None
+
+    async def get_all_relationships(self, relationship_type: Optional[str] = None) -> List[RelationshipEdge]:
+        """获取全部关系（两个方向均包含，可按类型筛选；不加载关联人员）"""
+        links = await self.db.scalars(
+            relationship_edges.links_select(relationship_type=relationship_type)
+        )
+        return relationship_edges.expand(links, relationship_type=relationship_type)
+
+    async def get_relationships_page(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                                     relationship_type: Optional[str] = None
+                                     ) -> Tuple[List[RelationshipEdge], Optional[str]]:
+        """按ID游标分页获取关系，返回 (当前页关系, 下一页游标)；不加载关联人员"""
+        statement, after_id, drop = relationship_edges.page_select(limit, cursor=cursor, skip=skip,
+                                                                   relationship_type=relationship_type)
+        links = (await self.db.scalars(statement)).all()
+        return relationship_edges.page_edges(links, limit, after_id, drop, relationship_type)
+
+    async def count_relationships_filtered(self, relationship_type: Optional[str] = None) -> int:
+        """统计关系数（可按类型筛选，读取统计计数）"""
+        counter = f'relationships_{relationship_type}' if relationship_type else 'relationships_total'
+        if counter in StatsService.RELATIONSHIP_COUNTERS:
+            return await self.get_counter(counter)
+        return 0
+
+    async def get_person_relationships(self, person_id: int) -> Dict[str, List[Person]]:
+        """获取指定人员的所有关系（父母/配偶/子女，一次联表查询）"""
+        links = (await self.db.scalars(relationship_edges.with_persons(
+            select(Relationship).where(
+                or_(Relationship.from_person_id == person_id, Relationship.to_person_id == person_id)
+            ).order_by(Relationship.id)
+        ))).all()
+        details = RelationshipService.categorize_relationships(person_id, relationship_edges.expand(links))
+        return {
+            category: [person for person, _ in entries]
+            for category, entries in details.items()
+        }
+
+    async def _load_persons(self, person_ids) -> Dict[int, Person]:
+        """按ID批量加载人员（每批一次 IN 查询）"""
+        person_ids = list(person_ids)
+        persons = {}
+        for i in range(0, len(person_ids), RelationshipService.PERSON_BATCH_SIZE):
+            batch = person_ids[i:i + RelationshipService.PERSON_BATCH_SIZE]
+            for person in await self.db.scalars(select(Person).where(Person.id.in_(batch))):
+                persons[person.id] = person
+        return persons
+
+    async def _walk_generations(self, person_id: int, max_depth: int, next_ids) -> List[Tuple[Person, int]]:
+        """在内存关系图上按代遍历，再异步批量加载人员"""
+        await self._ensure_index_loaded(graph_index)
+        generations = RelationshipService.collect_generations(person_id, max_depth, next_ids)
+        persons = await self._load_persons(generations.keys())
+        return RelationshipService.order_generations(generations, persons)
+
+    async def get_ancestors(self, person_id: int, max_depth: int = 10) -> List[Tuple[Person, int]]:
+        """获取祖先（父母为第1代，祖父母为第2代，依此类推）"""
+        return await self._walk_generations(person_id, max_depth, graph_index.parents)
+
+    async def get_descendants(self, person_id: int, max_depth: int = 10) -> List[Tuple[Person, int]]:
+        """获取后代（子女为第1代，孙辈为第2代，依此类推）"""
+        return await self._walk_generations(person_id, max_depth, graph_index.children)
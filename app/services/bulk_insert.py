@@ -0,0 +1,36 @@
+"""
+批量插入工具
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+def insert_returning_ids(db: Session, model, rows: List[Dict[str, Any]]) -> List[int]:
+    """批量插入并按输入顺序返回自增主键（不提交事务）
+
+    支持 RETURNING 的数据库（SQLite、MariaDB 等）使用 executemany + RETURNING；
+    MySQL 使用单条多行 INSERT：InnoDB 为已知行数的多行 INSERT 一次性分配连续的自增值，
+    lastrowid 为其中第一行的ID（要求 auto_increment_increment = 1）。
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    dialect = db.get_bind().dialect
+
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            rows
+        )
+        return [row[0] for row in result]
+
+    # 多行 VALUES 要求每行的字段一致
+    columns = sorted({key for row in rows for key in row})
+    values = [{column: row.get(column) for column in columns} for row in rows]
+    result = db.execute(insert(table).values(values))
+    first_id = result.lastrowid
+    return list(range(first_id, first_id + len(rows)))
@@ -0,0 +1,107 @@
+"""
+旁系亲属查询（兄弟姐妹、堂表兄弟姐妹），以自连接查询集合计算
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.ancestry_closure import AncestryClosure
+from app.models.person import Person
+from app.models.relationship import Relationship
+from app.services.ancestry_closure import AncestryClosureService
+
+# (亲属, 共同的父母/祖先ID)
+Kin = Tuple[Person, List[int]]
+
+
+class CollateralService:
+    """旁系亲属查询
+
+    兄弟姐妹：父子关系自连接（本人的父母 → 父母的其他子女）一次查出共同父母，再按父母人数区分
+    全血缘（父母完全相同）与半血缘（只有部分父母相同）。堂表兄弟姐妹：祖先闭包自连接，
+    第 n 代堂表亲为与本人在第 n + 1 代有共同祖先、且没有更近共同祖先的同辈。
+    查询次数固定，与每代子女数量无关。
+    """
+
+    # 按ID批量查询时每批的数量
+    BATCH_SIZE = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.closure = AncestryClosureService(db)
+
+    def _load_sorted(self, common: Dict[int, Iterable[int]]) -> List[Kin]:
+        """批量加载人员，按 (出生日期, ID) 排序返回 (人员, 共同父母/祖先ID)"""
+        person_ids = sorted(common)
+        persons = []
+        for start in range(0, len(person_ids), self.BATCH_SIZE):
+            persons.extend(self.db.query(Person).filter(Person.id.in_(person_ids[start:start + self.BATCH_SIZE])))
+        persons.sort(key=lambda person: (person.birth_date, person.id))
+        return [(person, sorted(common[person.id])) for person in persons]
+
+    def _parent_counts(self, person_ids: List[int]) -> Dict[int, int]:
+        """每个人的父母人数"""
+        counts = {}
+        for start in range(0, len(person_ids), self.BATCH_SIZE):
+            counts.update(self.db.execute(
+                select(Relationship.to_person_id, func.count())
+                .where(Relationship.to_person_id.in_(person_ids[start:start + self.BATCH_SIZE]),
+                       Relationship.relationship_type == 'parent')
+                .group_by(Relationship.to_person_id)
+            ).all())
+        return counts
+
+    def get_siblings(self, person_id: int) -> Dict[str, List[Kin]]:
+        """兄弟姐妹：{'full': 同父同母, 'half': 同父异母/同母异父}，每项为 (人员, 共同父母ID)"""
+        mine = aliased(Relationship)
+        theirs = aliased(Relationship)
+        # 父母一侧只按 from_person_id 连接（走 (from, to, type) 索引），父母的配偶行在内存中滤掉；
+        # 连接条件带上类型时，没有统计信息的 SQLite 会改用 relationship_type 索引扫描全部父子关系
+        rows = self.db.execute(
+            select(theirs.to_person_id, mine.from_person_id, theirs.relationship_type)
+            .join(theirs, theirs.from_person_id == mine.from_person_id)
+            .where(mine.to_person_id == person_id, mine.relationship_type == 'parent',
+                   theirs.to_person_id != person_id)
+        )
+        shared: Dict[int, List[int]] = defaultdict(list)
+        for sibling_id, parent_id, relationship_type in rows:
+            if relationship_type == 'parent':
+                shared[sibling_id].append(parent_id)
+        if not shared:
+            return {'full': [], 'half': []}
+
+        counts = self._parent_counts(sorted(shared) + [person_id])
+        own_count = counts.get(person_id, 0)
+        full = {sid: parents for sid, parents in shared.items() if len(parents) == own_count == counts[sid]}
+        half = {sid: parents for sid, parents in shared.items() if sid not in full}
+        return {'full': self._load_sorted(full), 'half': self._load_sorted(half)}
+
+    def get_cousins(self, person_id: int, degree: int = 1) -> List[Kin]:
+        """第 degree 代堂表兄弟姐妹（1 为堂/表兄弟姐妹，2 为再从兄弟姐妹），每项为 (人员, 共同祖先ID)
+
+        与本人同在共同祖先之下第 degree + 1 代，且在 degree 代以内没有共同祖先（排除兄弟姐妹、更近的堂表亲）。
+        """
+        self.closure.ensure_built(commit_rebuild=True)
+        depth = degree + 1
+        mine = aliased(AncestryClosure)
+        theirs = aliased(AncestryClosure)
+        near_mine = aliased(AncestryClosure)
+        near_theirs = aliased(AncestryClosure)
+        closer = exists().where(
+            near_mine.descendant_id == person_id, near_mine.depth <= degree,
+            near_theirs.ancestor_id == near_mine.ancestor_id, near_theirs.descendant_id == theirs.descendant_id,
+            near_theirs.depth <= degree
+        )
+        rows = self.db.execute(
+            select(theirs.descendant_id, mine.ancestor_id)
+            .join(theirs, and_(theirs.ancestor_id == mine.ancestor_id, theirs.depth == depth))
+            .where(mine.descendant_id == person_id, mine.depth == depth,
+                   theirs.descendant_id != person_id, ~closer)
+        )
+        common: Dict[int, set] = defaultdict(set)
+        for cousin_id, ancestor_id in rows:
+            common[cousin_id].add(ancestor_id)
+        return self._load_sorted(common)
@@ -0,0 +1,601 @@
+"""
+GEDCOM 5.5 导入导出服务
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.models.relationship import Relationship
+from app.services.ancestry_closure import AncestryClosureService
+from app.services.bulk_insert import insert_returning_ids
+from app.services.generation_service import GenerationService
+from app.services.graph_index import graph_index
+from app.services.relationship_service import RelationshipService
+from app.services.search_index import search_index
+from app.services.stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+GEDCOM_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+# 表示日期不精确的限定词（ABT 约、EST 估、CAL 推算、BEF 之前、AFT 之后、BET/FROM 区间），统一按“仅年份”精确度保存
+GEDCOM_APPROXIMATE_QUALIFIERS = ('ABT', 'EST', 'CAL', 'BEF', 'AFT', 'BET', 'FROM', 'TO', 'INT')
+
+# 自定义标签：事件下的 _DATE_TYPE LUNAR 表示农历日期（GEDCOM 标准日历中没有农历）
+GEDCOM_DATE_TYPE_TAG = '_DATE_TYPE'
+
+GEDCOM_MONTH_NAMES = {number: name for name, number in GEDCOM_MONTHS.items()}
+
+_GEDCOM_LINE = re.compile(r'^\s*(\d+)\s+(@[^@]+@\s+)?(\S+)(?:\s(.*))?$')
+_CJK = re.compile(r'[㐀-鿿]')
+
+
+# ========== 解析（在子进程中运行，必须为模块级函数） ==========
+
+def parse_gedcom_date(value: Optional[str]) -> Tuple[Optional[date], Optional[str]]:
+    """解析 GEDCOM 日期，返回 (日期, 精确度)；无法解析时返回 (None, None)
+
+    "12 MAR 1950" → exact，"MAR 1950" → year_month，"1950" → year_only，
+    带 ABT/BEF/AFT/BET 等限定词的日期取第一个日期的年份，精确度为 year_only。
+    """
+    if not value:
+        return None, None
+    tokens = value.upper().replace('(', ' ').replace(')', ' ').split()
+    # 去掉日历转义（如 @#DGREGORIAN@）
+    tokens = [token for token in tokens if not token.startswith('@#')]
+    if not tokens:
+        return None, None
+
+    approximate = tokens[0] in GEDCOM_APPROXIMATE_QUALIFIERS
+    if approximate:
+        tokens = tokens[1:]
+        # 区间只取起始日期
+        for separator in ('AND', 'TO'):
+            if separator in tokens:
+                tokens = tokens[:tokens.index(separator)]
+
+    try:
+        if len(tokens) >= 3 and tokens[-2] in GEDCOM_MONTHS:
+            parsed = date(int(tokens[-1]), GEDCOM_MONTHS[tokens[-2]], int(tokens[-3]))
+            accuracy = 'exact'
+        elif len(tokens) >= 2 and tokens[-2] in GEDCOM_MONTHS:
+            parsed = date(int(tokens[-1]), GEDCOM_MONTHS[tokens[-2]], 1)
+            accuracy = 'year_month'
+        elif tokens and tokens[-1].isdigit():
+            parsed = date(int(tokens[-1]), 1, 1)
+            accuracy = 'year_only'
+        else:
+            return None, None
+    except ValueError:
+        return None, None
+
+    if approximate:
+        return date(parsed.year, 1, 1), 'year_only'
+    return parsed, accuracy
+
+
+def _parse_gedcom_name(value: str) -> str:
+    """GEDCOM 姓名 “名 /姓/” 转为存储格式：中文为“姓名”连写，其他为“名 姓”"""
+    match = re.match(r'^(.*?)/(.*?)/(.*)$', value)
+    if not match:
+        return ' '.join(value.split())
+    given = ' '.join((match.group(1) + ' ' + match.group(3)).split())
+    surname = match.group(2).strip()
+    if _CJK.search(surname + given):
+        return surname + given.replace(' ', '')
+    return ' '.join(part for part in (given, surname) if part)
+
+
+def _parse_record(lines: List[Tuple[int, str, str]]) -> Optional[Dict[str, Any]]:
+    """解析一条 0 级记录（INDI 或 FAM），行格式为 (层级, 标签, 值)"""
+    level0_tag, level0_value = lines[0][1], lines[0][2]
+
+    if level0_tag == 'FAM':
+        family = {'kind': 'FAM', 'xref': level0_value, 'husb': None, 'wife': None, 'children': []}
+        for level, tag, value in lines[1:]:
+            if level != 1:
+                continue
+            if tag == 'HUSB':
+                family['husb'] = value
+            elif tag == 'WIFE':
+                family['wife'] = value
+            elif tag == 'CHIL':
+                family['children'].append(value)
+        return family
+
+    if level0_tag != 'INDI':
+        return None
+
+    person = {'kind': 'INDI', 'xref': level0_value, 'name': None, 'gender': None,
+              'birth': {}, 'death': {}, 'dead': False, 'note': []}
+    event = None
+    in_note = False
+    for level, tag, value in lines[1:]:
+        if level == 1:
+            event = None
+            in_note = tag == 'NOTE'
+            if tag == 'NAME' and person['name'] is None:
+                person['name'] = _parse_gedcom_name(value)
+            elif tag == 'SEX':
+                person['gender'] = value.strip().upper()[:1] or None
+            elif tag in ('BIRT', 'DEAT'):
+                event = person['birth'] if tag == 'BIRT' else person['death']
+                if tag == 'DEAT':
+                    person['dead'] = True
+            elif tag == 'NOTE':
+                person['note'].append(value)
+        elif level == 2 and event is not None:
+            if tag == 'DATE':
+                event['date'] = value
+            elif tag == 'PLAC':
+                event['place'] = value
+            elif tag == GEDCOM_DATE_TYPE_TAG:
+                event['date_type'] = value.strip().lower()
+        elif level == 2 and in_note:
+            if tag == 'CONT':
+                person['note'].append('\n' + value)
+            elif tag == 'CONC':
+                person['note'].append(value)
+    return _normalize_individual(person)
+
+
+def _normalize_individual(person: Dict[str, Any]) -> Dict[str, Any]:
+    """把 INDI 记录规范化为 persons 表的行；缺少必填信息时给出 skip_reason"""
+    result = {'kind': 'INDI', 'xref': person['xref'], 'skip_reason': None}
+    name = person['name'] or ''
+    gender = person['gender'] if person['gender'] in ('M', 'F') else None
+    birth_date, birth_accuracy = parse_gedcom_date(person['birth'].get('date'))
+
+    if not name:
+        result['skip_reason'] = 'missing NAME'
+    elif not gender:
+        result['skip_reason'] = f"unsupported SEX: {person['gender'] or 'missing'}"
+    elif not birth_date:
+        result['skip_reason'] = f"missing or unparseable birth DATE: {person['birth'].get('date') or 'missing'}"
+    if result['skip_reason']:
+        result['name'] = name
+        return result
+
+    death_date, death_accuracy = parse_gedcom_date(person['death'].get('date'))
+    biography = ''.join(person['note']).strip()
+    result['row'] = {
+        'name': name[:100],
+        'gender': gender,
+        'birth_date': birth_date,
+        'birth_date_type': 'lunar' if person['birth'].get('date_type') == 'lunar' else 'solar',
+        'birth_date_accuracy': birth_accuracy,
+        'death_date': death_date,
+        'death_date_type': (('lunar' if person['death'].get('date_type') == 'lunar' else 'solar')
+                            if death_date else None),
+        'death_date_accuracy': death_accuracy,
+        'phone': None,
+        'email': None,
+        'birth_place': (person['birth'].get('place') or '')[:200] or None,
+        'avatar_path': None,
+        'is_living': not person['dead'],
+        'biography': biography or None
+    }
+    return result
+
+
+def parse_gedcom_records(records: List[List[str]]) -> List[Dict[str, Any]]:
+    """解析一组 0 级记录（每条记录为原始行列表），供进程池调用"""
+    parsed = []
+    for raw_lines in records:
+        lines = []
+        for raw_line in raw_lines:
+            match = _GEDCOM_LINE.match(raw_line)
+            if not match:
+                continue
+            level, xref, tag, value = match.groups()
+            if level == '0' and xref:
+                # “0 @I1@ INDI”：标签为 INDI，值为 xref
+                value = xref.strip()
+            lines.append((int(level), tag, value or ''))
+        if lines:
+            record = _parse_record(lines)
+            if record is not None:
+                parsed.append(record)
+    return parsed
+
+
+def iter_gedcom_record_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[List[str]]]:
+    """按 0 级记录切分 GEDCOM 文本，每 chunk_size 条记录产出一组"""
+    chunk = []
+    record = None
+    for line in stream:
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            continue
+        if line.lstrip().startswith('0 '):
+            if record:
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            record = [line]
+        elif record is not None:
+            record.append(line)
+    if record:
+        chunk.append(record)
+    if chunk:
+        yield chunk
+
+
+# ========== 导入 ==========
+
+class GedcomImporter:
+    """GEDCOM 导入器
+
+    解析与规范化按记录分组交给进程池并行处理；主进程作为唯一写入方，
+    先批量插入全部人员，再根据 FAM 记录批量插入父母/子女、配偶关系（每条关系一行），
+    整个导入在一个事务中完成。
+    """
+
+    # 每个解析任务包含的 0 级记录数
+    PARSE_CHUNK_SIZE = 2000
+
+    # 每条 INSERT 语句写入的行数
+    INSERT_BATCH_SIZE = 5000
+
+    # 结果中最多保留的跳过明细条数
+    MAX_SKIPPED_DETAILS = 1000
+
+    def __init__(self, db: Session, workers: Optional[int] = None):
+        self.db = db
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.graph = graph_index
+
+    def _parse(self, stream: TextIO) -> Iterable[List[Dict[str, Any]]]:
+        """并行解析（单进程时直接在当前进程解析）"""
+        chunks = iter_gedcom_record_chunks(stream, self.PARSE_CHUNK_SIZE)
+        if self.workers <= 1:
+            return map(parse_gedcom_records, chunks)
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # map 按提交顺序返回结果，xref 的先后与文件一致
+            return list(executor.map(parse_gedcom_records, chunks))
+        finally:
+            executor.shutdown()
+
+    def _build_relationship_rows(self, families: List[Dict[str, Any]], person_ids: Dict[str, int],
+                                 genders: Dict[str, str]) -> List[Dict[str, Any]]:
+        """根据 FAM 记录生成关系行（每条关系一行，按 Relationship.canonical 存储并去重）"""
+        rows = []
+        seen = set()
+        sub_types = RelationshipService.SUB_TYPE_MAP
+
+        def add(from_xref, to_xref, rel_type):
+            from_id, to_id = person_ids[from_xref], person_ids[to_xref]
+            key = Relationship.canonical(from_id, to_id, rel_type)[:3]
+            if from_id == to_id or key in seen:
+                return
+            seen.add(key)
+            if key[0] != from_id:
+                from_xref, to_xref = to_xref, from_xref
+            rows.append({
+                'from_person_id': key[0],
+                'to_person_id': key[1],
+                'relationship_type': key[2],
+                'sub_type': sub_types[key[2]][genders[from_xref]],
+                'opposite_sub_type': sub_types[Relationship.OPPOSITE_TYPES[key[2]]][genders[to_xref]]
+            })
+
+        for family in families:
+            parents = [xref for xref in (family['husb'], family['wife']) if xref in person_ids]
+            children = [xref for xref in family['children'] if xref in person_ids]
+            if len(parents) == 2:
+                add(parents[0], parents[1], 'spouse')
+            for parent in parents:
+                for child in children:
+                    add(parent, child, 'parent')
+        return rows
+
+    def import_gedcom(self, stream: TextIO) -> Dict[str, Any]:
+        """导入 GEDCOM 文本流，返回导入统计"""
+        started = time.perf_counter()
+        summary = {
+            'individuals': 0,
+            'families': 0,
+            'persons_created': 0,
+            'relationships_created': 0,
+            'skipped': 0,
+            'skipped_details': [],
+            'skipped_truncated': False
+        }
+
+        person_ids: Dict[str, int] = {}
+        genders: Dict[str, str] = {}
+        birth_dates: Dict[int, date] = {}
+        families: List[Dict[str, Any]] = []
+        pending: List[Tuple[str, Dict[str, Any]]] = []
+        # 提交后写入全文检索索引的人员（索引未加载时无需保留）
+        indexed: List[Tuple[int, Dict[str, Any]]] = []
+
+        stats = StatsService(self.db)
+
+        def flush_persons():
+            stats.apply_deltas(StatsService.merge_deltas(*(StatsService.person_deltas(row) for _, row in pending)),
+                               bump_persons=True)
+            new_ids = insert_returning_ids(self.db, Person, [row for _, row in pending])
+            for (xref, row), new_id in zip(pending, new_ids):
+                person_ids[xref] = new_id
+                genders[xref] = row['gender']
+                birth_dates[new_id] = row['birth_date']
+                if search_index.is_loaded:
+                    indexed.append((new_id, row))
+            pending.clear()
+
+        try:
+            # 1. 解析并插入人员
+            for records in self._parse(stream):
+                for record in records:
+                    if record['kind'] == 'FAM':
+                        families.append(record)
+                        continue
+                    summary['individuals'] += 1
+                    if record['skip_reason']:
+                        summary['skipped'] += 1
+                        if len(summary['skipped_details']) < self.MAX_SKIPPED_DETAILS:
+                            summary['skipped_details'].append({
+                                'xref': record['xref'], 'name': record['name'], 'reason': record['skip_reason']
+                            })
+                        else:
+                            summary['skipped_truncated'] = True
+                        continue
+                    pending.append((record['xref'], record['row']))
+                    if len(pending) >= self.INSERT_BATCH_SIZE:
+                        flush_persons()
+            if pending:
+                flush_persons()
+            summary['families'] = len(families)
+            summary['persons_created'] = len(person_ids)
+            parsed_at = time.perf_counter()
+
+            # 2. 插入关系（人员全部写入后才能解析 FAM 中的引用）
+            rows = self._build_relationship_rows(families, person_ids, genders)
+            if rows:
+                stats.apply_deltas(StatsService.relationship_deltas(row['relationship_type'] for row in rows),
+                                   bump_relationships=True)
+                # 关系只涉及本次新建的人员，闭包在内存中一次算出（需在插入关系前执行）
+                parent_pairs = AncestryClosureService.parent_pairs(
+                    (row['from_person_id'], row['to_person_id'], row['relationship_type']) for row in rows
+                )
+                closure = AncestryClosureService(self.db).add_new_pairs(parent_pairs)
+                for batch_start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                    self.db.execute(insert(Relationship), rows[batch_start:batch_start + self.INSERT_BATCH_SIZE])
+                # 辈分与排行同样由本次的父子关系及闭包算出
+                GenerationService(self.db).new_persons_linked(parent_pairs, closure, birth_dates)
+            # 按两个方向计（与关系接口、统计计数一致）
+            summary['relationships_created'] = 2 * len(rows)
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # 3. 同步内存关系索引及全文检索索引
+        self.graph.add_edges(
+            (row['from_person_id'], row['to_person_id'], row['relationship_type']) for row in rows
+        )
+        search_index.index_persons(indexed)
+
+        elapsed = time.perf_counter() - started
+        summary['persons_seconds'] = round(parsed_at - started, 3)
+        summary['elapsed_seconds'] = round(elapsed, 3)
+        summary['persons_per_second'] = round(summary['persons_created'] / elapsed) if elapsed else 0
+        logger.info(f"GEDCOM import: {summary['persons_created']} persons, "
+                    f"{summary['relationships_created']} relationships in {summary['elapsed_seconds']}s")
+        return summary
+
+
+# ========== 导出 ==========
+
+def format_gedcom_date(value: date, accuracy: Optional[str]) -> str:
+    """按精确度格式化 GEDCOM 日期"""
+    if accuracy == 'year_only':
+        return str(value.year)
+    if accuracy == 'year_month':
+        return f"{GEDCOM_MONTH_NAMES[value.month]} {value.year}"
+    return f"{value.day} {GEDCOM_MONTH_NAMES[value.month]} {value.year}"
+
+
+def format_gedcom_name(name: str) -> str:
+    """存储格式姓名转为 GEDCOM “名 /姓/”：中文取首字为姓，其他取最后一个词为姓"""
+    name = name.strip()
+    if _CJK.search(name):
+        return f"/{name[:1]}/{name[1:]}"
+    parts = name.split()
+    if len(parts) < 2:
+        return name
+    return f"{' '.join(parts[:-1])} /{parts[-1]}/"
+
+
+class GedcomExporter:
+    """GEDCOM 导出器
+
+    人员与关系均通过服务端游标分批读取，按块产出文本，内存占用与数据量无关。
+    家庭（FAM）由父母边和配偶边推导：子女的父母集合（至多两人）构成一个家庭，
+    xref 为 @F{父母ID小}_{父母ID大}@（单亲为 @F{父母ID}@）；没有共同子女的配偶单独成一个家庭。
+    每个人的父母/配偶/子女从内存关系索引获取，不在游标读取过程中发起额外查询。
+    """
+
+    # 游标每批读取的行数
+    STREAM_BATCH_SIZE = 2000
+
+    # 每次产出的文本块大小（字符数）
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.graph = graph_index
+
+    @staticmethod
+    def family_key(parent_ids: Iterable[int]) -> Tuple[int, ...]:
+        """家庭键：排序后的父母ID（多于两人时取前两人）"""
+        return tuple(sorted(parent_ids)[:2])
+
+    @staticmethod
+    def family_xref(key: Tuple[int, ...]) -> str:
+        return '@F' + '_'.join(str(person_id) for person_id in key) + '@'
+
+    def _child_family_key(self, child_id: int) -> Tuple[int, ...]:
+        return self.family_key(self.graph.parents(child_id))
+
+    def _person_families(self, person_id: int) -> List[Tuple[int, ...]]:
+        """本人作为父母或配偶所在的家庭"""
+        keys = {self._child_family_key(child_id) for child_id in self.graph.children(person_id)}
+        for spouse_id in self.graph.spouses(person_id):
+            keys.add(self.family_key((person_id, spouse_id)))
+        return sorted(key for key in keys if person_id in key)
+
+    def _stream(self, statement):
+        """服务端游标分批读取"""
+        return self.db.execute(
+            statement.execution_options(stream_results=True, yield_per=self.STREAM_BATCH_SIZE)
+        )
+
+    def _header_lines(self) -> Iterator[str]:
+        yield '0 HEAD'
+        yield '1 SOUR FAMILY_TREE'
+        yield '1 GEDC'
+        yield '2 VERS 5.5'
+        yield '2 FORM LINEAGE-LINKED'
+        yield '1 CHAR UTF-8'
+
+    def _event_lines(self, tag: str, event_date: Optional[date], date_type: Optional[str],
+                     accuracy: Optional[str], place: Optional[str] = None) -> Iterator[str]:
+        yield f'1 {tag}'
+        if event_date:
+            yield f'2 DATE {format_gedcom_date(event_date, accuracy)}'
+            if date_type == 'lunar':
+                yield f'2 {GEDCOM_DATE_TYPE_TAG} LUNAR'
+        if place:
+            yield f'2 PLAC {place}'
+
+    def _individual_lines(self, person: Person) -> Iterator[str]:
+        yield f'0 @I{person.id}@ INDI'
+        yield f'1 NAME {format_gedcom_name(person.name)}'
+        yield f'1 SEX {person.gender}'
+        yield from self._event_lines('BIRT', person.birth_date, person.birth_date_type,
+                                     person.birth_date_accuracy, person.birth_place)
+        if person.death_date:
+            yield from self._event_lines('DEAT', person.death_date, person.death_date_type,
+                                         person.death_date_accuracy)
+        elif person.is_living is False:
+            yield '1 DEAT Y'
+        if person.biography:
+            note_lines = person.biography.splitlines() or ['']
+            yield f'1 NOTE {note_lines[0]}'
+            for line in note_lines[1:]:
+                yield f'2 CONT {line}'
+
+        parent_ids = self.graph.parents(person.id)
+        if parent_ids:
+            yield f'1 FAMC {self.family_xref(self.family_key(parent_ids))}'
+        for key in self._person_families(person.id):
+            yield f'1 FAMS {self.family_xref(key)}'
+
+    def _family_lines(self, key: Tuple[int, ...], roles: Dict[int, str], children: List[int]) -> Iterator[str]:
+        """输出一个家庭；roles 为已知的父母角色（HUSB / WIFE）"""
+        yield f'0 {self.family_xref(key)} FAM'
+        taken = set()
+        for person_id in key:
+            role = roles.get(person_id)
+            if role in taken or role is None:
+                role = 'WIFE' if 'HUSB' in taken else 'HUSB'
+            taken.add(role)
+            yield f'1 {role} @I{person_id}@'
+        for child_id in children:
+            yield f'1 CHIL @I{child_id}@'
+
+    def _family_record_lines(self) -> Iterator[str]:
+        """按父母分组流式读取 parent 边输出有子女的家庭，再读取 spouse 边输出无共同子女的配偶家庭
+
+        每个家庭只在其ID最小的父母的分组中输出一次。
+        """
+        role_of = {'father': 'HUSB', 'mother': 'WIFE', 'husband': 'HUSB', 'wife': 'WIFE'}
+
+        def flush(parent_id, sub_type, child_ids):
+            families: Dict[Tuple[int, ...], List[int]] = {}
+            for child_id in child_ids:
+                key = self._child_family_key(child_id)
+                if key and key[0] == parent_id:
+                    families.setdefault(key, []).append(child_id)
+            for key, children in families.items():
+                yield from self._family_lines(key, {parent_id: role_of.get(sub_type)}, children)
+
+        # 1. 有子女的家庭（每对父子存为一行 父母 → 子女 的 parent 关系）
+        rows = self._stream(
+            select(Relationship.from_person_id, Relationship.to_person_id, Relationship.sub_type)
+            .where(Relationship.relationship_type == 'parent')
+            .order_by(Relationship.from_person_id, Relationship.to_person_id)
+        )
+        current_parent, current_sub_type, child_ids = None, None, []
+        for parent_id, child_id, sub_type in rows:
+            if parent_id != current_parent:
+                if current_parent is not None:
+                    yield from flush(current_parent, current_sub_type, child_ids)
+                current_parent, current_sub_type, child_ids = parent_id, sub_type, []
+            child_ids.append(child_id)
+        if current_parent is not None:
+            yield from flush(current_parent, current_sub_type, child_ids)
+
+        # 2. 无共同子女的配偶家庭
+        rows = self._stream(
+            select(Relationship.from_person_id, Relationship.to_person_id, Relationship.sub_type)
+            .where(Relationship.relationship_type == 'spouse',
+                   Relationship.from_person_id < Relationship.to_person_id)
+            .order_by(Relationship.from_person_id, Relationship.to_person_id)
+        )
+        for person_id, spouse_id, sub_type in rows:
+            key = self.family_key((person_id, spouse_id))
+            shared = self.graph.children(person_id) & self.graph.children(spouse_id)
+            if any(self._child_family_key(child_id) == key for child_id in shared):
+                continue
+            yield from self._family_lines(key, {person_id: role_of.get(sub_type)}, [])
+
+    def _lines(self) -> Iterator[str]:
+        yield from self._header_lines()
+        persons = self._stream(select(Person).order_by(Person.id)).scalars()
+        for person in persons:
+            yield from self._individual_lines(person)
+        yield from self._family_record_lines()
+        yield '0 TRLR'
+
+    def iter_gedcom(self) -> Iterator[str]:
+        """按块产出 GEDCOM 文本"""
+        self.graph.ensure_loaded(self.db)
+        buffer = []
+        size = 0
+        for line in self._lines():
+            buffer.append(line)
+            size += len(line) + 1
+            if size >= self.CHUNK_SIZE:
+                yield '\n'.join(buffer) + '\n'
+                buffer = []
+                size = 0
+        if buffer:
+            yield '\n'.join(buffer) + '\n'
+
+    def export_to_file(self, path: str) -> Dict[str, Any]:
+        """导出到文件，返回统计"""
+        started = time.perf_counter()
+        size = 0
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            for chunk in self.iter_gedcom():
+                f.write(chunk)
+                size += len(chunk)
+        return {'path': path, 'characters': size, 'elapsed_seconds': round(time.perf_counter() - started, 3)}
@@ -0,0 +1,271 @@
+"""
+辈分与排行服务（persons.generation / persons.birth_order 的维护）
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+from app.models.ancestry_closure import AncestryClosure
+from app.models.person import Person
+from app.models.relationship import Relationship
+from app.services.ancestry_closure import AncestryClosureService, ClosureKey
+
+logger = logging.getLogger(__name__)
+
+
+def compute_birth_orders(parent_sets: Dict[int, Tuple[int, ...]],
+                         birth_dates: Dict[int, date]) -> Dict[int, int]:
+    """由每个人的父母集合计算排行：父母集合相同的为同父同母的兄弟姐妹，按 (出生日期, ID) 依次为 1, 2, 3……
+
+    没有父母记录的人排行为 1。parent_sets 须包含每个同胞组的全部成员。
+    """
+    groups: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+    orders = {}
+    for person_id, parents in parent_sets.items():
+        if parents:
+            groups[parents].append(person_id)
+        else:
+            orders[person_id] = 1
+    for members in groups.values():
+        members.sort(key=lambda pid: (birth_dates[pid], pid))
+        for order, person_id in enumerate(members, 1):
+            orders[person_id] = order
+    return orders
+
+
+class GenerationService:
+    """辈分与排行服务
+
+    generation 为本人在家族中的世代：没有父母记录的人（始祖，以及未录入父母的配偶）为第 1 代，
+    其他人为最远祖先的相隔代数 + 1，即祖先闭包中的最大代数 + 1，父母世代不同时取较晚的一代；
+    birth_order 为在同父同母的兄弟姐妹中的出生顺序。两列带 (generation, birth_order) 联合索引，
+    「第 N 代按排行」是一次索引查询。
+
+    RelationshipService 在写入父子关系的同一事务内（祖先闭包更新之后）只重算受影响的人：
+    子女及其全部后代的辈分、相关父母名下各同胞组的排行；修改出生日期时重算其同胞组的排行。
+    迁移后已有人员的两列为空，首次使用时全量计算一次。
+    """
+
+    # 按ID批量读写时每批的数量
+    BATCH_SIZE = 2000
+
+    # 已确认辈分与排行已计算的数据库（进程级）
+    _built = set()
+    _build_lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.closure = AncestryClosureService(db)
+
+    @classmethod
+    def _batches(cls, ids: Iterable[int]) -> Iterable[List[int]]:
+        ids = sorted(ids)
+        for start in range(0, len(ids), cls.BATCH_SIZE):
+            yield ids[start:start + cls.BATCH_SIZE]
+
+    # ========== 读取 ==========
+
+    def _descendant_ids(self, person_ids: Iterable[int]) -> Set[int]:
+        """本人及全部后代（读取祖先闭包）"""
+        result = set(person_ids)
+        for batch in self._batches(result.copy()):
+            result.update(self.db.scalars(
+                select(AncestryClosure.descendant_id).where(AncestryClosure.ancestor_id.in_(batch)).distinct()
+            ))
+        return result
+
+    def _generations(self, person_ids: Iterable[int]) -> Dict[int, int]:
+        """由祖先闭包得到世代（最大相隔代数 + 1，没有祖先的为 1）"""
+        generations = {}
+        for batch in self._batches(person_ids):
+            generations.update(dict.fromkeys(batch, 1))
+            rows = self.db.execute(
+                select(AncestryClosure.descendant_id, func.max(AncestryClosure.depth))
+                .where(AncestryClosure.descendant_id.in_(batch))
+                .group_by(AncestryClosure.descendant_id)
+            )
+            for person_id, depth in rows:
+                generations[person_id] = depth + 1
+        return generations
+
+    def _parent_sets(self, person_ids: Iterable[int]) -> Dict[int, Tuple[int, ...]]:
+        """每个人的父母ID（升序元组，没有父母记录的为空元组）"""
+        parents: Dict[int, List[int]] = {}
+        for batch in self._batches(person_ids):
+            parents.update((person_id, []) for person_id in batch)
+            rows = self.db.execute(
+                select(Relationship.to_person_id, Relationship.from_person_id)
+                .where(Relationship.to_person_id.in_(batch), Relationship.relationship_type == 'parent')
+            )
+            for child_id, parent_id in rows:
+                parents[child_id].append(parent_id)
+        return {person_id: tuple(sorted(ids)) for person_id, ids in parents.items()}
+
+    def _child_ids(self, parent_ids: Iterable[int]) -> Set[int]:
+        """这些人的全部子女"""
+        children = set()
+        for batch in self._batches(parent_ids):
+            children.update(self.db.scalars(
+                select(Relationship.to_person_id)
+                .where(Relationship.from_person_id.in_(batch), Relationship.relationship_type == 'parent')
+            ))
+        return children
+
+    def _birth_dates(self, person_ids: Iterable[int]) -> Dict[int, date]:
+        birth_dates = {}
+        for batch in self._batches(person_ids):
+            birth_dates.update(self.db.execute(
+                select(Person.id, Person.birth_date).where(Person.id.in_(batch))
+            ).all())
+        return birth_dates
+
+    # ========== 写入（不提交，随调用方的事务提交） ==========
+
+    def _update(self, column: str, values: Dict[int, int]) -> int:
+        """按主键逐行更新（executemany，不经过 ORM 的批量 UPDATE），返回更新的人数"""
+        if values:
+            table = Person.__table__
+            self.db.execute(
+                table.update().where(table.c.id == bindparam('b_id')).values({column: bindparam('b_value')}),
+                [{'b_id': person_id, 'b_value': value} for person_id, value in values.items()]
+            )
+        return len(values)
+
+    def _write(self, column: str, values: Dict[int, int]) -> int:
+        """只更新值有变化的人员，返回更新的人数"""
+        changed = {}
+        for batch in self._batches(values):
+            rows = self.db.execute(
+                select(Person.id, getattr(Person, column)).where(Person.id.in_(batch))
+            )
+            changed.update((person_id, values[person_id])
+                           for person_id, current in rows if current != values[person_id])
+        return self._update(column, changed)
+
+    def _refresh_generations(self, person_ids: Iterable[int]) -> int:
+        return self._write('generation', self._generations(person_ids))
+
+    def _refresh_birth_orders(self, person_ids: Iterable[int], parent_ids: Iterable[int] = ()) -> int:
+        """重算这些人及这些父母名下各同胞组的排行"""
+        person_ids = set(person_ids)
+        parent_sets = self._parent_sets(person_ids)
+        parents = set(parent_ids).union(*parent_sets.values())
+        members = self._child_ids(parents) - person_ids
+        parent_sets.update(self._parent_sets(members))
+        return self._write('birth_order', compute_birth_orders(parent_sets, self._birth_dates(parent_sets)))
+
+    def parent_pairs_changed(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        """新增或删除父子关系 (父母ID, 子女ID) 后调用（关系行与祖先闭包均已在会话中更新），返回更新的人数
+
+        子女及其全部后代重算辈分，父母与子女现有父母名下的同胞组重算排行。
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return 0
+        # 会话不自动 flush，先写入会话中待删除的关系行
+        self.db.flush()
+        if not self.ensure_built():
+            return 0
+        child_ids = {child_id for _, child_id in pairs}
+        return (self._refresh_generations(self._descendant_ids(child_ids))
+                + self._refresh_birth_orders(child_ids, {parent_id for parent_id, _ in pairs}))
+
+    def new_persons_linked(self, pairs: Iterable[Tuple[int, int]], closure: Mapping[ClosureKey, int],
+                           birth_dates: Mapping[int, date]) -> int:
+        """父子关系只涉及新建人员（如导入）时调用，返回更新的人数
+
+        新建人员的辈分与排行均为默认值 1，由本次的父子关系 (父母ID, 子女ID)、其闭包及出生日期在内存中算出，
+        只写入不为 1 的值，无需查询数据库。
+        """
+        pairs = list(pairs)
+        if not pairs or not self.ensure_built():
+            return 0
+        generations = {}
+        for _, descendant_id, depth in closure:
+            generations[descendant_id] = max(generations.get(descendant_id, 1), depth + 1)
+        parents: Dict[int, List[int]] = defaultdict(list)
+        for parent_id, child_id in pairs:
+            parents[child_id].append(parent_id)
+        birth_orders = compute_birth_orders(
+            {child_id: tuple(sorted(ids)) for child_id, ids in parents.items()}, birth_dates
+        )
+        return (self._update('generation', {pid: value for pid, value in generations.items() if value != 1})
+                + self._update('birth_order', {pid: value for pid, value in birth_orders.items() if value != 1}))
+
+    def birth_dates_changed(self, person_ids: Iterable[int]) -> int:
+        """人员出生日期修改后调用（新日期已设置到会话中的人员上），重算其同胞组的排行"""
+        self.db.flush()
+        if not self.ensure_built():
+            return 0
+        return self._refresh_birth_orders(person_ids)
+
+    # ========== 全量计算 ==========
+
+    def _bind_key(self) -> str:
+        return str(self.db.get_bind().url)
+
+    def ensure_built(self, commit_rebuild: bool = False) -> bool:
+        """存在尚未计算的人员（迁移前的数据）时先全量计算，返回是否已是计算好的状态（无需再增量更新）
+
+        写入路径（commit_rebuild=False）计算结果随调用方的事务提交；只读路径用独立会话计算并立即提交。
+        """
+        key = self._bind_key()
+        if key in self._built:
+            return True
+        with self._build_lock:
+            if key in self._built:
+                return True
+            missing = self.db.execute(
+                select(Person.id).where(Person.generation.is_(None) | Person.birth_order.is_(None)).limit(1)
+            ).first() is not None
+            if not missing:
+                self._built.add(key)
+                return True
+            if not commit_rebuild:
+                self.rebuild(commit=False)
+            else:
+                with Session(bind=self.db.get_bind()) as session:
+                    GenerationService(session).rebuild()
+            return False
+
+    def rebuild(self, commit: bool = True) -> int:
+        """按祖先闭包与 relationships 表全量计算全部人员的辈分与排行，返回人员数"""
+        self.closure.ensure_built()
+        generations = {person_id: 1 for person_id in self.db.scalars(select(Person.id))}
+        rows = self.db.execute(
+            select(AncestryClosure.descendant_id, func.max(AncestryClosure.depth))
+            .group_by(AncestryClosure.descendant_id)
+        )
+        for person_id, depth in rows:
+            if person_id in generations:
+                generations[person_id] = depth + 1
+
+        parents: Dict[int, List[int]] = {person_id: [] for person_id in generations}
+        rows = self.db.execute(
+            select(Relationship.to_person_id, Relationship.from_person_id)
+            .where(Relationship.relationship_type == 'parent')
+        )
+        for child_id, parent_id in rows:
+            if child_id in parents:
+                parents[child_id].append(parent_id)
+        birth_dates = dict(self.db.execute(select(Person.id, Person.birth_date)).all())
+        birth_orders = compute_birth_orders(
+            {person_id: tuple(sorted(ids)) for person_id, ids in parents.items()}, birth_dates
+        )
+
+        updated = self._write('generation', generations) + self._write('birth_order', birth_orders)
+        if commit:
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self._built.add(self._bind_key())
+        logger.info(f"Generations and birth orders rebuilt: {updated} values updated for {len(generations)} persons")
+        return len(generations)
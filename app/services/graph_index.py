@@ -0,0 +1,250 @@
+"""
+家族关系图内存索引（进程级共享）
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+
+from sqlalchemy.orm import Session
+
+from app.models.relationship import Relationship
+
+logger = logging.getLogger(__name__)
+
+# 关系边：(from_person_id, to_person_id, relationship_type)，与 relationships 表的一行对应
+# （child 边、ID 大→小的配偶边按 Relationship.canonical 换算为对应的存储行）
+EdgeKey = Tuple[int, int, str]
+
+
+class GenealogyGraphIndex:
+    """家族关系邻接索引
+
+    按存储的关系类型（parent / spouse）维护正向（from → to）和反向（to → from）两份 int 键邻接表，
+    与 relationships 表逐行对应（每条家庭关系一行，两个方向都由这一行得出）。
+    首次使用时从数据库整体加载一次，之后由 RelationshipService 在事务提交后增量更新，读取路径全部走内存。
+    """
+
+    RELATIONSHIP_TYPES = Relationship.STORED_TYPES
+
+    # 加载时每批读取的行数
+    LOAD_BATCH_SIZE = 5000
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._bind_url: Optional[str] = None
+        self._outgoing: Dict[str, Dict[int, Set[int]]] = {}
+        self._incoming: Dict[str, Dict[int, Set[int]]] = {}
+        self._reset()
+        # 每次索引内容变化都会递增，可用作缓存的数据版本号
+        self.version = 0
+
+    def _reset(self):
+        """清空邻接表"""
+        self._outgoing = {t: {} for t in self.RELATIONSHIP_TYPES}
+        self._incoming = {t: {} for t in self.RELATIONSHIP_TYPES}
+
+    @classmethod
+    def overlay(cls) -> "GenealogyGraphIndex":
+        """创建一个空的、已加载状态的索引（用于暂存事务中尚未提交的关系边）"""
+        index = cls()
+        index._loaded = True
+        return index
+
+    @property
+    def is_loaded(self) -> bool:
+        """索引是否已加载"""
+        return self._loaded
+
+    @staticmethod
+    def _bind_key(db: Session) -> str:
+        """数据库连接标识（用于区分不同的数据库）"""
+        return str(db.get_bind().url)
+
+    def ensure_loaded(self, db: Session):
+        """确保索引已加载（首次调用或数据库切换时从 relationships 表加载）"""
+        if self._loaded and self._bind_url == self._bind_key(db):
+            return
+        with self._lock:
+            if self._loaded and self._bind_url == self._bind_key(db):
+                return
+            self._load(db)
+
+    def rebuild(self, db: Session):
+        """从 relationships 表重建索引"""
+        with self._lock:
+            self._load(db)
+
+    def invalidate(self):
+        """使索引失效，下次访问时重新加载"""
+        with self._lock:
+            self._loaded = False
+            self._bind_url = None
+            self._reset()
+            self.version += 1
+        logger.info("Genealogy graph index invalidated")
+
+    def _load(self, db: Session):
+        """加载全部关系边"""
+        self._reset()
+        count = 0
+        rows = db.query(
+            Relationship.from_person_id,
+            Relationship.to_person_id,
+            Relationship.relationship_type
+        ).yield_per(self.LOAD_BATCH_SIZE)
+        for from_id, to_id, rel_type in rows:
+            if self._add(from_id, to_id, rel_type):
+                count += 1
+        self._loaded = True
+        self._bind_url = self._bind_key(db)
+        self.version += 1
+        logger.info(f"Genealogy graph index loaded: {count} edges")
+
+    def _add(self, from_id: int, to_id: int, rel_type: str) -> bool:
+        """添加一条边（调用方持有锁）"""
+        from_id, to_id, rel_type, _ = Relationship.canonical(from_id, to_id, rel_type)
+        if rel_type not in self._outgoing:
+            return False
+        targets = self._outgoing[rel_type].setdefault(from_id, set())
+        if to_id in targets:
+            return False
+        targets.add(to_id)
+        self._incoming[rel_type].setdefault(to_id, set()).add(from_id)
+        return True
+
+    def _remove(self, from_id: int, to_id: int, rel_type: str) -> bool:
+        """删除一条边（调用方持有锁）"""
+        from_id, to_id, rel_type, _ = Relationship.canonical(from_id, to_id, rel_type)
+        targets = self._outgoing.get(rel_type, {}).get(from_id)
+        if not targets or to_id not in targets:
+            return False
+        targets.discard(to_id)
+        if not targets:
+            del self._outgoing[rel_type][from_id]
+        sources = self._incoming[rel_type].get(to_id)
+        if sources is not None:
+            sources.discard(from_id)
+            if not sources:
+                del self._incoming[rel_type][to_id]
+        return True
+
+    def add_edges(self, edges: Iterable[EdgeKey]):
+        """事务提交后增量添加关系边"""
+        with self._lock:
+            if not self._loaded:
+                return
+            changed = sum(1 for edge in edges if self._add(*edge))
+            if changed:
+                self.version += 1
+
+    def remove_edges(self, edges: Iterable[EdgeKey]):
+        """事务提交后增量删除关系边"""
+        with self._lock:
+            if not self._loaded:
+                return
+            changed = sum(1 for edge in edges if self._remove(*edge))
+            if changed:
+                self.version += 1
+
+    def remove_person(self, person_id: int):
+        """删除与某人相关的所有边"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self.remove_edges(self.edges_of(person_id))
+
+    def has_edge(self, from_id: int, to_id: int, rel_type: Optional[str] = None) -> bool:
+        """判断关系边是否存在（任一方向均可查询，如 has_edge(子女, 父母, 'child')；不指定类型时任意类型均可）"""
+        with self._lock:
+            for edge_type in ([rel_type] if rel_type else self.RELATIONSHIP_TYPES):
+                source, target, stored_type, _ = Relationship.canonical(from_id, to_id, edge_type)
+                if target in self._outgoing.get(stored_type, {}).get(source, ()):
+                    return True
+            return False
+
+    def targets(self, from_id: int, rel_type: str) -> Set[int]:
+        """获取 from_id 出发的指定类型关系的目标人员ID"""
+        with self._lock:
+            return set(self._outgoing.get(rel_type, {}).get(from_id, ()))
+
+    def sources(self, to_id: int, rel_type: str) -> Set[int]:
+        """获取指向 to_id 的指定类型关系的来源人员ID"""
+        with self._lock:
+            return set(self._incoming.get(rel_type, {}).get(to_id, ()))
+
+    def parents(self, person_id: int) -> Set[int]:
+        """父母ID（X→本人 parent）"""
+        with self._lock:
+            return set(self._incoming['parent'].get(person_id, ()))
+
+    def children(self, person_id: int) -> Set[int]:
+        """子女ID（本人→X parent）"""
+        with self._lock:
+            return set(self._outgoing['parent'].get(person_id, ()))
+
+    def spouses(self, person_id: int) -> Set[int]:
+        """配偶ID（双向）"""
+        with self._lock:
+            return (set(self._outgoing['spouse'].get(person_id, ()))
+                    | self._incoming['spouse'].get(person_id, set()))
+
+    def edges_of(self, person_id: int) -> List[EdgeKey]:
+        """与某人相关的所有关系边"""
+        with self._lock:
+            edges = []
+            for rel_type in self.RELATIONSHIP_TYPES:
+                for to_id in self._outgoing[rel_type].get(person_id, ()):
+                    edges.append((person_id, to_id, rel_type))
+                for from_id in self._incoming[rel_type].get(person_id, ()):
+                    edges.append((from_id, person_id, rel_type))
+            return edges
+
+    def edge_count(self) -> int:
+        """索引中的关系边总数"""
+        with self._lock:
+            return sum(len(targets) for by_type in self._outgoing.values() for targets in by_type.values())
+
+    def iter_edges(self) -> Iterable[EdgeKey]:
+        """遍历索引中的全部关系边（快照）"""
+        with self._lock:
+            snapshot = [
+                (from_id, to_id, rel_type)
+                for rel_type, by_from in self._outgoing.items()
+                for from_id, targets in by_from.items()
+                for to_id in targets
+            ]
+        return iter(snapshot)
+
+    def verify(self, db: Session, sample_size: int = 20) -> Dict[str, Any]:
+        """与 relationships 表做一致性校验"""
+        self.ensure_loaded(db)
+        table_edges = set()
+        rows = db.query(
+            Relationship.from_person_id,
+            Relationship.to_person_id,
+            Relationship.relationship_type
+        ).yield_per(self.LOAD_BATCH_SIZE)
+        for from_id, to_id, rel_type in rows:
+            from_id, to_id, rel_type, _ = Relationship.canonical(from_id, to_id, rel_type)
+            if rel_type in self.RELATIONSHIP_TYPES:
+                table_edges.add((from_id, to_id, rel_type))
+
+        index_edges = set(self.iter_edges())
+        missing = table_edges - index_edges
+        stale = index_edges - table_edges
+
+        return {
+            'consistent': not missing and not stale,
+            'table_edges': len(table_edges),
+            'index_edges': len(index_edges),
+            'missing_in_index': len(missing),
+            'stale_in_index': len(stale),
+            'missing_samples': sorted(missing)[:sample_size],
+            'stale_samples': sorted(stale)[:sample_size]
+        }
+
+
+# 进程级共享索引
+graph_index = GenealogyGraphIndex()
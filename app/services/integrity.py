@@ -0,0 +1,361 @@
+"""
+家族关系数据完整性扫描（全表扫描，生成机器可读的检查报告）
+"""
+
+import logging
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.models.relationship import Relationship
+
+logger = logging.getLogger(__name__)
+
+
+def find_cycles(node_count: int, sources: array, targets: array) -> List[List[int]]:
+    """有向图中包含两个及以上节点的强连通分量（即环），节点为 0 .. node_count - 1 的下标，边为 sources[i] → targets[i]
+
+    邻接表按起点压缩为 offsets / adjacency 两个整数数组（CSR）。先按拓扑排序逐层剥离入度为 0 的节点
+    （家谱中通常全部剥离，直接返回），剩余节点再用迭代 Tarjan 算法求强连通分量，不受递归深度限制。
+    自环不在此检测。
+    """
+    offsets = array('q', bytes(8 * (node_count + 1)))
+    indegree = array('q', bytes(8 * node_count))
+    for source in sources:
+        offsets[source + 1] += 1
+    for target in targets:
+        indegree[target] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    adjacency = array('q', bytes(8 * len(targets)))
+    position = offsets[:-1]
+    for source, target in zip(sources, targets):
+        adjacency[position[source]] = target
+        position[source] += 1
+    del position
+
+    # 拓扑排序：能被剥离的节点不在任何环上
+    peeled = [node for node in range(node_count) if not indegree[node]]
+    for node in peeled:
+        for target in adjacency[offsets[node]:offsets[node + 1]]:
+            indegree[target] -= 1
+            if not indegree[target]:
+                peeled.append(target)
+    if len(peeled) == node_count:
+        return []
+
+    # Tarjan：已剥离的节点视为已访问且不在栈中，连到它们的边不影响 low 值
+    index = array('q', [-1]) * node_count
+    for node in peeled:
+        index[node] = node_count
+    del peeled
+    low = array('q', bytes(8 * node_count))
+    on_stack = bytearray(node_count)
+    stack: List[int] = []
+    components = []
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            node, pos = work[-1]
+            end = offsets[node + 1]
+            descend = -1
+            while pos < end:
+                target = adjacency[pos]
+                pos += 1
+                if index[target] == -1:
+                    descend = target
+                    break
+                if on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+            if descend != -1:
+                work[-1] = (node, pos)
+                index[descend] = low[descend] = counter
+                counter += 1
+                stack.append(descend)
+                on_stack[descend] = 1
+                work.append((descend, offsets[descend]))
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(component)
+    return components
+
+
+class IntegrityScanner:
+    """关系数据完整性扫描
+
+    人员表与关系表各经服务端游标分批读取一遍（只取列值，不构造 ORM 对象）：人员压缩为
+    ID → 下标的字典及性别、出生日期两个数组，父子关系压缩为下标数组，逐行检查后在内存中查找祖先关系的环
+    （见 find_cycles）。每条家庭关系只存一行（见 Relationship.canonical），
+    「缺少反向关系」对应为存储行缺少某个方向的子类型，或残留的非存储方向的行。
+
+    检查项（ISSUE_TYPES）：祖先关系成环、关系指向不存在的人员、与自己的关系、非存储方向的行、
+    缺少子类型、同性别配偶、子女出生日期不晚于父母。报告中每类问题给出总数及前 sample_limit 条明细。
+    """
+
+    # 检查项 -> 中文说明（报告中按此顺序输出）
+    ISSUE_TYPES = OrderedDict([
+        ('ancestry_cycle', '祖先关系成环'),
+        ('dangling_person', '关系指向不存在的人员'),
+        ('self_relationship', '与自己建立的关系'),
+        ('non_canonical_row', '非存储方向的关系行'),
+        ('missing_sub_type', '关系方向缺少子类型'),
+        ('same_gender_spouse', '同性别配偶'),
+        ('child_born_before_parent', '子女出生日期不晚于父母'),
+    ])
+
+    # 游标每批读取的行数
+    STREAM_BATCH_SIZE = 10000
+
+    # 每个环在报告中列出的最多人数
+    CYCLE_MEMBER_LIMIT = 50
+
+    # 核对非存储方向的行时，每次 IN 查询的行数
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, db: Session, sample_limit: int = 100):
+        self.db = db
+        self.sample_limit = sample_limit
+        self._counts: Dict[str, int] = {}
+        self._samples: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _stream(self, statement):
+        """服务端游标分批读取，按批产出行（经会话的连接直接执行，不经过 ORM 的结果处理）"""
+        return self.db.connection().execute(
+            statement.execution_options(stream_results=True, yield_per=self.STREAM_BATCH_SIZE)
+        ).partitions()
+
+    def _report_issue(self, issue_type: str, detail: Callable[[], Dict[str, Any]]):
+        """计数一个问题，未超过样例上限时记录明细（detail 按需生成）"""
+        count = self._counts[issue_type] = self._counts[issue_type] + 1
+        if count <= self.sample_limit:
+            self._samples[issue_type].append(detail())
+
+    @staticmethod
+    def _row_detail(link_id: int, from_id: int, to_id: int, relationship_type: str, **extra) -> Dict[str, Any]:
+        """关系行的明细（relationship_id 为接口中正方向关系的ID，删除时整行删除）"""
+        return {
+            'relationship_id': Relationship.edge_id(link_id, False),
+            'from_person_id': from_id,
+            'to_person_id': to_id,
+            'relationship_type': relationship_type,
+            **extra
+        }
+
+    def _load_persons(self):
+        """人员ID → 下标，及按下标的性别、出生日期（序数）"""
+        positions: Dict[int, int] = {}
+        person_ids = array('q')
+        genders = bytearray()
+        birth_days = array('q')
+        for rows in self._stream(select(Person.id, Person.gender, Person.birth_date)):
+            for person_id, gender, birth_date in rows:
+                positions[person_id] = len(person_ids)
+                person_ids.append(person_id)
+                genders.append(ord(gender or '?'))
+                birth_days.append(birth_date.toordinal() if birth_date else 0)
+        return positions, person_ids, genders, birth_days
+
+    def _mark_duplicates(self):
+        """非存储方向的行：核对同一关系是否已有存储方向的行（只核对报告中列出的行）"""
+        samples = self._samples['non_canonical_row']
+        keys = {}
+        for sample in samples:
+            if sample['relationship_type'] in Relationship.OPPOSITE_TYPES:
+                keys[id(sample)] = Relationship.canonical(
+                    sample['from_person_id'], sample['to_person_id'], sample['relationship_type']
+                )[:3]
+        found = set()
+        key_list = sorted(set(keys.values()))
+        for start in range(0, len(key_list), self.LOOKUP_BATCH_SIZE):
+            found.update(self.db.execute(
+                select(Relationship.from_person_id, Relationship.to_person_id, Relationship.relationship_type)
+                .where(tuple_(Relationship.from_person_id, Relationship.to_person_id,
+                              Relationship.relationship_type).in_(key_list[start:start + self.LOOKUP_BATCH_SIZE]))
+            ).tuples())
+        for sample in samples:
+            sample['duplicate'] = keys.get(id(sample)) in found
+
+    def scan(self) -> Dict[str, Any]:
+        """扫描全部人员与关系，返回检查报告（可直接序列化为 JSON）"""
+        started = time.perf_counter()
+        scanned_at = datetime.now().isoformat(timespec='seconds')
+        self._counts = dict.fromkeys(self.ISSUE_TYPES, 0)
+        self._samples = {issue_type: [] for issue_type in self.ISSUE_TYPES}
+        report_issue = self._report_issue
+        row_detail = self._row_detail
+
+        positions, person_ids, genders, birth_days = self._load_persons()
+        person_count = len(person_ids)
+        parent_sources = array('q')
+        parent_targets = array('q')
+        relationship_count = 0
+
+        statement = select(
+            Relationship.id, Relationship.from_person_id, Relationship.to_person_id,
+            Relationship.relationship_type, Relationship.sub_type, Relationship.opposite_sub_type
+        )
+        for rows in self._stream(statement):
+            relationship_count += len(rows)
+            for link_id, from_id, to_id, rel_type, sub_type, opposite_sub_type in rows:
+                from_pos = positions.get(from_id)
+                to_pos = positions.get(to_id)
+                if from_pos is None or to_pos is None:
+                    report_issue('dangling_person', lambda: row_detail(
+                        link_id, from_id, to_id, rel_type,
+                        missing_person_ids=[pid for pid in (from_id, to_id) if pid not in positions]
+                    ))
+                    continue
+                if from_id == to_id:
+                    report_issue('self_relationship', lambda: row_detail(link_id, from_id, to_id, rel_type))
+                    continue
+                if rel_type == 'child' or (rel_type == 'spouse' and from_id > to_id) \
+                        or rel_type not in Relationship.OPPOSITE_TYPES:
+                    report_issue('non_canonical_row', lambda: row_detail(link_id, from_id, to_id, rel_type))
+                elif sub_type is None or opposite_sub_type is None:
+                    report_issue('missing_sub_type', lambda: row_detail(
+                        link_id, from_id, to_id, rel_type,
+                        directions=[name for name, value in (('forward', sub_type), ('reverse', opposite_sub_type))
+                                    if value is None]
+                    ))
+
+                if rel_type == 'spouse':
+                    if genders[from_pos] == genders[to_pos]:
+                        report_issue('same_gender_spouse', lambda: row_detail(
+                            link_id, from_id, to_id, rel_type, gender=chr(genders[from_pos])
+                        ))
+                    continue
+                if rel_type == 'parent':
+                    parent_pos, child_pos = from_pos, to_pos
+                elif rel_type == 'child':
+                    parent_pos, child_pos = to_pos, from_pos
+                else:
+                    continue
+                parent_sources.append(parent_pos)
+                parent_targets.append(child_pos)
+                if birth_days[child_pos] and birth_days[child_pos] <= birth_days[parent_pos]:
+                    report_issue('child_born_before_parent', lambda: row_detail(
+                        link_id, from_id, to_id, rel_type,
+                        parent_birth_date=datetime.fromordinal(birth_days[parent_pos]).date().isoformat(),
+                        child_birth_date=datetime.fromordinal(birth_days[child_pos]).date().isoformat()
+                    ))
+
+        for component in find_cycles(person_count, parent_sources, parent_targets):
+            members = sorted(person_ids[pos] for pos in component)
+            report_issue('ancestry_cycle', lambda: {
+                'size': len(members), 'person_ids': members[:self.CYCLE_MEMBER_LIMIT]
+            })
+        self._mark_duplicates()
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
+        issue_total = sum(self._counts.values())
+        logger.info(f"Integrity scan finished in {elapsed_ms}ms: {person_count} persons, "
+                    f"{relationship_count} relationships, {issue_total} issues")
+        return {
+            'ok': issue_total == 0,
+            'scanned_at': scanned_at,
+            'elapsed_ms': elapsed_ms,
+            'persons': person_count,
+            'relationships': relationship_count,
+            'parent_links': len(parent_sources),
+            'issue_total': issue_total,
+            'issue_counts': dict(self._counts),
+            'issues': self._samples
+        }
+
+
+class IntegrityScanJobs:
+    """完整性扫描后台任务（进程内，每个任务在守护线程中用独立会话执行，保留最近的任务结果）
+
+    同一时间只运行一个扫描：已有任务在排队或运行时，提交返回该任务。
+    """
+
+    # 保留的任务数
+    MAX_JOBS = 20
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _active_job(self) -> Optional[Dict[str, Any]]:
+        for job in self._jobs.values():
+            if job['status'] in ('pending', 'running'):
+                return job
+        return None
+
+    def submit(self, session_factory: Callable[[], Session], sample_limit: int = 100) -> Dict[str, Any]:
+        """提交扫描任务，返回任务信息（副本）"""
+        with self._lock:
+            job = self._active_job()
+            if job is None:
+                job = {
+                    'job_id': uuid.uuid4().hex,
+                    'status': 'pending',
+                    'sample_limit': sample_limit,
+                    'submitted_at': datetime.now().isoformat(timespec='seconds'),
+                    'started_at': None,
+                    'finished_at': None,
+                    'error': None,
+                    'report': None
+                }
+                self._jobs[job['job_id']] = job
+                while len(self._jobs) > self.MAX_JOBS:
+                    self._jobs.popitem(last=False)
+                threading.Thread(target=self._run, args=(job, session_factory),
+                                 name=f"integrity-scan-{job['job_id'][:8]}", daemon=True).start()
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """任务信息（副本），不存在时返回 None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _run(self, job: Dict[str, Any], session_factory: Callable[[], Session]):
+        with self._lock:
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().isoformat(timespec='seconds')
+        db = session_factory()
+        try:
+            report = IntegrityScanner(db, job['sample_limit']).scan()
+            result = {'status': 'succeeded', 'report': report}
+        except Exception as e:
+            logger.error(f"Integrity scan failed: {e}")
+            result = {'status': 'failed', 'error': str(e)}
+        finally:
+            db.close()
+        with self._lock:
+            job.update(result, finished_at=datetime.now().isoformat(timespec='seconds'))
+
+
+# 进程级的后台任务登记
+integrity_jobs = IntegrityScanJobs()
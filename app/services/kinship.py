@@ -0,0 +1,156 @@
+"""
+亲属称谓计算
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# 兄弟姐妹子类型（由“父母 → 子女”两步折叠而来，按与当时参照人的长幼区分）
+SIBLING_DISPLAY_MAP = {
+    'elder_brother': '哥哥',
+    'younger_brother': '弟弟',
+    'elder_sister': '姐姐',
+    'younger_sister': '妹妹'
+}
+
+# 称谓表：键为从本人出发的子类型链，值为称谓；
+# 值为二元组时按目标人员与本人的长幼取（年长, 年幼）
+KINSHIP_TERM_MAP: Dict[Tuple[str, ...], Union[str, Tuple[str, str]]] = {
+    (): '本人',
+    # 直系
+    ('father',): '父亲',
+    ('mother',): '母亲',
+    ('son',): '儿子',
+    ('daughter',): '女儿',
+    ('husband',): '丈夫',
+    ('wife',): '妻子',
+    ('elder_brother',): '哥哥',
+    ('younger_brother',): '弟弟',
+    ('elder_sister',): '姐姐',
+    ('younger_sister',): '妹妹',
+    ('father', 'father'): '祖父',
+    ('father', 'mother'): '祖母',
+    ('mother', 'father'): '外祖父',
+    ('mother', 'mother'): '外祖母',
+    ('father', 'father', 'father'): '曾祖父',
+    ('father', 'father', 'mother'): '曾祖母',
+    ('mother', 'father', 'father'): '外曾祖父',
+    ('mother', 'father', 'mother'): '外曾祖母',
+    ('son', 'son'): '孙子',
+    ('son', 'daughter'): '孙女',
+    ('daughter', 'son'): '外孙',
+    ('daughter', 'daughter'): '外孙女',
+    ('son', 'son', 'son'): '曾孙',
+    ('son', 'son', 'daughter'): '曾孙女',
+    # 父母的兄弟姐妹及其配偶
+    ('father', 'elder_brother'): '伯父',
+    ('father', 'younger_brother'): '叔叔',
+    ('father', 'sister'): '姑姑',
+    ('mother', 'brother'): '舅舅',
+    ('mother', 'sister'): '姨妈',
+    ('father', 'elder_brother', 'wife'): '伯母',
+    ('father', 'younger_brother', 'wife'): '婶婶',
+    ('father', 'sister', 'husband'): '姑父',
+    ('mother', 'brother', 'wife'): '舅妈',
+    ('mother', 'sister', 'husband'): '姨父',
+    ('father', 'father', 'elder_brother'): '伯祖父',
+    ('father', 'father', 'younger_brother'): '叔祖父',
+    ('father', 'father', 'sister'): '姑祖母',
+    # 堂/表兄弟姐妹
+    ('father', 'brother', 'son'): ('堂兄', '堂弟'),
+    ('father', 'brother', 'daughter'): ('堂姐', '堂妹'),
+    ('father', 'sister', 'son'): ('表兄', '表弟'),
+    ('father', 'sister', 'daughter'): ('表姐', '表妹'),
+    ('mother', 'brother', 'son'): ('表兄', '表弟'),
+    ('mother', 'brother', 'daughter'): ('表姐', '表妹'),
+    ('mother', 'sister', 'son'): ('表兄', '表弟'),
+    ('mother', 'sister', 'daughter'): ('表姐', '表妹'),
+    # 兄弟姐妹的子女及配偶
+    ('brother', 'son'): '侄子',
+    ('brother', 'daughter'): '侄女',
+    ('sister', 'son'): '外甥',
+    ('sister', 'daughter'): '外甥女',
+    ('elder_brother', 'wife'): '嫂子',
+    ('younger_brother', 'wife'): '弟媳',
+    ('elder_sister', 'husband'): '姐夫',
+    ('younger_sister', 'husband'): '妹夫',
+    # 姻亲
+    ('wife', 'father'): '岳父',
+    ('wife', 'mother'): '岳母',
+    ('husband', 'father'): '公公',
+    ('husband', 'mother'): '婆婆',
+    ('son', 'wife'): '儿媳',
+    ('daughter', 'husband'): '女婿',
+    ('wife', 'elder_brother'): '内兄',
+    ('wife', 'younger_brother'): '内弟',
+    ('wife', 'elder_sister'): '大姨子',
+    ('wife', 'younger_sister'): '小姨子',
+    ('husband', 'elder_brother'): '大伯子',
+    ('husband', 'younger_brother'): '小叔子',
+    ('husband', 'elder_sister'): '大姑子',
+    ('husband', 'younger_sister'): '小姑子',
+    # 继亲
+    ('father', 'wife'): '继母',
+    ('mother', 'husband'): '继父',
+    ('husband', 'son'): '继子',
+    ('husband', 'daughter'): '继女',
+    ('wife', 'son'): '继子',
+    ('wife', 'daughter'): '继女'
+}
+
+_PARENT_TYPES = ('father', 'mother')
+_CHILD_TYPES = ('son', 'daughter')
+
+
+def _plain(token: str) -> str:
+    """去掉长幼前缀（elder_brother → brother）"""
+    for prefix in ('elder_', 'younger_'):
+        if token.startswith(prefix):
+            return token[len(prefix):]
+    return token
+
+
+def _is_older(person, than) -> bool:
+    """person 是否比 than 年长（出生日期相同时按ID先后）"""
+    return (person.birth_date, person.id) < (than.birth_date, than.id)
+
+
+def build_kinship_chain(ego, steps: Sequence[Tuple[str, object]]) -> List[str]:
+    """把关系路径转换为子类型链
+
+    :param ego: 起点人员
+    :param steps: [(子类型, 人员)]，子类型描述该人员相对上一位人员的身份（如 father、son、wife）
+    :return: 子类型链，其中“父/母 → 子/女”两步折叠为带长幼的兄弟姐妹
+    """
+    chain = []
+    anchor = ego
+    i = 0
+    while i < len(steps):
+        sub_type, person = steps[i]
+        if sub_type in _PARENT_TYPES and i + 1 < len(steps) and steps[i + 1][0] in _CHILD_TYPES:
+            sibling_type, sibling = steps[i + 1]
+            order = 'elder_' if _is_older(sibling, anchor) else 'younger_'
+            chain.append(order + ('brother' if sibling_type == 'son' else 'sister'))
+            anchor = sibling
+            i += 2
+            continue
+        chain.append(sub_type)
+        anchor = person
+        i += 1
+    return chain
+
+
+def get_kinship_term(chain: Sequence[str], target_is_older: bool) -> Optional[str]:
+    """根据子类型链查称谓（先精确匹配，再忽略兄弟姐妹的长幼匹配）"""
+    for key in (tuple(chain), tuple(_plain(token) for token in chain)):
+        term = KINSHIP_TERM_MAP.get(key)
+        if term is not None:
+            if isinstance(term, tuple):
+                return term[0] if target_is_older else term[1]
+            return term
+    return None
+
+
+def describe_kinship_chain(chain: Sequence[str], display_map: Dict[str, str]) -> str:
+    """把子类型链描述为“父亲的哥哥的儿子”形式"""
+    names = [display_map.get(token) or SIBLING_DISPLAY_MAP.get(token, token) for token in chain]
+    return '的'.join(names)
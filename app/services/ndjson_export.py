@@ -0,0 +1,98 @@
+"""
+NDJSON 全量/增量导出服务（每行一条 JSON 记录，供同步任务使用）
+"""
+
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.models.relationship import Relationship
+
+
+class NdjsonExporter:
+    """NDJSON 导出器
+
+    通过服务端游标分批读取列值（不构造 ORM 对象，不进入会话的对象映射），
+    每行用 orjson 编码后按块产出，内存占用与数据量无关。
+    字段与接口返回的 PersonOut / RelationshipOut 一致，按 ID 升序输出。
+    """
+
+    # 游标每批读取的行数
+    STREAM_BATCH_SIZE = 2000
+
+    # 每次产出的数据块大小（字节）
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _stream(self, statement):
+        """服务端游标分批读取"""
+        return self.db.execute(
+            statement.execution_options(stream_results=True, yield_per=self.STREAM_BATCH_SIZE)
+        )
+
+    def _iter_chunks(self, statement, to_records: Optional[Callable[[Any], Iterable[dict]]] = None) -> Iterator[bytes]:
+        """将查询结果编码为 NDJSON 并按块产出（to_records 将一行转换为若干条记录，默认一行一条）"""
+        buffer = []
+        size = 0
+        for row in self._stream(statement).mappings():
+            for record in (to_records(row) if to_records else (dict(row),)):
+                line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+                buffer.append(line)
+                size += len(line)
+            if size >= self.CHUNK_SIZE:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b''.join(buffer)
+
+    def iter_persons(self, updated_since: Optional[datetime] = None) -> Iterator[bytes]:
+        """导出人员（updated_since 不为空时只导出此后新建或修改过的人员）"""
+        statement = select(*Person.__table__.columns).order_by(Person.id)
+        if updated_since is not None:
+            if updated_since.tzinfo is not None:
+                # 数据库中的时间不带时区（按 UTC 处理）
+                updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+            statement = statement.where(Person.updated_at >= updated_since)
+        return self._iter_chunks(statement)
+
+    def iter_relationships(self, after_id: Optional[int] = None) -> Iterator[bytes]:
+        """导出关系（每个存储行展开为两个方向，见 Relationship.edge_id；关系只增删不修改，
+        after_id 不为空时只导出 ID 更大的新关系）"""
+        statement = select(*Relationship.__table__.columns).order_by(Relationship.id)
+        if after_id is not None:
+            statement = statement.where(Relationship.id >= (after_id + 1) // 2)
+        return self._iter_chunks(statement, lambda row: self._relationship_edges(row, after_id))
+
+    @staticmethod
+    def _relationship_edges(row, after_id: Optional[int]) -> Iterator[dict]:
+        """存储行的两个方向（字段与 RelationshipEdge.to_dict 一致）"""
+        for reverse in (False, True):
+            edge_id = Relationship.edge_id(row['id'], reverse)
+            if after_id is not None and edge_id <= after_id:
+                continue
+            yield {
+                'id': edge_id,
+                'from_person_id': row['to_person_id'] if reverse else row['from_person_id'],
+                'to_person_id': row['from_person_id'] if reverse else row['to_person_id'],
+                'relationship_type': Relationship.OPPOSITE_TYPES[row['relationship_type']] if reverse
+                else row['relationship_type'],
+                'sub_type': row['opposite_sub_type'] if reverse else row['sub_type']
+            }
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """流式 gzip 压缩"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,124 @@
+"""
+游标（keyset）分页工具
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(order_key: str, value: Any, last_id: int) -> str:
+    """生成不透明游标：记录排序字段名、上一页最后一行的排序值和ID"""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps({'k': order_key, 'v': value, 'id': last_id}, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, order_key: str, column=None) -> Tuple[Any, int]:
+    """解析游标，返回 (排序值, 最后一行ID)；游标无效或与排序字段不匹配时抛出 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        key, value, last_id = payload['k'], payload['v'], int(payload['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if key != order_key:
+        raise ValueError(f"Cursor was issued for order_by={key}, not {order_key}")
+
+    # 按列类型还原日期
+    if column is not None and value is not None:
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return value, last_id
+
+
+def keyset_query(query, order_column, id_column, limit: int, cursor: Optional[str] = None, skip: int = 0):
+    """为查询加上 keyset 条件、排序和 LIMIT（多取一行），Query 与 select() 语句均可使用
+
+    提供游标时从游标位置继续（WHERE (col, id) > (v, last_id)），忽略 skip；
+    否则按 skip 偏移（兼容旧接口）。排序列必须非空。
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor, order_column.key, order_column)
+        if order_column is id_column:
+            query = query.filter(id_column > last_id)
+        else:
+            query = query.filter(or_(
+                order_column > value,
+                and_(order_column == value, id_column > last_id)
+            ))
+        skip = 0
+
+    order = [order_column] if order_column is id_column else [order_column, id_column]
+    return query.order_by(*order).offset(skip).limit(limit + 1)
+
+
+def keyset_page(rows: List[Any], order_column, id_column, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """由多取一行的结果得到 (当前页数据, 下一页游标)"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    order_key = order_column.key
+    return rows, encode_cursor(order_key, getattr(last, order_key), getattr(last, id_column.key))
+
+
+def paginate(query, order_column, id_column, limit: int, cursor: Optional[str] = None,
+             skip: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """按 (排序列, ID) 分页，返回 (当前页数据, 下一页游标)
+
+    多取一行判断是否还有下一页，无需 COUNT。
+    """
+    rows = keyset_query(query, order_column, id_column, limit, cursor=cursor, skip=skip).all()
+    return keyset_page(rows, order_column, id_column, limit)
+
+
+def offset_query(query, order_columns, order_key: str, limit: int, cursor: Optional[str] = None,
+                 skip: int = 0) -> Tuple[Any, int]:
+    """为查询加上排序和偏移量（多取一行），返回 (查询, 实际偏移量)"""
+    if cursor:
+        skip = _decode_offset(cursor, order_key)
+    return query.order_by(*order_columns).offset(skip).limit(limit + 1), skip
+
+
+def offset_page(rows: List[Any], order_key: str, limit: int, skip: int) -> Tuple[List[Any], Optional[str]]:
+    """由多取一行的结果得到 (当前页数据, 下一页游标)，游标记录下一页的偏移量"""
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor(order_key, skip + limit, 0)
+
+
+def paginate_offset(query, order_columns, order_key: str, limit: int, cursor: Optional[str] = None,
+                    skip: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """按偏移量分页，游标记录下一页的偏移量（用于可空列等无法做 keyset 的排序）"""
+    query, skip = offset_query(query, order_columns, order_key, limit, cursor=cursor, skip=skip)
+    return offset_page(query.all(), order_key, limit, skip)
+
+
+def _decode_offset(cursor: str, order_key: str) -> int:
+    offset, _ = decode_cursor(cursor, order_key)
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def paginate_list(items: List[Any], limit: int, cursor: Optional[str] = None,
+                  skip: int = 0, order_key: str = 'rank') -> Tuple[List[Any], Optional[str]]:
+    """对内存中已排序的结果分页（如全文检索的相关度排序），游标记录偏移量"""
+    if cursor:
+        skip = _decode_offset(cursor, order_key)
+    page = items[skip:skip + limit]
+    next_offset = skip + limit
+    if next_offset >= len(items):
+        return page, None
+    return page, encode_cursor(order_key, next_offset, 0)
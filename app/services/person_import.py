@@ -0,0 +1,264 @@
+"""
+人员批量导入服务（CSV / JSON Lines）
+"""
+
+import csv
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.services.bulk_insert import insert_returning_ids
+from app.services.person_service import PersonService
+from app.services.search_index import search_index
+from app.services.stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+
+class PersonImportService:
+    """人员批量导入服务
+
+    逐行流式解析 CSV 或 JSON Lines，每 BATCH_SIZE 行校验一次并以一条批量 INSERT 写入、
+    提交一次事务。内存占用只与批大小有关，与文件大小无关。
+    """
+
+    SUPPORTED_FORMATS = ('csv', 'ndjson')
+
+    # 每批处理的行数（一批一个事务）
+    BATCH_SIZE = 1000
+
+    # 结果中最多保留的错误明细条数
+    MAX_ERRORS = 1000
+
+    # 上传内容在内存中缓冲的上限（字节），超过后落盘到临时文件
+    SPOOL_SIZE = 8 * 1024 * 1024
+
+    GENDER_MAP = {'M': 'M', 'F': 'F', '男': 'M', '女': 'F'}
+    DATE_TYPES = ('solar', 'lunar')
+    DATE_ACCURACIES = ('exact', 'year_month', 'year_only')
+    TRUE_VALUES = ('1', 'true', 'yes', 'y', '是')
+    FALSE_VALUES = ('0', 'false', 'no', 'n', '否')
+
+    # 可选文本字段及最大长度
+    TEXT_FIELDS = {
+        'phone': 20,
+        'email': 100,
+        'birth_place': 200,
+        'avatar_path': 500,
+        'biography': None
+    }
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========== 解析 ==========
+
+    def iter_records(self, stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """逐行解析，产出 (源文件行号, 原始记录, 解析错误)"""
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, record, None
+        elif fmt == 'ndjson':
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "Each line must be a JSON object"
+                    continue
+                yield line_number, record, None
+        else:
+            raise ValueError(f"Unsupported format: {fmt}. Must be one of {list(self.SUPPORTED_FORMATS)}")
+
+    # ========== 校验 ==========
+
+    @staticmethod
+    def _blank(value) -> bool:
+        return value is None or (isinstance(value, str) and not value.strip())
+
+    @classmethod
+    def _parse_date(cls, value, field: str) -> Tuple[date, Optional[str]]:
+        """解析日期，支持 YYYY-MM-DD / YYYY-MM / YYYY，返回 (日期, 推断出的精确度)"""
+        if isinstance(value, date):
+            return value, None
+        text = str(value).strip()
+        for fmt, accuracy in (('%Y-%m-%d', None), ('%Y-%m', 'year_month'), ('%Y', 'year_only')):
+            try:
+                return datetime.strptime(text, fmt).date(), accuracy
+            except ValueError:
+                continue
+        raise ValueError(f"Invalid {field}: {value}")
+
+    @classmethod
+    def _parse_choice(cls, value, field: str, choices, default=None):
+        if cls._blank(value):
+            return default
+        value = str(value).strip()
+        if value not in choices:
+            raise ValueError(f"Invalid {field}: {value}. Must be one of {list(choices)}")
+        return value
+
+    @classmethod
+    def _parse_bool(cls, value, field: str) -> Optional[bool]:
+        if cls._blank(value):
+            return None
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in cls.TRUE_VALUES:
+            return True
+        if text in cls.FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid {field}: {value}")
+
+    def validate_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """校验并规范化一条记录，返回可直接插入的行数据（不合法时抛出 ValueError）"""
+        name = record.get('name')
+        if self._blank(name):
+            raise ValueError("Missing required field: name")
+        name = str(name).strip()
+        if len(name) > 100:
+            raise ValueError("name is longer than 100 characters")
+
+        gender = self.GENDER_MAP.get(str(record.get('gender') or '').strip().upper())
+        if gender is None:
+            raise ValueError(f"Invalid gender: {record.get('gender')}. Must be M or F")
+
+        if self._blank(record.get('birth_date')):
+            raise ValueError("Missing required field: birth_date")
+        birth_date, inferred_accuracy = self._parse_date(record['birth_date'], 'birth_date')
+
+        row = {
+            'name': name,
+            'gender': gender,
+            'birth_date': birth_date,
+            'birth_date_type': self._parse_choice(record.get('birth_date_type'), 'birth_date_type',
+                                                  self.DATE_TYPES, default='solar'),
+            'birth_date_accuracy': self._parse_choice(record.get('birth_date_accuracy'), 'birth_date_accuracy',
+                                                      self.DATE_ACCURACIES,
+                                                      default=inferred_accuracy or 'exact'),
+        }
+
+        if not self._blank(record.get('death_date')):
+            death_date, inferred_accuracy = self._parse_date(record['death_date'], 'death_date')
+            row['death_date'] = death_date
+            row['death_date_type'] = self._parse_choice(record.get('death_date_type'), 'death_date_type',
+                                                        self.DATE_TYPES, default='solar')
+            accuracy = self._parse_choice(record.get('death_date_accuracy'), 'death_date_accuracy',
+                                          self.DATE_ACCURACIES, default=inferred_accuracy)
+            if accuracy:
+                row['death_date_accuracy'] = accuracy
+        PersonService.apply_death_date_accuracy_defaults(row)
+
+        is_living = self._parse_bool(record.get('is_living'), 'is_living')
+        if is_living is None:
+            is_living = 'death_date' not in row
+        row['is_living'] = is_living
+
+        for field, max_length in self.TEXT_FIELDS.items():
+            value = record.get(field)
+            if self._blank(value):
+                row[field] = None
+                continue
+            value = str(value).strip()
+            if max_length and len(value) > max_length:
+                raise ValueError(f"{field} is longer than {max_length} characters")
+            row[field] = value
+
+        # 统一字段集合（批量 INSERT 要求每行字段一致）
+        row.setdefault('death_date', None)
+        row.setdefault('death_date_type', None)
+        row.setdefault('death_date_accuracy', None)
+        return row
+
+    # ========== 导入 ==========
+
+    def _insert_batch(self, batch: List[Tuple[int, Dict[str, Any]]], summary: Dict[str, Any]):
+        """插入一批已校验的行并提交，记录行号到新ID的映射"""
+        if not batch:
+            return
+        try:
+            StatsService(self.db).apply_deltas(
+                StatsService.merge_deltas(*(StatsService.person_deltas(row) for _, row in batch)),
+                bump_persons=True
+            )
+            new_ids = insert_returning_ids(self.db, Person, [row for _, row in batch])
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Import batch failed: {e}")
+            for line_number, _ in batch:
+                self._record_error(summary, line_number, f"Batch insert failed: {e}")
+            return
+
+        search_index.index_persons((new_id, row) for (_, row), new_id in zip(batch, new_ids))
+        summary['imported'] += len(batch)
+        summary['batches'] += 1
+        id_map = summary['id_map']
+        for (line_number, _), new_id in zip(batch, new_ids):
+            # 压缩为 [起始行号, 起始ID, 行数]，连续的行号与ID合并为一段
+            if id_map and id_map[-1][0] + id_map[-1][2] == line_number and id_map[-1][1] + id_map[-1][2] == new_id:
+                id_map[-1][2] += 1
+            else:
+                id_map.append([line_number, new_id, 1])
+
+    def _record_error(self, summary: Dict[str, Any], line_number: int, error: str):
+        summary['failed'] += 1
+        if len(summary['errors']) < self.MAX_ERRORS:
+            summary['errors'].append({'row': line_number, 'error': error})
+        else:
+            summary['errors_truncated'] = True
+
+    def import_persons(self, stream: TextIO, fmt: str) -> Dict[str, Any]:
+        """从文本流导入人员
+
+        :return: 导入结果；id_map 为 [起始行号, 起始ID, 行数] 列表，行号为源文件中的行号
+        """
+        if fmt not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}. Must be one of {list(self.SUPPORTED_FORMATS)}")
+
+        started = time.perf_counter()
+        summary = {
+            'format': fmt,
+            'total_rows': 0,
+            'imported': 0,
+            'failed': 0,
+            'batches': 0,
+            'id_map': [],
+            'errors': [],
+            'errors_truncated': False
+        }
+
+        batch = []
+        for line_number, record, parse_error in self.iter_records(stream, fmt):
+            summary['total_rows'] += 1
+            if parse_error:
+                self._record_error(summary, line_number, parse_error)
+                continue
+            try:
+                batch.append((line_number, self.validate_record(record)))
+            except ValueError as e:
+                self._record_error(summary, line_number, str(e))
+                continue
+
+            if len(batch) >= self.BATCH_SIZE:
+                self._insert_batch(batch, summary)
+                batch = []
+
+        self._insert_batch(batch, summary)
+
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Imported {summary['imported']}/{summary['total_rows']} persons "
+                    f"in {summary['elapsed_seconds']}s")
+        return summary
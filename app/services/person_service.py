@@ -7,36 +7,77 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func
 from datetime import date
 from app.models.person import Person
-from app.models.relationship import Relationship
+from app.services import relationship_edges
+from app.services.search_index import search_index
+from app.services.pagination import paginate, paginate_list, paginate_offset
+from app.services.stats_service import StatsService
+from app.services.ancestry_closure import AncestryClosureService
+from app.services.generation_service import GenerationService
+from app.services.collateral import CollateralService
 
 
 class PersonService:
     """人员服务类"""
 
+    # 关键词搜索的字段（组合筛选额外包含生平简介）
+    SEARCH_FIELDS = ('name', 'phone', 'email', 'birth_place')
+
+    # 按ID批量加载人员时每批的数量
+    LOAD_BATCH_SIZE = 1000
+
+    # 支持游标（keyset）分页的排序字段（非空列）
+    KEYSET_ORDER_FIELDS = ('id', 'name', 'birth_date')
+
     def __init__(self, db: Session):
         self.db = db
-
-    def create_person(self, person_data: Dict[str, Any]) -> Person:
-        """创建人员"""
-        # 处理 death_date_accuracy 字段逻辑
-        # 只有在填写了 death_date 时才需要 death_date_accuracy
-        if 'death_date' not in person_data or not person_data.get('death_date'):
-            # 如果没有逝世日期，确保 death_date_accuracy 为 None
+        # 进程级全文检索索引
+        self.search_index = search_index
+        # 统计计数（与人员写入在同一事务内更新）
+        self.stats = StatsService(db)
+
+    @staticmethod
+    def apply_death_date_accuracy_defaults(person_data: Dict[str, Any], partial: bool = False) -> Dict[str, Any]:
+        """处理 death_date_accuracy 字段逻辑（原地修改并返回）
+
+        :param person_data: 人员数据
+        :param partial: True 表示更新（只处理本次提交了 death_date 的情况），False 表示新建
+        """
+        if partial:
+            if 'death_date' in person_data:
+                if not person_data['death_date']:
+                    # 如果清空了逝世日期，也清空精确度
+                    person_data['death_date_accuracy'] = None
+                elif 'death_date_accuracy' not in person_data:
+                    # 如果设置了逝世日期但没有精确度，设置默认值
+                    person_data['death_date_accuracy'] = 'exact'
+        elif 'death_date' not in person_data or not person_data.get('death_date'):
+            # 只有在填写了 death_date 时才需要 death_date_accuracy，没有逝世日期时确保其为 None
             person_data.pop('death_date_accuracy', None)
         elif 'death_date_accuracy' not in person_data:
             # 如果有逝世日期但没有填写精确度，设置默认值
             person_data['death_date_accuracy'] = 'exact'
+        return person_data
 
+    def create_person(self, person_data: Dict[str, Any]) -> Person:
+        """创建人员"""
+        self.apply_death_date_accuracy_defaults(person_data)
+
+        self.stats.apply_deltas(StatsService.person_deltas(person_data), bump_persons=True)
         person = Person(**person_data)
         self.db.add(person)
         self.db.commit()
         self.db.refresh(person)
+        self.search_index.index_person(person)
         return person
 
     def get_person(self, person_id: int) -> Optional[Person]:
         """根据ID获取人员"""
         return self.db.query(Person).filter(Person.id == person_id).first()
 
+    def get_person_updated_at(self, person_id: int):
+        """只查询人员的更新时间（用于条件请求校验），人员不存在时返回 None，否则返回 (updated_at,)"""
+        return self.db.query(Person.updated_at).filter(Person.id == person_id).first()
+
     def get_person_by_name(self, name: str) -> List[Person]:
         """根据姓名获取人员（精确匹配）"""
         return self.db.query(Person).filter(Person.name == name).all()
@@ -47,57 +88,128 @@ class PersonService:
         order_column = getattr(Person, order_by, Person.id)
         return self.db.query(Person).order_by(asc(order_column)).offset(skip).limit(limit).all()
 
+    def _filtered_query(self, gender: Optional[str] = None, is_living: Optional[bool] = None):
+        """按性别/在世状态筛选的人员查询"""
+        query = self.db.query(Person)
+        if gender in ('M', 'F'):
+            query = query.filter(Person.gender == gender)
+        if is_living is not None:
+            query = query.filter(Person.is_living == is_living)
+        return query
+
+    def count_persons_filtered(self, gender: Optional[str] = None, is_living: Optional[bool] = None) -> int:
+        """按性别/在世状态统计人员数（单一条件读取统计计数，组合条件查询数据库）"""
+        if is_living is None:
+            if gender == 'M':
+                return self.stats.get_counter('persons_male')
+            if gender == 'F':
+                return self.stats.get_counter('persons_female')
+            return self.count_persons()
+        if is_living is True and gender not in ('M', 'F'):
+            return self.count_living_persons()
+
+        query = self.db.query(func.count(Person.id))
+        if gender in ('M', 'F'):
+            query = query.filter(Person.gender == gender)
+        if is_living is not None:
+            query = query.filter(Person.is_living == is_living)
+        return query.scalar()
+
+    def get_persons_page(self, skip: int = 0, limit: int = 100, order_by: str = "id",
+                         cursor: Optional[str] = None, gender: Optional[str] = None,
+                         is_living: Optional[bool] = None) -> tuple[List[Person], Optional[str]]:
+        """分页获取人员，返回 (当前页人员, 下一页游标)
+
+        按 (排序字段, id) 做 keyset 分页，传入游标时从游标位置继续；
+        其他排序字段（可空列）退化为偏移分页，游标记录偏移量。游标无效时抛出 ValueError。
+        """
+        query = self._filtered_query(gender, is_living)
+        if order_by in self.KEYSET_ORDER_FIELDS:
+            return paginate(query, getattr(Person, order_by), Person.id, limit, cursor=cursor, skip=skip)
+
+        order_column = getattr(Person, order_by, Person.id)
+        return paginate_offset(query, [asc(order_column), Person.id], f"offset:{order_by}",
+                               limit, cursor=cursor, skip=skip)
+
+    def get_generation_page(self, generation: int, skip: int = 0, limit: int = 100,
+                            cursor: Optional[str] = None) -> tuple[List[Person], Optional[str]]:
+        """分页获取第 generation 代的人员（按排行、ID 排序，走 (generation, birth_order) 索引），
+        返回 (当前页人员, 下一页游标)"""
+        GenerationService(self.db).ensure_built(commit_rebuild=True)
+        query = self.db.query(Person).filter(Person.generation == generation)
+        return paginate(query, Person.birth_order, Person.id, limit, cursor=cursor, skip=skip)
+
+    def count_generation(self, generation: int) -> int:
+        """统计第 generation 代的人数"""
+        GenerationService(self.db).ensure_built(commit_rebuild=True)
+        return self.db.query(func.count(Person.id)).filter(Person.generation == generation).scalar()
+
     def update_person(self, person_id: int, update_data: Dict[str, Any]) -> Optional[Person]:
         """更新人员信息"""
         person = self.get_person(person_id)
         if person:
-            # 处理 death_date_accuracy 逻辑
-            if 'death_date' in update_data:
-                if not update_data['death_date']:
-                    # 如果清空了逝世日期，也清空精确度
-                    update_data['death_date_accuracy'] = None
-                elif 'death_date_accuracy' not in update_data:
-                    # 如果设置了逝世日期但没有精确度，设置默认值
-                    update_data['death_date_accuracy'] = 'exact'
+            self.apply_death_date_accuracy_defaults(update_data, partial=True)
+
+            # 性别/在世状态变化时调整对应计数
+            before = {'gender': person.gender, 'is_living': person.is_living}
+            after = {key: update_data.get(key, value) for key, value in before.items()}
+            self.stats.apply_deltas(
+                StatsService.merge_deltas(StatsService.person_deltas(before, -1),
+                                          StatsService.person_deltas(after)),
+                bump_persons=True
+            )
 
+            birth_date = person.birth_date
             for key, value in update_data.items():
                 if hasattr(person, key):
                     setattr(person, key, value)
+            if person.birth_date != birth_date:
+                # 出生日期变化会改变其在兄弟姐妹中的排行
+                GenerationService(self.db).birth_dates_changed([person_id])
             self.db.commit()
             self.db.refresh(person)
+            self.search_index.index_person(person)
         return person
 
     def delete_person(self, person_id: int) -> bool:
         """删除人员"""
         person = self.get_person(person_id)
         if person:
+            self.stats.apply_deltas(StatsService.person_deltas(person, -1), bump_persons=True)
+            AncestryClosureService(self.db).remove_person(person_id)
             self.db.delete(person)
             self.db.commit()
+            self.search_index.remove_person(person_id)
             return True
         return False
 
+    def _search_ids(self, search_term: str, fields=None, gender: Optional[str] = None) -> List[int]:
+        """通过全文检索索引搜索，返回按相关度排序的人员ID"""
+        self.search_index.ensure_loaded(self.db)
+        return self.search_index.search(search_term, fields=fields or self.SEARCH_FIELDS, gender=gender)
+
+    def _load_persons_in_order(self, person_ids: List[int]) -> List[Person]:
+        """按给定ID顺序批量加载人员"""
+        persons = {}
+        for start in range(0, len(person_ids), self.LOAD_BATCH_SIZE):
+            batch = person_ids[start:start + self.LOAD_BATCH_SIZE]
+            for person in self.db.query(Person).filter(Person.id.in_(batch)):
+                persons[person.id] = person
+        return [persons[person_id] for person_id in person_ids if person_id in persons]
+
+    def search_persons_page(self, search_term: str, skip: int = 0, limit: int = 100) -> tuple[List[Person], int]:
+        """搜索人员（按相关度排序），返回 (当前页人员, 总数)，总数与分页来自同一次索引查询"""
+        person_ids = self._search_ids(search_term)
+        return self._load_persons_in_order(person_ids[skip:skip + limit]), len(person_ids)
+
     def search_persons(self, search_term: str, skip: int = 0, limit: int = 100) -> List[Person]:
-        """搜索人员（模糊匹配，带分页）"""
-        query = self.db.query(Person).filter(
-            or_(
-                Person.name.like(f"%{search_term}%"),
-                Person.phone.like(f"%{search_term}%"),
-                Person.email.like(f"%{search_term}%"),
-                Person.birth_place.like(f"%{search_term}%")
-            )
-        )
-        return query.offset(skip).limit(limit).all()
+        """搜索人员（模糊匹配，按相关度排序，带分页）"""
+        persons, _ = self.search_persons_page(search_term, skip=skip, limit=limit)
+        return persons
 
     def search_persons_all(self, search_term: str) -> List[Person]:
-        """搜索人员（模糊匹配，不分页）"""
-        return self.db.query(Person).filter(
-            or_(
-                Person.name.like(f"%{search_term}%"),
-                Person.phone.like(f"%{search_term}%"),
-                Person.email.like(f"%{search_term}%"),
-                Person.birth_place.like(f"%{search_term}%")
-            )
-        ).all()
+        """搜索人员（模糊匹配，按相关度排序，不分页）"""
+        return self._load_persons_in_order(self._search_ids(search_term))
 
     def get_persons_by_birth_date_range(self, start_date: date, end_date: date) -> List[Person]:
         """根据出生日期范围查询人员"""
@@ -126,9 +238,8 @@ class PersonService:
 
     def get_family_members(self, person_id: int) -> Dict[str, List[Person]]:
         """获取家庭成员"""
-        relationships = self.db.query(Relationship).filter(
-            Relationship.from_person_id == person_id
-        ).all()
+        links = self.db.scalars(relationship_edges.links_select(from_person_id=person_id, load_persons=True))
+        relationships = relationship_edges.expand(links, from_person_id=person_id)
 
         family = {
             'parents': [],
@@ -137,38 +248,63 @@ class PersonService:
             'siblings': []
         }
 
+        # 从本人出发的方向：本人 → X 为 parent 时 X 是子女，为 child 时 X 是父母
         for rel in relationships:
-            if rel.relationship_type == 'parent':
+            if rel.relationship_type == 'child':
                 family['parents'].append(rel.to_person)
             elif rel.relationship_type == 'spouse':
                 family['spouses'].append(rel.to_person)
-            elif rel.relationship_type == 'child':
+            elif rel.relationship_type == 'parent':
                 family['children'].append(rel.to_person)
 
+        # 兄弟姐妹含同父异母/同母异父（全血缘在前）
+        siblings = CollateralService(self.db).get_siblings(person_id)
+        family['siblings'] = [sibling for sibling, _ in siblings['full'] + siblings['half']]
         return family
 
     def count_persons(self) -> int:
-        """统计人员总数"""
-        return self.db.query(Person).count()
+        """统计人员总数（读取统计计数）"""
+        return self.stats.get_counter('persons_total')
 
     def count_search_persons(self, search_term: str) -> int:
         """统计搜索结果总数"""
-        return self.db.query(Person).filter(
-            or_(
-                Person.name.like(f"%{search_term}%"),
-                Person.phone.like(f"%{search_term}%"),
-                Person.email.like(f"%{search_term}%"),
-                Person.birth_place.like(f"%{search_term}%")
-            )
-        ).count()
+        return len(self._search_ids(search_term))
 
     def count_persons_by_gender(self, gender: str) -> int:
-        """按性别统计人员总数"""
-        return self.db.query(Person).filter(Person.gender == gender).count()
+        """按性别统计人员总数（读取统计计数）"""
+        return self.count_persons_filtered(gender=gender)
 
     def count_living_persons(self) -> int:
-        """统计在世人员总数"""
-        return self.db.query(Person).filter(Person.is_living == True).count()
+        """统计在世人员总数（读取统计计数）"""
+        return self.stats.get_counter('persons_living')
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取全部统计计数（一次查询）"""
+        return self.stats.get_counters()
+
+    def filter_persons_page(
+            self,
+            keyword: Optional[str] = None,
+            gender: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            include_total: bool = True
+    ) -> tuple[List[Person], Optional[str], Optional[int]]:
+        """组合筛选人员，返回 (当前页人员, 下一页游标, 总数)；include_total=False 时不统计总数
+
+        有关键词时走全文检索索引（按相关度排序，总数与分页来自同一次查询），
+        否则按ID做 keyset 分页。
+        """
+        gender = gender if gender in ('M', 'F') else None
+        if keyword and keyword.strip():
+            person_ids = self._search_ids(keyword, fields=self.search_index.FIELDS, gender=gender)
+            page_ids, next_cursor = paginate_list(person_ids, limit, cursor=cursor, skip=skip)
+            return self._load_persons_in_order(page_ids), next_cursor, len(person_ids)
+
+        persons, next_cursor = self.get_persons_page(skip=skip, limit=limit, cursor=cursor, gender=gender)
+        total = self.count_persons_filtered(gender=gender) if include_total else None
+        return persons, next_cursor, total
 
     def filter_persons_combined(
             self,
@@ -177,40 +313,9 @@ class PersonService:
             skip: int = 0,
             limit: int = 100
     ) -> tuple[List[Person], int]:
-        """组合筛选人员（支持关键词搜索和性别筛选）"""
+        """组合筛选人员（支持关键词搜索和性别筛选），返回 (当前页人员, 总数)"""
         try:
-            # 构建查询条件
-            query_conditions = []
-
-            # 关键词搜索条件
-            if keyword and keyword.strip():
-                query_conditions.append(
-                    or_(
-                        Person.name.like(f"%{keyword.strip()}%"),
-                        Person.phone.like(f"%{keyword.strip()}%"),
-                        Person.email.like(f"%{keyword.strip()}%"),
-                        Person.birth_place.like(f"%{keyword.strip()}%"),
-                        Person.biography.like(f"%{keyword.strip()}%")
-                    )
-                )
-
-            # 性别筛选条件
-            if gender and gender in ['M', 'F']:
-                query_conditions.append(Person.gender == gender)
-
-            # 总数查询
-            count_query = self.db.query(func.count(Person.id))
-            if query_conditions:
-                count_query = count_query.filter(and_(*query_conditions))
-            total = count_query.scalar()
-
-            # 数据查询
-            data_query = self.db.query(Person)
-            if query_conditions:
-                data_query = data_query.filter(and_(*query_conditions))
-
-            persons = data_query.order_by(Person.id).offset(skip).limit(limit).all()
-
+            persons, _, total = self.filter_persons_page(keyword, gender, skip=skip, limit=limit)
             return persons, total
 
         except Exception as e:
@@ -0,0 +1,156 @@
+"""
+热点查询执行计划检查（EXPLAIN），发现不再走索引的查询
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.person import Person
+from app.models.relationship import Relationship
+
+# 检查时使用的示例参数（只影响执行计划的选择，不要求数据存在）
+SAMPLE_ID = 1
+SAMPLE_NAME = '张三'
+SAMPLE_DATE = date(1990, 1, 1)
+SAMPLE_TIME = datetime(2024, 1, 1)
+SAMPLE_LIMIT = 20
+SAMPLE_GENERATION = 12
+
+# 兄弟姐妹查询中父母的其他子女一侧（父子关系自连接）
+SIBLING = aliased(Relationship)
+
+# 热点查询：名称 -> (生成语句的函数, 可接受的索引)；语句与服务层中的查询条件、排序一致
+HOT_QUERIES: Dict[str, Tuple[Callable[[], Any], Set[str]]] = {
+    'person_by_name': (
+        lambda: select(Person.id).where(Person.name == SAMPLE_NAME),
+        {'idx_person_name'}
+    ),
+    'persons_page_by_name': (
+        lambda: select(Person.id).where(or_(
+            Person.name > SAMPLE_NAME, and_(Person.name == SAMPLE_NAME, Person.id > SAMPLE_ID)
+        )).order_by(Person.name, Person.id).limit(SAMPLE_LIMIT + 1),
+        {'idx_person_name'}
+    ),
+    'persons_page_by_birth_date': (
+        lambda: select(Person.id).where(or_(
+            Person.birth_date > SAMPLE_DATE, and_(Person.birth_date == SAMPLE_DATE, Person.id > SAMPLE_ID)
+        )).order_by(Person.birth_date, Person.id).limit(SAMPLE_LIMIT + 1),
+        {'idx_person_birth_date'}
+    ),
+    'persons_by_birth_date_range': (
+        lambda: select(Person.id).where(Person.birth_date.between(SAMPLE_DATE, date(1990, 12, 31))),
+        {'idx_person_birth_date'}
+    ),
+    'persons_count_by_gender': (
+        lambda: select(Person.id).where(Person.gender == 'M'),
+        {'idx_person_gender'}
+    ),
+    'persons_count_living': (
+        lambda: select(Person.id).where(Person.is_living == True),
+        {'idx_person_is_living'}
+    ),
+    'persons_updated_since': (
+        lambda: select(Person.id).where(Person.updated_at >= SAMPLE_TIME),
+        {'idx_person_updated_at'}
+    ),
+    'persons_by_generation': (
+        lambda: select(Person.id).where(Person.generation == SAMPLE_GENERATION)
+        .order_by(Person.birth_order, Person.id).limit(SAMPLE_LIMIT + 1),
+        {'idx_person_generation_birth_order'}
+    ),
+    'relationship_exists': (
+        lambda: select(Relationship.id).where(
+            Relationship.from_person_id == SAMPLE_ID,
+            Relationship.to_person_id == SAMPLE_ID + 1,
+            Relationship.relationship_type == 'parent'
+        ),
+        {'uq_relationship_from_to_type'}
+    ),
+    'relationships_from_person': (
+        lambda: select(Relationship.id).where(Relationship.from_person_id == SAMPLE_ID),
+        {'uq_relationship_from_to_type'}
+    ),
+    'relationships_to_person': (
+        lambda: select(Relationship.from_person_id, Relationship.relationship_type)
+        .where(Relationship.to_person_id == SAMPLE_ID),
+        {'idx_relationship_to_type_from'}
+    ),
+    'spouses_to_person': (
+        lambda: select(Relationship.from_person_id).where(
+            Relationship.to_person_id == SAMPLE_ID, Relationship.relationship_type == 'spouse'
+        ),
+        {'idx_relationship_to_type_from'}
+    ),
+    'siblings_via_parents': (
+        lambda: select(SIBLING.to_person_id, SIBLING.relationship_type).select_from(Relationship)
+        .join(SIBLING, SIBLING.from_person_id == Relationship.from_person_id)
+        .where(Relationship.to_person_id == SAMPLE_ID, Relationship.relationship_type == 'parent'),
+        {'idx_relationship_to_type_from'}
+    ),
+    'person_relationship_details': (
+        lambda: select(Relationship.id).where(or_(
+            Relationship.from_person_id == SAMPLE_ID, Relationship.to_person_id == SAMPLE_ID
+        )),
+        {'uq_relationship_from_to_type', 'idx_relationship_to_type_from'}
+    ),
+    'relationships_count_by_type': (
+        lambda: select(Relationship.relationship_type).group_by(Relationship.relationship_type),
+        {'idx_relationship_type'}
+    ),
+}
+
+# SQLite 执行计划中的索引名
+_SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+class QueryPlanChecker:
+    """热点查询执行计划检查
+
+    对 HOT_QUERIES 中的每条查询执行 EXPLAIN（MySQL）或 EXPLAIN QUERY PLAN（SQLite），
+    取出实际使用的索引；没有使用任何一个预期索引的查询视为退化（全表扫描或走了其他索引）。
+    执行计划与数据量和统计信息有关，应在有代表性数据的库上检查。
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _explain(self, statement) -> Tuple[str, List[str], Set[str]]:
+        """返回 (SQL, 执行计划各行, 使用的索引)"""
+        connection = self.db.connection()
+        dialect = connection.dialect
+        compiled = statement.compile(dialect=dialect)
+        sql = str(compiled)
+        if compiled.positional:
+            parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+        else:
+            parameters = compiled.params
+
+        if dialect.name == 'sqlite':
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters).all()
+            plan = [row[-1] for row in rows]
+            indexes = {match.group(1) for line in plan for match in _SQLITE_INDEX.finditer(line)}
+            return sql, plan, indexes
+
+        result = connection.exec_driver_sql(f"EXPLAIN {sql}", parameters).mappings().all()
+        plan = [', '.join(f"{key}={value}" for key, value in row.items()) for row in result]
+        indexes = {name for row in result if row.get('key') for name in row['key'].split(',')}
+        return sql, plan, indexes
+
+    def check(self) -> Dict[str, Any]:
+        """检查全部热点查询，返回 {'ok': 是否全部使用预期索引, 'queries': [每条查询的检查结果]}"""
+        queries = []
+        for name, (build, expected) in HOT_QUERIES.items():
+            sql, plan, indexes = self._explain(build())
+            queries.append({
+                'name': name,
+                'ok': bool(indexes & expected),
+                'expected': sorted(expected),
+                'used': sorted(indexes),
+                'sql': sql,
+                'plan': plan
+            })
+        return {'ok': all(query['ok'] for query in queries), 'queries': queries}
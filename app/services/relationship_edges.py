@@ -0,0 +1,89 @@
+"""
+关系读取层：relationships 表每条家庭关系只存一行，读取时展开为两个方向的关系
+
+查询条件按方向改写到存储行上（反方向的 from/to 对应存储行的 to/from），仍走 relationships 表的索引；
+同步与异步读服务共用这里生成的语句，各自执行后再调用 expand / page_edges 展开。
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import joinedload
+
+from app.models.relationship import Relationship, RelationshipEdge
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+def _branches(relationship_type: Optional[str] = None) -> List[Tuple[str, bool]]:
+    """展开后可能是指定类型的 (存储类型, 是否反方向) 组合"""
+    return [(stored, reverse) for stored in Relationship.STORED_TYPES for reverse in (False, True)
+            if relationship_type is None or Relationship.edge_types(stored)[reverse] == relationship_type]
+
+
+def with_persons(statement):
+    """存储行两端的人员随查询一次联表加载（关系默认不加载关联人员）"""
+    return statement.options(joinedload(Relationship.from_person), joinedload(Relationship.to_person))
+
+
+def links_select(from_person_id: Optional[int] = None, to_person_id: Optional[int] = None,
+                 relationship_type: Optional[str] = None, load_persons: bool = False):
+    """查询展开后可能满足条件的存储行（按ID排序；load_persons=True 时联表加载关联人员）"""
+    statement = select(Relationship)
+    if from_person_id is not None or to_person_id is not None or relationship_type is not None:
+        conditions = []
+        for stored, reverse in _branches(relationship_type):
+            source, target = (Relationship.to_person_id, Relationship.from_person_id) if reverse \
+                else (Relationship.from_person_id, Relationship.to_person_id)
+            branch = [Relationship.relationship_type == stored]
+            if from_person_id is not None:
+                branch.append(source == from_person_id)
+            if to_person_id is not None:
+                branch.append(target == to_person_id)
+            conditions.append(and_(*branch))
+        statement = statement.where(or_(*conditions))
+    if load_persons:
+        statement = with_persons(statement)
+    return statement.order_by(Relationship.id)
+
+
+def expand(links: Iterable[Relationship], from_person_id: Optional[int] = None, to_person_id: Optional[int] = None,
+           relationship_type: Optional[str] = None) -> List[RelationshipEdge]:
+    """将按ID排序的存储行展开为满足条件的方向关系（结果按方向关系ID排序）"""
+    edges = []
+    for link in links:
+        for edge in link.edges():
+            if (from_person_id is None or edge.from_person_id == from_person_id) \
+                    and (to_person_id is None or edge.to_person_id == to_person_id) \
+                    and (relationship_type is None or edge.relationship_type == relationship_type):
+                edges.append(edge)
+    return edges
+
+
+def page_select(limit: int, cursor: Optional[str] = None, skip: int = 0,
+                relationship_type: Optional[str] = None) -> Tuple[object, Optional[int], int]:
+    """按方向关系ID分页时需读取的存储行（不加载关联人员）
+
+    返回 (语句, 游标中上一页最后一条关系的ID, 展开后需跳过的条数)。按 parent/child 筛选时每行只展开出一条，
+    其他情况每行两条，据此把 skip 和 limit（多取一条）换算到存储行上。
+    """
+    per_link = 1 if relationship_type in ('parent', 'child') else 2
+    statement = links_select(relationship_type=relationship_type)
+    if cursor:
+        _, after_id = decode_cursor(cursor, 'id')
+        # 上一页最后一条所在的存储行可能还剩反方向的一条
+        first_link_id = (after_id + 1) // 2
+        return statement.where(Relationship.id >= first_link_id).limit((limit + per_link) // per_link + 1), \
+            after_id, 0
+    drop = skip % per_link
+    return statement.offset(skip // per_link).limit((limit + drop + per_link) // per_link), None, drop
+
+
+def page_edges(links: Iterable[Relationship], limit: int, after_id: Optional[int], drop: int,
+               relationship_type: Optional[str] = None) -> Tuple[List[RelationshipEdge], Optional[str]]:
+    """由 page_select 读到的存储行得到 (当前页关系, 下一页游标)，游标格式与按ID的 keyset 分页一致"""
+    edges = [edge for edge in expand(links, relationship_type=relationship_type)
+             if after_id is None or edge.id > after_id][drop:]
+    if len(edges) <= limit:
+        return edges, None
+    edges = edges[:limit]
+    return edges, encode_cursor('id', edges[-1].id, edges[-1].id)
@@ -2,14 +2,21 @@
 关系相关业务逻辑服务 - 修复双向关系显示版本
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, insert, select, tuple_
 from datetime import date
 import logging
 
-from app.models.relationship import Relationship
+from app.models.relationship import Relationship, RelationshipEdge
 from app.models.person import Person
+from app.services import relationship_edges
+from app.services.ancestry_closure import AncestryClosureService
+from app.services.collateral import CollateralService
+from app.services.generation_service import GenerationService
+from app.services.graph_index import GenealogyGraphIndex, graph_index
+from app.services.stats_service import StatsService
+from app.services.kinship import build_kinship_chain, get_kinship_term, describe_kinship_chain
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -42,6 +49,12 @@ class RelationshipService:
         }
     }
 
+    # 批量加载人员时每批的ID数量
+    PERSON_BATCH_SIZE = 1000
+
+    # 批量创建关系时每批的关系数量
+    BULK_BATCH_SIZE = 500
+
     # 子类型中文显示映射
     SUB_TYPE_DISPLAY_MAP = {
         'father': '父亲',
@@ -54,79 +67,174 @@ class RelationshipService:
 
     def __init__(self, db: Session):
         self.db = db
+        # 进程级关系图索引（读路径走内存）
+        self.graph = graph_index
+        # 当前事务中已添加但尚未提交的关系边及对应的行数据
+        self._pending = GenealogyGraphIndex.overlay()
+        self._pending_rows: List[Dict[str, Any]] = []
+        # 统计计数、祖先闭包、辈分与排行（与关系写入在同一事务内更新）
+        self.stats = StatsService(db)
+        self.closure = AncestryClosureService(db)
+        self.generations = GenerationService(db)
+        # 旁系亲属（兄弟姐妹、堂表亲）查询
+        self.kin = CollateralService(db)
 
     def _get_person_or_raise(self, person_id: int) -> Person:
-        """获取人员信息，如果不存在则抛出异常"""
-        person = self.db.query(Person).filter(Person.id == person_id).first()
+        """获取人员信息，如果不存在则抛出异常（优先使用会话内已加载的对象）"""
+        person = self.db.get(Person, person_id)
         if not person:
             raise ValueError(f"Person ID {person_id} does not exist")
         return person
 
     def _relationship_exists(self, from_person_id: int, to_person_id: int,
                              relationship_type: str = None) -> bool:
-        """检查关系是否已存在"""
+        """检查关系是否已存在（内存索引 + 当前事务中待提交的关系）"""
         try:
-            query = self.db.query(Relationship).filter(
-                and_(
-                    Relationship.from_person_id == from_person_id,
-                    Relationship.to_person_id == to_person_id
-                )
-            )
-
-            if relationship_type:
-                query = query.filter(Relationship.relationship_type == relationship_type)
-
-            return query.first() is not None
+            self.graph.ensure_loaded(self.db)
+            return (self.graph.has_edge(from_person_id, to_person_id, relationship_type)
+                    or self._pending.has_edge(from_person_id, to_person_id, relationship_type))
 
         except Exception as e:
             logger.error(f"Check relationship existence failed: {e}")
             raise
 
-    def _create_relationship_if_not_exists(self, from_person_id: int, to_person_id: int,
-                                           relationship_type: str, sub_type: str = None) -> bool:
-        """如果关系不存在则创建关系（不添加消息）"""
+    def _parent_ids(self, person_id: int) -> List[int]:
+        """获取父母ID（含当前事务中待提交的关系）"""
+        self.graph.ensure_loaded(self.db)
+        return sorted(self.graph.parents(person_id) | self._pending.parents(person_id))
+
+    def _child_ids(self, person_id: int) -> List[int]:
+        """获取子女ID（含当前事务中待提交的关系）"""
+        self.graph.ensure_loaded(self.db)
+        return sorted(self.graph.children(person_id) | self._pending.children(person_id))
+
+    def _spouse_ids(self, person_id: int) -> List[int]:
+        """获取配偶ID（含当前事务中待提交的关系）"""
+        self.graph.ensure_loaded(self.db)
+        return sorted(self.graph.spouses(person_id) | self._pending.spouses(person_id))
+
+    def _is_ancestor(self, ancestor_id: int, person_id: int) -> bool:
+        """在内存索引上（含当前事务中待提交的关系）逐代向上查找，判断 ancestor_id 是否为 person_id 的祖先"""
+        visited = {person_id}
+        frontier = [person_id]
+        while frontier:
+            next_frontier = []
+            for current_id in frontier:
+                for parent_id in self._parent_ids(current_id):
+                    if parent_id == ancestor_id:
+                        return True
+                    if parent_id not in visited:
+                        visited.add(parent_id)
+                        next_frontier.append(parent_id)
+            frontier = next_frontier
+        return False
+
+    def _closes_ancestry_cycle(self, from_person_id: int, to_person_id: int, relationship_type: str) -> bool:
+        """父子关系是否会使人成为自己的祖先（父母与子女为同一人，或子女已是父母的祖先）"""
+        if relationship_type not in ('parent', 'child'):
+            return False
+        parent_id, child_id = ((from_person_id, to_person_id) if relationship_type == 'parent'
+                               else (to_person_id, from_person_id))
+        return parent_id == child_id or self._is_ancestor(child_id, parent_id)
+
+    def _reset_pending(self):
+        """清空暂存的关系"""
+        self._pending = GenealogyGraphIndex.overlay()
+        self._pending_rows = []
+
+    def _new_parent_pairs(self) -> List[Tuple[int, int]]:
+        """暂存的关系中新增的父子关系 (父母ID, 子女ID)"""
+        return sorted(AncestryClosureService.parent_pairs(
+            (row['from_person_id'], row['to_person_id'], row['relationship_type']) for row in self._pending_rows
+        ))
+
+    def _commit(self):
+        """批量插入暂存的关系并提交事务，然后同步到内存索引"""
+        try:
+            if self._pending_rows:
+                new_pairs = self._new_parent_pairs()
+                # 新增父子关系会改变人员的辈分与排行，人员数据版本随之变化
+                self.stats.apply_deltas(
+                    StatsService.relationship_deltas(row['relationship_type'] for row in self._pending_rows),
+                    bump_persons=bool(new_pairs), bump_relationships=True
+                )
+                # 闭包需在插入关系前更新：首次使用时的全量重建只统计已写入数据库的关系
+                self.closure.add_pairs(new_pairs)
+                self.db.execute(insert(Relationship), self._pending_rows)
+                self.generations.parent_pairs_changed(new_pairs)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._reset_pending()
+            raise
+        self.graph.add_edges(self._pending.iter_edges())
+        self._reset_pending()
+
+    def verify_graph_index(self) -> Dict[str, Any]:
+        """校验内存索引与 relationships 表是否一致"""
+        return self.graph.verify(self.db)
+
+    def rebuild_graph_index(self) -> int:
+        """重建内存索引，返回索引中的关系边数"""
+        self.graph.rebuild(self.db)
+        return self.graph.edge_count()
+
+    def _create_relationship_if_not_exists(self, from_person_id: int, to_person_id: int, relationship_type: str,
+                                           sub_type: str = None, opposite_sub_type: str = None) -> bool:
+        """如果关系不存在则创建关系（一行同时表示两个方向，按 Relationship.canonical 存储；不添加消息）"""
         if self._relationship_exists(from_person_id, to_person_id, relationship_type):
             logger.info(f"Relationship already exists: {from_person_id} → {to_person_id} ({relationship_type})")
             return False
 
+        stored_from, stored_to, stored_type, reverse = Relationship.canonical(
+            from_person_id, to_person_id, relationship_type
+        )
+        if reverse:
+            sub_type, opposite_sub_type = opposite_sub_type, sub_type
         relationship_data = {
-            'from_person_id': from_person_id,
-            'to_person_id': to_person_id,
-            'relationship_type': relationship_type,
-            'sub_type': sub_type
+            'from_person_id': stored_from,
+            'to_person_id': stored_to,
+            'relationship_type': stored_type,
+            'sub_type': sub_type,
+            'opposite_sub_type': opposite_sub_type
         }
 
-        relationship = Relationship(**relationship_data)
-        self.db.add(relationship)
+        # 暂存待插入的行，提交时统一批量插入
+        self._pending_rows.append(relationship_data)
+        self._pending.add_edges([(stored_from, stored_to, stored_type)])
         logger.info(f"✅ Create relationship: {from_person_id} → {to_person_id} ({relationship_type})")
         return True
 
     def _create_bidirectional_relationship_with_tracking(self, person1_id: int, person2_id: int,
                                                          relationship_type: str, messages: List[str]) -> Tuple[
         bool, bool]:
-        """创建双向关系并添加消息"""
+        """创建双向关系并添加消息（两个方向存为一行，两个方向各记一条消息）"""
         try:
             person1 = self._get_person_or_raise(person1_id)
             person2 = self._get_person_or_raise(person2_id)
 
-            # 创建主要关系
-            main_created = False
-            if not self._relationship_exists(person1_id, person2_id, relationship_type):
-                main_sub_type_en = self.SUB_TYPE_MAP.get(relationship_type, {}).get(person1.gender, '')
-                main_sub_type_zh = self.SUB_TYPE_DISPLAY_MAP.get(main_sub_type_en, main_sub_type_en)
-                self._create_relationship_if_not_exists(person1_id, person2_id, relationship_type, main_sub_type_en)
-                messages.append(f"添加 {person1.name} 为 {person2.name} 的 {main_sub_type_zh}")
-                main_created = True
-
-            # 创建相反关系
-            opposite_created = False
-            opposite_type = self.RELATIONSHIP_TYPE_MAP.get(relationship_type)
-            if opposite_type and not self._relationship_exists(person2_id, person1_id, opposite_type):
-                opposite_sub_type_en = self.SUB_TYPE_MAP.get(opposite_type, {}).get(person2.gender, '')
-                opposite_sub_type_zh = self.SUB_TYPE_DISPLAY_MAP.get(opposite_sub_type_en, opposite_sub_type_en)
-                self._create_relationship_if_not_exists(person2_id, person1_id, opposite_type, opposite_sub_type_en)
-                messages.append(f"添加 {person2.name} 为 {person1.name} 的 {opposite_sub_type_zh}")
-                opposite_created = True
+            if self._relationship_exists(person1_id, person2_id, relationship_type):
+                return False, False
+
+            # 推断出的关系同样不能与自己建立、不能使人成为自己的祖先（跳过该条关系）
+            if person1_id == person2_id or self._closes_ancestry_cycle(person1_id, person2_id, relationship_type):
+                messages.append(f"【跳过】{person1.name} 与 {person2.name} 的 {relationship_type} 关系"
+                                f"（会使人成为自己的祖先或与自己建立关系）")
+                logger.warning(f"Skip relationship {person1_id} → {person2_id} ({relationship_type}): "
+                               f"self relationship or ancestry cycle")
+                return False, False
+
+            opposite_type = self.RELATIONSHIP_TYPE_MAP[relationship_type]
+            main_sub_type_en = self.SUB_TYPE_MAP.get(relationship_type, {}).get(person1.gender, '')
+            opposite_sub_type_en = self.SUB_TYPE_MAP.get(opposite_type, {}).get(person2.gender, '')
+            self._create_relationship_if_not_exists(person1_id, person2_id, relationship_type,
+                                                    main_sub_type_en, opposite_sub_type_en)
+
+            main_sub_type_zh = self.SUB_TYPE_DISPLAY_MAP.get(main_sub_type_en, main_sub_type_en)
+            opposite_sub_type_zh = self.SUB_TYPE_DISPLAY_MAP.get(opposite_sub_type_en, opposite_sub_type_en)
+            messages.append(f"添加 {person1.name} 为 {person2.name} 的 {main_sub_type_zh}")
+            messages.append(f"添加 {person2.name} 为 {person1.name} 的 {opposite_sub_type_zh}")
+            main_created = opposite_created = True
 
             logger.info(f"✅ Create bidirectional relationship: {person1.name} ↔ {person2.name} ({relationship_type})")
             return main_created, opposite_created
@@ -148,6 +256,9 @@ class RelationshipService:
             if relationship_type == 'spouse' and from_person.gender == to_person.gender:
                 return False, "Spouse relationship must be between different genders"
 
+            if self._closes_ancestry_cycle(from_person_id, to_person_id, relationship_type):
+                return False, "Relationship would make a person their own ancestor"
+
             # 检查关系是否已存在
             if self._relationship_exists(from_person_id, to_person_id, relationship_type):
                 return False, "This relationship already exists"
@@ -158,36 +269,53 @@ class RelationshipService:
             return False, f"Error validating relationship: {e}"
 
     def get_relationships(self, from_person_id: int = None, to_person_id: int = None,
-                          relationship_type: str = None) -> List[Relationship]:
-        """获取关系列表"""
-        query = self.db.query(Relationship)
-
-        if from_person_id:
-            query = query.filter(Relationship.from_person_id == from_person_id)
-        if to_person_id:
-            query = query.filter(Relationship.to_person_id == to_person_id)
-        if relationship_type:
-            query = query.filter(Relationship.relationship_type == relationship_type)
-
-        return query.all()
+                          relationship_type: str = None) -> List[RelationshipEdge]:
+        """获取关系列表（两个方向均包含，按ID排序）"""
+        from_person_id = from_person_id or None
+        to_person_id = to_person_id or None
+        relationship_type = relationship_type or None
+        links = self.db.scalars(relationship_edges.links_select(from_person_id, to_person_id, relationship_type))
+        return relationship_edges.expand(links, from_person_id, to_person_id, relationship_type)
+
+    def _get_edge(self, from_person_id: int, to_person_id: int, relationship_type: str) -> Optional[RelationshipEdge]:
+        """按 (from, to, type) 获取一个方向的关系"""
+        stored_from, stored_to, stored_type, reverse = Relationship.canonical(
+            from_person_id, to_person_id, relationship_type
+        )
+        link = self.db.query(Relationship).filter(
+            and_(
+                Relationship.from_person_id == stored_from,
+                Relationship.to_person_id == stored_to,
+                Relationship.relationship_type == stored_type
+            )
+        ).first()
+        return link.edge(reverse) if link else None
 
-    def create_relationship_with_tracking(self, relationship_data: Dict[str, Any]) -> Tuple[Relationship, List[str]]:
+    def create_relationship_with_tracking(self, relationship_data: Dict[str, Any]) -> Tuple[RelationshipEdge,
+                                                                                             List[str]]:
         """创建关系并返回所有自动创建的关系消息"""
         from_person_id = relationship_data['from_person_id']
         to_person_id = relationship_data['to_person_id']
         relationship_type = relationship_data['relationship_type']
 
-        # 存储所有创建的关系消息
-        creation_messages = []
-
         # 验证关系
         valid, message = self._validate_relationship(from_person_id, to_person_id, relationship_type)
         if not valid:
             raise ValueError(message)
 
-        # 获取人员信息用于消息显示
-        from_person = self._get_person_or_raise(from_person_id)
-        to_person = self._get_person_or_raise(to_person_id)
+        creation_messages = self._apply_relationship_with_tracking(from_person_id, to_person_id, relationship_type)
+
+        # 提交事务
+        self._commit()
+
+        # 返回创建的主要关系和所有消息
+        return self._get_edge(from_person_id, to_person_id, relationship_type), creation_messages
+
+    def _apply_relationship_with_tracking(self, from_person_id: int, to_person_id: int,
+                                          relationship_type: str) -> List[str]:
+        """在当前事务中创建关系（双向关系 + 自动推断），返回创建消息，不提交"""
+        # 存储所有创建的关系消息
+        creation_messages = []
 
         # 1. 创建主动添加的关系（用户明确添加的关系）
         creation_messages.append(f"【主动添加】")
@@ -209,19 +337,99 @@ class RelationshipService:
         if auto_messages:
             creation_messages.extend(auto_messages)
 
-        # 提交事务
-        self.db.commit()
-
-        # 返回创建的主要关系和所有消息
-        main_relationship = self.db.query(Relationship).filter(
-            and_(
-                Relationship.from_person_id == from_person_id,
-                Relationship.to_person_id == to_person_id,
-                Relationship.relationship_type == relationship_type
-            )
-        ).first()
-
-        return main_relationship, creation_messages
+        return creation_messages
+
+    def _sync_existing_edges(self, edge_keys: Set[Tuple[int, int, str]]):
+        """用一次元组 IN 查询核对一批关系边在数据库中是否存在，并据此校正内存索引"""
+        if not edge_keys:
+            return
+        found = set(
+            self.db.query(
+                Relationship.from_person_id,
+                Relationship.to_person_id,
+                Relationship.relationship_type
+            ).filter(
+                tuple_(
+                    Relationship.from_person_id,
+                    Relationship.to_person_id,
+                    Relationship.relationship_type
+                ).in_(list(edge_keys))
+            ).all()
+        )
+        self.graph.add_edges(found)
+        self.graph.remove_edges(edge_keys - found)
+
+    def _preload_persons_for_bulk(self, person_ids: Set[int]) -> Dict[int, Person]:
+        """批量预加载本批涉及的人员及其现有父母/子女/配偶（推断逻辑会用到）"""
+        related_ids = set(person_ids)
+        for person_id in person_ids:
+            related_ids |= self.graph.parents(person_id)
+            related_ids |= self.graph.children(person_id)
+            related_ids |= self.graph.spouses(person_id)
+        return self._load_persons(related_ids)
+
+    def create_relationships_bulk(self, edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """批量创建关系（每批一次集合式存在性检查，自动创建反向关系并推断，最后统一提交一次）"""
+        self.graph.ensure_loaded(self.db)
+        results = []
+
+        for batch_start in range(0, len(edges), self.BULK_BATCH_SIZE):
+            batch = edges[batch_start:batch_start + self.BULK_BATCH_SIZE]
+
+            # 解析本批关系
+            parsed = []
+            for offset, edge in enumerate(batch):
+                index = batch_start + offset
+                try:
+                    from_person_id = int(edge['from_person_id'])
+                    to_person_id = int(edge['to_person_id'])
+                    relationship_type = edge['relationship_type']
+                except (KeyError, ValueError, TypeError) as e:
+                    results.append({'index': index, 'status': 'error', 'error': f"Invalid relationship data: {e}"})
+                    continue
+                if relationship_type not in self.RELATIONSHIP_TYPE_MAP:
+                    results.append({'index': index, 'status': 'error',
+                                    'error': f"Invalid relationship type: {relationship_type}"})
+                    continue
+                parsed.append((index, from_person_id, to_person_id, relationship_type))
+
+            # 一次 IN 查询核对本批关系（对应的存储行）是否已存在
+            edge_keys = set()
+            person_ids = set()
+            for _, from_person_id, to_person_id, relationship_type in parsed:
+                edge_keys.add(Relationship.canonical(from_person_id, to_person_id, relationship_type)[:3])
+                person_ids.update((from_person_id, to_person_id))
+            self._sync_existing_edges(edge_keys)
+
+            # 预加载人员（持有引用直到本批处理完，按ID获取人员时直接命中会话缓存）
+            preloaded_persons = self._preload_persons_for_bulk(person_ids)
+
+            for index, from_person_id, to_person_id, relationship_type in parsed:
+                valid, message = self._validate_relationship(from_person_id, to_person_id, relationship_type)
+                if not valid:
+                    status = 'exists' if message == "This relationship already exists" else 'error'
+                    results.append({'index': index, 'status': status, 'error': message})
+                    continue
+
+                messages = self._apply_relationship_with_tracking(from_person_id, to_person_id, relationship_type)
+                results.append({
+                    'index': index,
+                    'status': 'created',
+                    'created': len([msg for msg in messages if not msg.startswith('【')]),
+                    'messages': messages
+                })
+
+        created_edges = len(self._pending_rows)
+        self._commit()
+
+        results.sort(key=lambda item: item['index'])
+        return {
+            'total': len(edges),
+            'succeeded': sum(1 for item in results if item['status'] == 'created'),
+            'failed': sum(1 for item in results if item['status'] != 'created'),
+            'total_created': created_edges,
+            'results': results
+        }
 
     def _handle_parent_relationship_with_tracking(self, parent_id: int, child_id: int) -> List[str]:
         """处理父母关系自动创建逻辑并返回消息"""
@@ -268,13 +476,7 @@ class RelationshipService:
         auto_created_count = 0
 
         # 1. 自动建立与对方子女的父母关系
-        person1_children = self.get_relationships(
-            from_person_id=person1_id,
-            relationship_type='parent'
-        )
-
-        for child_rel in person1_children:
-            child_id = child_rel.to_person_id
+        for child_id in self._child_ids(person1_id):
             if not self._relationship_exists(person2_id, child_id, 'parent'):
                 # 使用带追踪的方法来创建双向关系并添加消息
                 child_main_created, child_opposite_created = self._create_bidirectional_relationship_with_tracking(
@@ -283,21 +485,7 @@ class RelationshipService:
                 if child_main_created or child_opposite_created:
                     auto_created_count += (1 if child_main_created else 0) + (1 if child_opposite_created else 0)
 
-        # 2. 自动建立与对方父母的岳父母/公婆关系
-        person1_parents = self.get_relationships(
-            from_person_id=person1_id,
-            relationship_type='child'
-        )
-
-        for parent_rel in person1_parents:
-            parent_id = parent_rel.to_person_id
-            if not self._relationship_exists(person2_id, parent_id, 'parent'):
-                # 使用带追踪的方法来创建双向关系并添加消息
-                parent_main_created, parent_opposite_created = self._create_bidirectional_relationship_with_tracking(
-                    person2_id, parent_id, 'parent', messages
-                )
-                if parent_main_created or parent_opposite_created:
-                    auto_created_count += (1 if parent_main_created else 0) + (1 if parent_opposite_created else 0)
+        # 对方父母是本人的岳父母/公婆，由配偶→父母关系推导（见 kinship），不记录为父子关系
 
         if auto_created_count > 0:
             messages.insert(0, f"【自动添加 - 配偶关系逻辑】")
@@ -305,112 +493,262 @@ class RelationshipService:
         return messages
 
     def _get_all_spouses(self, person_id: int) -> List[int]:
-        """获取所有配偶ID"""
-        spouse_ids = set()
+        """获取所有配偶ID（双向）"""
+        return self._spouse_ids(person_id)
+
+    def get_person_relationship_details(self, person_id: int) -> Dict[str, List[Tuple[Person, RelationshipEdge]]]:
+        """一次联表查询获取指定人员的所有关系
+
+        :return: {'parents'|'spouses'|'children': [(关联人员, 关系)]}；父母/子女优先取 parent 类型的方向
+                 （即 sub_type 为父亲/母亲的方向），配偶优先取从本人出发的方向
+        """
+        links = self.db.scalars(relationship_edges.with_persons(
+            select(Relationship).where(
+                or_(Relationship.from_person_id == person_id, Relationship.to_person_id == person_id)
+            ).order_by(Relationship.id)
+        )).all()
+        return self.categorize_relationships(person_id, relationship_edges.expand(links))
+
+    @staticmethod
+    def categorize_relationships(person_id: int,
+                                 rels: List[RelationshipEdge]) -> Dict[str, List[Tuple[Person, RelationshipEdge]]]:
+        """将与指定人员相关的关系（按ID排序，已加载关联人员）分为父母/配偶/子女"""
+        # 分类 -> {关联人员ID: (关联人员, 关系行)}
+        details = {
+            'parents': {},
+            'spouses': {},
+            'children': {}
+        }
 
-        # 作为发起方的配偶关系
-        spouse_relationships_as_from = self.get_relationships(
-            from_person_id=person_id,
-            relationship_type='spouse'
-        )
-        for rel in spouse_relationships_as_from:
-            spouse_ids.add(rel.to_person_id)
+        for rel in rels:
+            outgoing = rel.from_person_id == person_id
+            related_person = rel.to_person if outgoing else rel.from_person
+            if related_person is None:
+                continue
 
-        # 作为接收方的配偶关系
-        spouse_relationships_as_to = self.get_relationships(
-            to_person_id=person_id,
-            relationship_type='spouse'
-        )
-        for rel in spouse_relationships_as_to:
-            spouse_ids.add(rel.from_person_id)
+            if rel.relationship_type == 'spouse':
+                category, preferred = 'spouses', outgoing
+            elif (rel.relationship_type == 'parent') == outgoing:
+                # 本人→X parent 或 X→本人 child：X 是子女
+                category, preferred = 'children', rel.relationship_type == 'parent'
+            else:
+                category, preferred = 'parents', rel.relationship_type == 'parent'
 
-        return list(spouse_ids)
+            if related_person.id not in details[category] or preferred:
+                details[category][related_person.id] = (related_person, rel)
+
+        return {
+            category: [entries[pid] for pid in sorted(entries)]
+            for category, entries in details.items()
+        }
 
     def get_person_relationships(self, person_id: int) -> Dict[str, List[Person]]:
-        """获取指定人员的所有关系"""
-        # 查询该人员作为起点的关系
-        from_relationships = self.get_relationships(from_person_id=person_id)
-        # 查询该人员作为终点的关系
-        to_relationships = self.get_relationships(to_person_id=person_id)
-
-        relationships = {
-            'parents': [],
-            'spouses': [],
-            'children': []
+        """获取指定人员的所有关系（父母/配偶/子女）"""
+        details = self.get_person_relationship_details(person_id)
+        return {
+            category: [person for person, _ in entries]
+            for category, entries in details.items()
         }
 
-        # 用于记录已添加的人员ID，避免重复
-        added_person_ids = {
-            'parents': set(),
-            'spouses': set(),
-            'children': set()
+    def _load_persons(self, person_ids) -> Dict[int, Person]:
+        """按ID批量加载人员（每批一次 IN 查询）"""
+        person_ids = list(person_ids)
+        persons = {}
+        for i in range(0, len(person_ids), self.PERSON_BATCH_SIZE):
+            batch = person_ids[i:i + self.PERSON_BATCH_SIZE]
+            for person in self.db.query(Person).filter(Person.id.in_(batch)).all():
+                persons[person.id] = person
+        return persons
+
+    def _walk_generations(self, person_id: int, max_depth: int, next_ids) -> List[Tuple[Person, int]]:
+        """在内存索引上按代逐层遍历，最后批量加载人员，返回 (人员, 代数) 列表"""
+        generations = self.collect_generations(person_id, max_depth, next_ids)
+        persons = self._load_persons(generations.keys())
+        return self.order_generations(generations, persons)
+
+    @staticmethod
+    def collect_generations(person_id: int, max_depth: int, next_ids) -> Dict[int, int]:
+        """按代逐层遍历，返回 {人员ID: 代数}"""
+        generations = {}
+        visited = {person_id}
+        frontier = [person_id]
+
+        for generation in range(1, max_depth + 1):
+            next_frontier = []
+            for current_id in frontier:
+                for next_id in next_ids(current_id):
+                    if next_id not in visited:
+                        visited.add(next_id)
+                        generations[next_id] = generation
+                        next_frontier.append(next_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return generations
+
+    @staticmethod
+    def order_generations(generations: Dict[int, int], persons: Dict[int, Person]) -> List[Tuple[Person, int]]:
+        """按 (代数, ID) 排序，返回 (人员, 代数) 列表"""
+        ordered = sorted(generations.items(), key=lambda item: (item[1], item[0]))
+        return [(persons[pid], generation) for pid, generation in ordered if pid in persons]
+
+    def get_ancestors(self, person_id: int, max_depth: int = 10) -> List[Tuple[Person, int]]:
+        """获取祖先（父母为第1代，祖父母为第2代，依此类推）"""
+        return self._walk_generations(person_id, max_depth, self._parent_ids)
+
+    def get_descendants(self, person_id: int, max_depth: int = 10) -> List[Tuple[Person, int]]:
+        """获取后代（子女为第1代，孙辈为第2代，依此类推）"""
+        return self._walk_generations(person_id, max_depth, self._child_ids)
+
+    def _neighbor_ids(self, person_id: int) -> Set[int]:
+        """获取父母、子女、配偶ID（内存索引）"""
+        return (self.graph.parents(person_id) | self.graph.children(person_id)
+                | self.graph.spouses(person_id))
+
+    def _expand_frontier(self, frontier: List[int], visited: Dict[int, Tuple[Optional[int], int]],
+                         other_visited: Dict[int, Tuple[Optional[int], int]]) -> Tuple[List[int], Optional[int]]:
+        """整层扩展一侧的搜索前沿，返回新前沿和与另一侧的最佳交汇点"""
+        next_frontier = []
+        best_meet, best_length = None, None
+        for current_id in frontier:
+            distance = visited[current_id][1] + 1
+            for next_id in sorted(self._neighbor_ids(current_id)):
+                if next_id in visited:
+                    continue
+                visited[next_id] = (current_id, distance)
+                next_frontier.append(next_id)
+                if next_id in other_visited:
+                    length = distance + other_visited[next_id][1]
+                    if best_length is None or length < best_length:
+                        best_meet, best_length = next_id, length
+        return next_frontier, best_meet
+
+    def find_relationship_path(self, from_person_id: int, to_person_id: int,
+                               max_depth: int = 30) -> Optional[List[int]]:
+        """双向广度优先搜索两人之间的最短关系路径（人员ID序列），找不到返回 None"""
+        self.graph.ensure_loaded(self.db)
+        if from_person_id == to_person_id:
+            return [from_person_id]
+
+        # 人员ID -> (上一跳人员ID, 距离)
+        forward = {from_person_id: (None, 0)}
+        backward = {to_person_id: (None, 0)}
+        forward_frontier, backward_frontier = [from_person_id], [to_person_id]
+
+        for _ in range(max_depth):
+            if not forward_frontier or not backward_frontier:
+                break
+            # 每轮扩展较小的一侧
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meet = self._expand_frontier(forward_frontier, forward, backward)
+            else:
+                backward_frontier, meet = self._expand_frontier(backward_frontier, backward, forward)
+
+            if meet is not None:
+                path = []
+                node = meet
+                while node is not None:
+                    path.append(node)
+                    node = forward[node][0]
+                path.reverse()
+                node = backward[meet][0]
+                while node is not None:
+                    path.append(node)
+                    node = backward[node][0]
+                return path
+
+        return None
+
+    def get_kinship(self, from_person_id: int, to_person_id: int, max_depth: int = 30) -> Optional[Dict[str, Any]]:
+        """计算 to_person 是 from_person 的什么亲属（最短关系链 + 称谓），找不到路径返回 None"""
+        path = self.find_relationship_path(from_person_id, to_person_id, max_depth=max_depth)
+        if path is None:
+            return None
+
+        persons = self._load_persons(path)
+        ego = persons[from_person_id]
+        target = persons[to_person_id]
+
+        steps = []
+        for current_id, next_id in zip(path, path[1:]):
+            next_person = persons[next_id]
+            if next_id in self.graph.parents(current_id):
+                rel_type = 'parent'
+            elif next_id in self.graph.children(current_id):
+                rel_type = 'child'
+            else:
+                rel_type = 'spouse'
+            sub_type = self.SUB_TYPE_MAP[rel_type].get(next_person.gender, '')
+            steps.append((sub_type, next_person))
+
+        chain = build_kinship_chain(ego, steps)
+        description = describe_kinship_chain(chain, self.SUB_TYPE_DISPLAY_MAP)
+        kinship_term = get_kinship_term(chain, target_is_older=(target.birth_date, target.id) < (ego.birth_date, ego.id))
+
+        return {
+            'distance': len(path) - 1,
+            'kinship_term': kinship_term or description,
+            'description': description,
+            'chain': chain,
+            'path': [
+                {
+                    'person_id': person.id,
+                    'name': person.name,
+                    'gender': person.gender,
+                    'sub_type': sub_type,
+                    'sub_type_display': self.SUB_TYPE_DISPLAY_MAP.get(sub_type, sub_type)
+                }
+                for sub_type, person in [(None, ego)] + steps
+            ]
         }
 
-        # 处理从该人员出发的关系
-        for rel in from_relationships:
-            related_person = self._get_person_or_raise(rel.to_person_id)
-            if rel.relationship_type == 'parent':
-                if related_person.id not in added_person_ids['children']:
-                    relationships['children'].append(related_person)
-                    added_person_ids['children'].add(related_person.id)
-            elif rel.relationship_type == 'child':
-                if related_person.id not in added_person_ids['parents']:
-                    relationships['parents'].append(related_person)
-                    added_person_ids['parents'].add(related_person.id)
-            elif rel.relationship_type == 'spouse':
-                if related_person.id not in added_person_ids['spouses']:
-                    relationships['spouses'].append(related_person)
-                    added_person_ids['spouses'].add(related_person.id)
-
-        # 处理指向该人员的关系
-        for rel in to_relationships:
-            related_person = self._get_person_or_raise(rel.from_person_id)
-            if rel.relationship_type == 'parent':
-                if related_person.id not in added_person_ids['parents']:
-                    relationships['parents'].append(related_person)
-                    added_person_ids['parents'].add(related_person.id)
-            elif rel.relationship_type == 'child':
-                if related_person.id not in added_person_ids['children']:
-                    relationships['children'].append(related_person)
-                    added_person_ids['children'].add(related_person.id)
-            elif rel.relationship_type == 'spouse':
-                if related_person.id not in added_person_ids['spouses']:
-                    relationships['spouses'].append(related_person)
-                    added_person_ids['spouses'].add(related_person.id)
-
-        return relationships
-
-    def get_relationship(self, relationship_id: int) -> Optional[Relationship]:
-        """根据ID获取关系"""
-        return self.db.query(Relationship).filter(Relationship.id == relationship_id).first()
-
-    def get_all_relationships(self) -> List[Relationship]:
-        """获取所有关系"""
-        return self.db.query(Relationship).all()
+    def get_relationship(self, relationship_id: int) -> Optional[RelationshipEdge]:
+        """根据ID获取关系（ID 对应存储行的一个方向，见 Relationship.edge_id）"""
+        link_id, reverse = Relationship.split_edge_id(relationship_id)
+        link = self.db.get(Relationship, link_id)
+        return link.edge(reverse) if link else None
+
+    def get_all_relationships(self, load_persons: bool = False) -> List[RelationshipEdge]:
+        """获取所有关系（两个方向均包含，按ID排序；load_persons=True 时联表加载关联人员）"""
+        return relationship_edges.expand(self.db.scalars(relationship_edges.links_select(load_persons=load_persons)))
+
+    def get_relationships_page(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                               relationship_type: Optional[str] = None
+                               ) -> Tuple[List[RelationshipEdge], Optional[str]]:
+        """按ID游标分页获取关系，返回 (当前页关系, 下一页游标)；不加载关联人员"""
+        statement, after_id, drop = relationship_edges.page_select(limit, cursor=cursor, skip=skip,
+                                                                   relationship_type=relationship_type)
+        return relationship_edges.page_edges(self.db.scalars(statement), limit, after_id, drop, relationship_type)
+
+    def count_relationships_filtered(self, relationship_type: Optional[str] = None) -> int:
+        """统计关系数（可按类型筛选，读取统计计数）"""
+        if not relationship_type:
+            return self.count_relationships()
+        counter = f'relationships_{relationship_type}'
+        if counter in StatsService.RELATIONSHIP_COUNTERS:
+            return self.stats.get_counter(counter)
+        return 0
 
     def delete_relationship_and_opposite(self, relationship_id: int) -> bool:
-        """删除关系及其反向关系"""
+        """删除关系及其反向关系（两个方向存于同一行，删除该行）"""
         try:
             relationship = self.get_relationship(relationship_id)
             if not relationship:
                 return False
 
-            # 查找反向关系
-            opposite_type = self.RELATIONSHIP_TYPE_MAP.get(relationship.relationship_type)
-            opposite_relationship = self.db.query(Relationship).filter(
-                and_(
-                    Relationship.from_person_id == relationship.to_person_id,
-                    Relationship.to_person_id == relationship.from_person_id,
-                    Relationship.relationship_type == opposite_type
-                )
-            ).first()
-
-            # 删除关系
-            self.db.delete(relationship)
-            if opposite_relationship:
-                self.db.delete(opposite_relationship)
+            link = relationship.link
+            removed_edges = [(link.from_person_id, link.to_person_id, link.relationship_type)]
+            self.db.delete(link)
 
+            removed_pairs = sorted(AncestryClosureService.parent_pairs(removed_edges))
+            self.stats.apply_deltas(
+                StatsService.relationship_deltas((rel_type for _, _, rel_type in removed_edges), sign=-1),
+                bump_persons=bool(removed_pairs), bump_relationships=True
+            )
+            self.closure.remove_pairs(removed_pairs)
+            self.generations.parent_pairs_changed(removed_pairs)
             self.db.commit()
+            self.graph.remove_edges(removed_edges)
             return True
 
         except Exception as e:
@@ -418,6 +756,14 @@ class RelationshipService:
             self.db.rollback()
             return False
 
+    def rebuild_ancestry_closure(self) -> int:
+        """全量重建祖先闭包表，返回闭包行数"""
+        return self.closure.rebuild()
+
+    def rebuild_generations(self) -> int:
+        """全量重算全部人员的辈分与排行，返回人员数"""
+        return self.generations.rebuild()
+
     def count_relationships(self) -> int:
-        """统计关系总数"""
-        return self.db.query(Relationship).count()
\ No newline at end of file
+        """统计关系总数（读取统计计数）"""
+        return self.stats.get_counter('relationships_total')
\ No newline at end of file
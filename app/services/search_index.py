@@ -0,0 +1,208 @@
+"""
+人员全文检索内存索引（进程级共享）
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+
+logger = logging.getLogger(__name__)
+
+
+class PersonSearchIndex:
+    """人员 n-gram 倒排索引
+
+    对姓名、电话、邮箱、出生地、生平简介的小写文本建立单字（unigram）和双字（bigram）倒排表，
+    中文无需分词即可做任意子串检索。查询时取关键词各 n-gram 倒排表的交集作为候选，
+    再用索引中保存的原文确认子串命中并排序；总数与分页来自同一次查询结果。
+    首次使用时从数据库整体加载，之后由写入路径在事务提交后增量更新。
+    """
+
+    # 参与检索的字段
+    FIELDS = ('name', 'phone', 'email', 'birth_place', 'biography')
+
+    # 加载时每批读取的行数
+    LOAD_BATCH_SIZE = 5000
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._bind_url: Optional[str] = None
+        self._postings: Dict[str, Set[int]] = {}
+        self._documents: Dict[int, Tuple[str, Dict[str, str]]] = {}
+        # 每次索引内容变化都会递增
+        self.version = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        """索引是否已加载"""
+        return self._loaded
+
+    @staticmethod
+    def _bind_key(db: Session) -> str:
+        return str(db.get_bind().url)
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """统一为小写并折叠空白"""
+        return ' '.join(str(text).split()).casefold() if text else ''
+
+    @staticmethod
+    def grams(text: str) -> Set[str]:
+        """文本的单字与双字集合"""
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        grams.discard(' ')
+        return grams
+
+    def ensure_loaded(self, db: Session):
+        """确保索引已加载（首次调用或数据库切换时从 persons 表加载）"""
+        if self._loaded and self._bind_url == self._bind_key(db):
+            return
+        with self._lock:
+            if self._loaded and self._bind_url == self._bind_key(db):
+                return
+            self._load(db)
+
+    def rebuild(self, db: Session):
+        """从 persons 表重建索引"""
+        with self._lock:
+            self._load(db)
+
+    def invalidate(self):
+        """使索引失效，下次访问时重新加载"""
+        with self._lock:
+            self._loaded = False
+            self._bind_url = None
+            self._postings = {}
+            self._documents = {}
+            self.version += 1
+
+    def _load(self, db: Session):
+        """加载全部人员"""
+        self._postings = {}
+        self._documents = {}
+        columns = [Person.id, Person.gender] + [getattr(Person, field) for field in self.FIELDS]
+        rows = db.query(*columns).yield_per(self.LOAD_BATCH_SIZE)
+        for row in rows:
+            self._add(row[0], row[1], dict(zip(self.FIELDS, row[2:])))
+        self._loaded = True
+        self._bind_url = self._bind_key(db)
+        self.version += 1
+        logger.info(f"Person search index loaded: {len(self._documents)} persons")
+
+    def _add(self, person_id: int, gender: Optional[str], values: Mapping[str, Any]):
+        """添加一个人员（调用方持有锁）"""
+        fields = {}
+        grams = set()
+        for field in self.FIELDS:
+            text = self.normalize(values.get(field))
+            if text:
+                fields[field] = text
+                grams |= self.grams(text)
+        self._documents[person_id] = (gender, fields)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(person_id)
+
+    def _remove(self, person_id: int):
+        """删除一个人员（调用方持有锁）"""
+        document = self._documents.pop(person_id, None)
+        if document is None:
+            return
+        for text in document[1].values():
+            for gram in self.grams(text):
+                ids = self._postings.get(gram)
+                if ids is not None:
+                    ids.discard(person_id)
+                    if not ids:
+                        del self._postings[gram]
+
+    def index_persons(self, entries: Iterable[Tuple[int, Mapping[str, Any]]]):
+        """事务提交后新增或更新人员；entries 为 (人员ID, 含 gender 及检索字段的映射)"""
+        with self._lock:
+            if not self._loaded:
+                return
+            for person_id, values in entries:
+                self._remove(person_id)
+                self._add(person_id, values.get('gender'), values)
+            self.version += 1
+
+    def index_person(self, person: Person):
+        """事务提交后新增或更新单个人员"""
+        values = {field: getattr(person, field) for field in self.FIELDS}
+        values['gender'] = person.gender
+        self.index_persons([(person.id, values)])
+
+    def remove_person(self, person_id: int):
+        """事务提交后删除人员"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._remove(person_id)
+            self.version += 1
+
+    def search(self, keyword: str, fields: Optional[Sequence[str]] = None,
+               gender: Optional[str] = None) -> List[int]:
+        """检索人员，返回按相关度排序的人员ID
+
+        排序：姓名完全匹配 > 姓名前缀匹配 > 姓名包含 > 其他字段包含，同级按ID。
+        """
+        keyword = self.normalize(keyword)
+        if not keyword:
+            return []
+        fields = fields or self.FIELDS
+        grams = self.grams(keyword) or {keyword}
+        # 只需要最长的 n-gram 参与求交（双字已隐含单字）
+        if len(keyword) > 1:
+            grams = {gram for gram in grams if len(gram) == 2}
+
+        with self._lock:
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            if not postings or not postings[0]:
+                return []
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    return []
+
+            ranked = []
+            for person_id in candidates:
+                person_gender, texts = self._documents[person_id]
+                if gender and person_gender != gender:
+                    continue
+                rank = self._rank(keyword, texts, fields)
+                if rank is not None:
+                    ranked.append((rank, person_id))
+
+        ranked.sort()
+        return [person_id for _, person_id in ranked]
+
+    @staticmethod
+    def _rank(keyword: str, texts: Mapping[str, str], fields: Sequence[str]) -> Optional[int]:
+        """相关度等级（越小越相关），不命中返回 None"""
+        if 'name' in fields:
+            name = texts.get('name', '')
+            if name == keyword:
+                return 0
+            if name.startswith(keyword):
+                return 1
+            if keyword in name:
+                return 2
+        for field in fields:
+            if field != 'name' and keyword in texts.get(field, ''):
+                return 3
+        return None
+
+    def document_count(self) -> int:
+        """索引中的人员数"""
+        with self._lock:
+            return len(self._documents)
+
+
+# 进程级共享索引
+search_index = PersonSearchIndex()
@@ -0,0 +1,253 @@
+"""
+统计计数服务
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.models.relationship import Relationship
+from app.models.stats_counter import StatsCounter
+
+logger = logging.getLogger(__name__)
+
+
+class StatsService:
+    """统计计数服务
+
+    人员/关系的各项总数保存在 stats_counters 表中，由写入路径在同一事务内增减
+    （UPDATE value = value + delta），读取时一次查询取回全部计数。
+    定期对账（reconcile）以实际 COUNT 结果修正可能的漂移。
+    """
+
+    PERSON_COUNTERS = ('persons_total', 'persons_male', 'persons_female', 'persons_living')
+    RELATIONSHIP_COUNTERS = ('relationships_total', 'relationships_parent',
+                             'relationships_child', 'relationships_spouse')
+    # 数据版本号：每次人员/关系写入都会递增（可用于缓存校验）
+    VERSION_COUNTERS = ('persons_version', 'relationships_version')
+
+    COUNTERS = PERSON_COUNTERS + RELATIONSHIP_COUNTERS + VERSION_COUNTERS
+
+    # 已初始化计数表的数据库（进程级）
+    _initialized = set()
+    _init_lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========== 增量计算 ==========
+
+    @staticmethod
+    def person_deltas(person: Any, sign: int = 1) -> Dict[str, int]:
+        """一个人员对各计数的贡献（person 可为 Person 对象或行数据字典）"""
+        values = person if isinstance(person, Mapping) else {
+            'gender': person.gender, 'is_living': person.is_living
+        }
+        deltas = {'persons_total': sign}
+        if values.get('gender') == 'M':
+            deltas['persons_male'] = sign
+        elif values.get('gender') == 'F':
+            deltas['persons_female'] = sign
+        # 未提供 is_living 时按列默认值（在世）计
+        if values['is_living'] if 'is_living' in values else True:
+            deltas['persons_living'] = sign
+        return deltas
+
+    @staticmethod
+    def relationship_deltas(relationship_types: Iterable[str], sign: int = 1) -> Dict[str, int]:
+        """一组关系（relationships 表的存储行类型）对各计数的贡献
+
+        关系计数按两个方向统计（与接口展开后的关系一致）：一行 parent 计 parent、child 各一条，一行 spouse 计两条。
+        """
+        deltas: Dict[str, int] = {}
+        for stored_type in relationship_types:
+            for rel_type in Relationship.edge_types(stored_type):
+                deltas['relationships_total'] = deltas.get('relationships_total', 0) + sign
+                key = f'relationships_{rel_type}'
+                if key in StatsService.RELATIONSHIP_COUNTERS:
+                    deltas[key] = deltas.get(key, 0) + sign
+        return deltas
+
+    @staticmethod
+    def merge_deltas(*deltas_list: Mapping[str, int]) -> Dict[str, int]:
+        """合并多组增量"""
+        merged: Dict[str, int] = {}
+        for deltas in deltas_list:
+            for name, delta in deltas.items():
+                merged[name] = merged.get(name, 0) + delta
+        return merged
+
+    # ========== 写入 ==========
+
+    def _bind_key(self) -> str:
+        return str(self.db.get_bind().url)
+
+    def ensure_initialized(self, commit_backfill: bool = False):
+        """首次使用时检查计数表，缺少计数器时做一次对账补齐
+
+        写入路径（commit_backfill=False）补齐的计数行随调用方的事务提交；
+        只读路径的会话不会提交（关闭即回滚），改用独立会话补齐并立即提交，避免每个只读请求都重复补齐。
+        只有确认计数行均已存在于数据库后才记为已初始化，避免之后的增量 UPDATE 落空。
+        """
+        key = self._bind_key()
+        if key in self._initialized:
+            return
+        with self._init_lock:
+            if key in self._initialized:
+                return
+            existing = {name for (name,) in self.db.query(StatsCounter.name)}
+            if set(self.COUNTERS) <= existing:
+                self._initialized.add(key)
+            elif not commit_backfill:
+                self.reconcile(commit=False)
+            else:
+                try:
+                    with Session(bind=self.db.get_bind()) as session:
+                        StatsService(session).reconcile(commit=True)
+                except Exception as e:
+                    # 例如多个进程同时补齐：本次按实际数量返回，下次请求重新检查
+                    logger.warning(f"Stats counters backfill failed: {e}")
+
+    def apply_deltas(self, deltas: Mapping[str, int], bump_persons: bool = False,
+                     bump_relationships: bool = False):
+        """在当前事务中增减计数（不提交，随调用方的事务一起提交或回滚）
+
+        需在本次写入的数据 flush 之前调用：计数表初始化时的对账只统计已写入数据库的行。
+        """
+        self.ensure_initialized()
+        deltas = dict(deltas)
+        if bump_persons:
+            deltas['persons_version'] = deltas.get('persons_version', 0) + 1
+        if bump_relationships:
+            deltas['relationships_version'] = deltas.get('relationships_version', 0) + 1
+        for name, delta in deltas.items():
+            if delta:
+                self.db.execute(
+                    update(StatsCounter)
+                    .where(StatsCounter.name == name)
+                    .values(value=StatsCounter.value + delta)
+                )
+
+    # ========== 读取 ==========
+
+    def get_counters(self) -> Dict[str, int]:
+        """获取全部计数（一次查询）"""
+        self.ensure_initialized(commit_backfill=True)
+        counters = {name: 0 for name in self.COUNTERS}
+        stored = {name: int(value) for name, value in self.db.query(StatsCounter.name, StatsCounter.value)}
+        if not set(self.PERSON_COUNTERS + self.RELATIONSHIP_COUNTERS) <= stored.keys():
+            # 补齐未成功或当前事务的快照早于补齐提交（MySQL 可重复读）：按实际数量返回
+            counters.update(self._actual_counts())
+        counters.update(stored)
+        return counters
+
+    def get_counter(self, name: str) -> int:
+        """获取单个计数"""
+        self.ensure_initialized(commit_backfill=True)
+        value = self.db.query(StatsCounter.value).filter(StatsCounter.name == name).scalar()
+        if value is None and name not in self.VERSION_COUNTERS:
+            value = self._actual_counts().get(name)
+        return int(value or 0)
+
+    # ========== 对账 ==========
+
+    def _actual_counts(self) -> Dict[str, int]:
+        """以聚合查询统计实际数量（人员、关系各一次查询）"""
+        total, male, female, living = self.db.query(
+            func.count(Person.id),
+            func.coalesce(func.sum(case((Person.gender == 'M', 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Person.gender == 'F', 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Person.is_living == True, 1), else_=0)), 0)
+        ).one()
+        counts = {
+            'persons_total': total,
+            'persons_male': male,
+            'persons_female': female,
+            'persons_living': living,
+            'relationships_total': 0,
+            'relationships_parent': 0,
+            'relationships_child': 0,
+            'relationships_spouse': 0
+        }
+        rows = self.db.query(Relationship.relationship_type, func.count(Relationship.id)) \
+            .group_by(Relationship.relationship_type)
+        for stored_type, count in rows:
+            for rel_type in Relationship.edge_types(stored_type):
+                counts['relationships_total'] += count
+                key = f'relationships_{rel_type}'
+                if key in counts:
+                    counts[key] += count
+        return {name: int(value) for name, value in counts.items()}
+
+    def reconcile(self, commit: bool = True) -> Dict[str, Any]:
+        """按实际数量修正计数，返回修正明细 {counter: {'stored': x, 'actual': y}}"""
+        actual = self._actual_counts()
+        stored = {name: int(value) for name, value in self.db.query(StatsCounter.name, StatsCounter.value)}
+
+        drift = {}
+        for name in self.COUNTERS:
+            if name not in stored:
+                # 版本号从 0 开始，计数从实际值开始（直接执行，之后的增量 UPDATE 能立即命中）
+                self.db.execute(insert(StatsCounter).values(name=name, value=actual.get(name, 0)))
+                continue
+            if name in actual and stored[name] != actual[name]:
+                drift[name] = {'stored': stored[name], 'actual': actual[name]}
+                self.db.execute(
+                    update(StatsCounter).where(StatsCounter.name == name).values(value=actual[name])
+                )
+        if drift:
+            # 计数被修正，数据版本号随之递增
+            for name in self.VERSION_COUNTERS:
+                if name in stored:
+                    self.db.execute(
+                        update(StatsCounter).where(StatsCounter.name == name)
+                        .values(value=StatsCounter.value + 1)
+                    )
+            logger.warning(f"Stats counters drift corrected: {drift}")
+
+        if commit:
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self._initialized.add(self._bind_key())
+        return drift
+
+
+class StatsReconciler:
+    """统计计数定期对账（后台守护线程）"""
+
+    def __init__(self, session_factory, interval: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="stats-reconciler", daemon=True)
+        self._thread.start()
+        logger.info(f"Stats reconciler started (interval: {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            return StatsService(db).reconcile()
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Stats reconcile failed: {e}")
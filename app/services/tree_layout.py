@@ -0,0 +1,251 @@
+"""
+家族树布局服务（服务端按代分层计算节点坐标，并生成 SVG）
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from sqlalchemy.orm import Session
+
+from app.services.stats_service import StatsService
+from app.services.tree_service import FamilyTreeService
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 节点尺寸与间距（像素）
+NODE_WIDTH = 120
+NODE_HEIGHT = 44
+H_GAP = 24
+V_GAP = 72
+MARGIN = 20
+
+
+def _sibling_key(node: Dict[str, Any]) -> Tuple:
+    """兄弟姐妹排序键：与 BaseCLI.get_order_title 一致按出生日期从早到晚，无出生日期的排在最后"""
+    birth_date = node.get('birth_date')
+    return (birth_date is None, birth_date or date.min, node['id'])
+
+
+def _order_layer(layer: List[int], nodes: Dict[int, Dict[str, Any]], links: Dict[int, List[int]],
+                 positions: Dict[int, float], spouses: Dict[int, List[int]],
+                 fathers_first: bool = False) -> List[List[int]]:
+    """确定一层内的排列顺序，返回按顺序排列的单元（一个人及紧挨着的配偶）
+
+    有上一层（靠近中心人物一侧）连线的人按所连节点的位置排序，同一位置的按出生日期排序
+    （祖先层同一子女的父母父亲在左）；没有连线的人（如配偶）跟在其伴侣旁边。
+    """
+    layer_set = set(layer)
+
+    def anchor_key(pid):
+        linked = [positions[other] for other in links.get(pid, ()) if other in positions]
+        gender_key = 0 if fathers_first and nodes[pid]['gender'] == 'M' else 1
+        return (min(linked) if linked else float('inf'), gender_key, _sibling_key(nodes[pid]))
+
+    anchors = sorted((pid for pid in layer if any(o in positions for o in links.get(pid, ()))),
+                     key=anchor_key)
+    placed = set()
+    units = []
+    for pid in anchors + sorted(layer, key=lambda p: _sibling_key(nodes[p])):
+        if pid in placed:
+            continue
+        unit = [pid]
+        placed.add(pid)
+        for spouse_id in sorted(spouses.get(pid, ()), key=lambda p: _sibling_key(nodes[p])):
+            if spouse_id in layer_set and spouse_id not in placed \
+                    and not any(o in positions for o in links.get(spouse_id, ())):
+                unit.append(spouse_id)
+                placed.add(spouse_id)
+        units.append(unit)
+    return units
+
+
+def _place_layer(units: List[List[int]], links: Dict[int, List[int]], positions: Dict[int, float]):
+    """按单元顺序从左到右放置：单元尽量居中对齐其所连节点，与左侧单元至少间隔一个位置"""
+    next_free = None
+    for unit in units:
+        linked = [positions[other] for pid in unit for other in links.get(pid, ()) if other in positions]
+        start = (sum(linked) / len(linked) - (len(unit) - 1) / 2) if linked else (next_free or 0)
+        if next_free is not None:
+            start = max(start, next_free)
+        for offset, pid in enumerate(unit):
+            positions[pid] = start + offset
+        next_free = start + len(unit)
+
+
+def compute_layout(tree: Dict[str, Any]) -> Dict[str, Any]:
+    """计算家族树布局（纯函数，参数与返回值均可序列化，可在进程池中执行）
+
+    中心人物所在代先排，再逐层向下（子女按父母的位置及出生先后排列）、逐层向上
+    （父母按子女的位置排列，父亲在左），配偶并排放在伴侣右侧；y 由代数决定。
+    """
+    nodes = {node['id']: node for node in tree['nodes']}
+    parents: Dict[int, List[int]] = {}
+    children: Dict[int, List[int]] = {}
+    spouses: Dict[int, List[int]] = {}
+    for edge in tree['edges']:
+        if edge['type'] == 'parent':
+            children.setdefault(edge['from'], []).append(edge['to'])
+            parents.setdefault(edge['to'], []).append(edge['from'])
+        else:
+            spouses.setdefault(edge['from'], []).append(edge['to'])
+            spouses.setdefault(edge['to'], []).append(edge['from'])
+
+    layers: Dict[int, List[int]] = {}
+    for node in tree['nodes']:
+        layers.setdefault(node['depth'], []).append(node['id'])
+
+    root_id = tree['root_id']
+    # 中心人物先占位 0（中心代以自身为锚点，配偶排在右侧）
+    positions: Dict[int, float] = {root_id: 0}
+    generations = sorted(layers)
+    # 中心代 → 向下各代（按父母对齐）→ 向上各代（按子女对齐）
+    order = [g for g in generations if g >= 0] + [g for g in reversed(generations) if g < 0]
+    for generation in order:
+        if generation == 0:
+            links = {root_id: [root_id]}
+        else:
+            links = parents if generation > 0 else children
+        units = _order_layer(layers[generation], nodes, links, positions, spouses, fathers_first=generation < 0)
+        _place_layer(units, links, positions)
+
+    min_x = min(positions.values(), default=0)
+    min_depth = generations[0] if generations else 0
+    layout_nodes = []
+    for node in tree['nodes']:
+        layout_nodes.append({
+            **node,
+            'x': round(MARGIN + (positions[node['id']] - min_x) * (NODE_WIDTH + H_GAP), 1),
+            'y': MARGIN + (node['depth'] - min_depth) * (NODE_HEIGHT + V_GAP)
+        })
+    layout_nodes.sort(key=lambda node: (node['depth'], node['x']))
+    width = max((node['x'] for node in layout_nodes), default=0) + NODE_WIDTH + MARGIN
+    height = max((node['y'] for node in layout_nodes), default=0) + NODE_HEIGHT + MARGIN
+    return {
+        **tree,
+        'width': width,
+        'height': height,
+        'nodes': layout_nodes
+    }
+
+
+def render_svg(layout: Dict[str, Any]) -> str:
+    """将布局渲染为 SVG（父母→子女为折线，配偶之间为横线，男性蓝框、女性粉框，中心人物加粗）"""
+    nodes = {node['id']: node for node in layout['nodes']}
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{layout["width"]}" height="{layout["height"]}" '
+        f'viewBox="0 0 {layout["width"]} {layout["height"]}" font-family="sans-serif" font-size="13">'
+    ]
+    for edge in layout['edges']:
+        start, end = nodes.get(edge['from']), nodes.get(edge['to'])
+        if start is None or end is None:
+            continue
+        if edge['type'] == 'spouse':
+            left, right = sorted((start, end), key=lambda node: node['x'])
+            y = left['y'] + NODE_HEIGHT / 2
+            parts.append(f'<line x1="{left["x"] + NODE_WIDTH}" y1="{y}" x2="{right["x"]}" y2="{y}" '
+                         f'stroke="#c0392b" stroke-dasharray="4 3"/>')
+        else:
+            x1, y1 = start['x'] + NODE_WIDTH / 2, start['y'] + NODE_HEIGHT
+            x2, y2 = end['x'] + NODE_WIDTH / 2, end['y']
+            middle = (y1 + y2) / 2
+            parts.append(f'<path d="M{x1} {y1}V{middle}H{x2}V{y2}" fill="none" stroke="#7f8c8d"/>')
+    for node in layout['nodes']:
+        stroke = '#2980b9' if node['gender'] == 'M' else '#d6336c'
+        stroke_width = 3 if node['id'] == layout['root_id'] else 1.5
+        fill = '#ffffff' if node.get('is_living', True) else '#ecf0f1'
+        label = f'{node["birth_year"]}' if node.get('birth_year') else ''
+        parts.append(
+            f'<g><rect x="{node["x"]}" y="{node["y"]}" width="{NODE_WIDTH}" height="{NODE_HEIGHT}" rx="6" '
+            f'fill="{fill}" stroke="{stroke}" stroke-width="{stroke_width}"/>'
+            f'<text x="{node["x"] + NODE_WIDTH / 2}" y="{node["y"] + 19}" text-anchor="middle">'
+            f'{escape(node["name"])}</text>'
+            f'<text x="{node["x"] + NODE_WIDTH / 2}" y="{node["y"] + 35}" text-anchor="middle" '
+            f'font-size="11" fill="#7f8c8d">{label}</text></g>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def build_layout(tree: Dict[str, Any]) -> Dict[str, Any]:
+    """计算布局并生成 SVG（进程池任务入口）"""
+    layout = compute_layout(tree)
+    layout['svg'] = render_svg(layout)
+    return layout
+
+
+class TreeLayoutService:
+    """家族树布局服务
+
+    子图由 FamilyTreeService 获取，布局结果按 (中心人物, 参数, 人员/关系数据版本号) 缓存在进程内（LRU），
+    数据有任何写入版本号即变化，旧结果不再命中。节点数达到 Config.TREE_LAYOUT_POOL_THRESHOLD 的布局
+    交给进程池计算，不占用 API 工作线程的 GIL。
+    """
+
+    # 进程级布局缓存及进程池
+    _cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.trees = FamilyTreeService(db)
+        self.stats = StatsService(db)
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        """获取布局进程池（首次使用时创建）"""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ProcessPoolExecutor(max_workers=Config.TREE_LAYOUT_WORKERS)
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """关闭布局进程池"""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown()
+                cls._executor = None
+
+    @classmethod
+    def clear_cache(cls):
+        """清空布局缓存"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _build(self, tree: Dict[str, Any]) -> Dict[str, Any]:
+        """计算布局（大布局交给进程池，进程池不可用时在当前线程计算）"""
+        if Config.TREE_LAYOUT_WORKERS > 0 and len(tree['nodes']) >= Config.TREE_LAYOUT_POOL_THRESHOLD:
+            try:
+                return self._get_executor().submit(build_layout, tree).result()
+            except Exception as e:
+                logger.warning(f"Tree layout process pool failed, computing in-process: {e}")
+        return build_layout(tree)
+
+    def get_layout(self, person_id: int, up: int = 3, down: int = 3, spouses: bool = True,
+                   max_nodes: int = 500) -> Dict[str, Any]:
+        """获取以 person_id 为中心的家族树布局（节点带 x/y 坐标，含 SVG）"""
+        counters = self.stats.get_counters()
+        key = (self.stats._bind_key(), person_id, up, down, spouses, max_nodes,
+               *(counters[name] for name in StatsService.VERSION_COUNTERS))
+        with self._cache_lock:
+            layout = self._cache.get(key)
+            if layout is not None:
+                self._cache.move_to_end(key)
+                return layout
+
+        layout = self._build(self.trees.get_tree(person_id, up=up, down=down, spouses=spouses,
+                                                 max_nodes=max_nodes))
+        with self._cache_lock:
+            self._cache[key] = layout
+            while len(self._cache) > Config.TREE_LAYOUT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return layout
@@ -0,0 +1,124 @@
+"""
+家族树子图服务（供家族树页面一次请求获取完整的人员节点和关系边）
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.person import Person
+from app.services.graph_index import graph_index
+
+
+class FamilyTreeService:
+    """以某人为中心的家族树子图
+
+    在内存关系图上按代向上/向下扩展（可带上每个人的配偶），由近及远加入节点，
+    达到节点上限即停止；节点只查询展示所需的少数列，按批 IN 查询。
+    节点的 depth 为相对中心人物的代数：中心人物为 0，祖先为负（父母 -1），后代为正（子女 1），配偶与其伴侣同代；
+    generation 为人员本身的世代（persons.generation）。
+    """
+
+    # 每批查询的人员数
+    PERSON_BATCH_SIZE = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.graph = graph_index
+
+    def _collect(self, person_id: int, up: int, down: int, spouses: bool,
+                 max_nodes: int) -> Tuple[Dict[int, int], bool]:
+        """按代收集子图节点，返回 ({人员ID: 代数}, 是否因节点上限被截断)"""
+        generations = {person_id: 0}
+        truncated = False
+
+        def add(pid: int, generation: int) -> bool:
+            nonlocal truncated
+            if pid in generations:
+                return False
+            if len(generations) >= max_nodes:
+                truncated = True
+                return False
+            generations[pid] = generation
+            return True
+
+        def add_spouses(person_ids: List[int]):
+            if spouses:
+                for pid in person_ids:
+                    for spouse_id in sorted(self.graph.spouses(pid)):
+                        add(spouse_id, generations[pid])
+
+        add_spouses([person_id])
+        up_frontier = [person_id]
+        down_frontier = [person_id]
+        for distance in range(1, max(up, down) + 1):
+            if truncated:
+                break
+            if distance <= up:
+                up_frontier = [parent_id for pid in up_frontier
+                               for parent_id in sorted(self.graph.parents(pid)) if add(parent_id, -distance)]
+            else:
+                up_frontier = []
+            if distance <= down:
+                down_frontier = [child_id for pid in down_frontier
+                                 for child_id in sorted(self.graph.children(pid)) if add(child_id, distance)]
+            else:
+                down_frontier = []
+            if not up_frontier and not down_frontier:
+                break
+            add_spouses(up_frontier + down_frontier)
+        return generations, truncated
+
+    def _load_nodes(self, generations: Dict[int, int]) -> List[Dict[str, Any]]:
+        """批量查询节点信息（只取展示所需的列），按 (代数, ID) 排序"""
+        person_ids = sorted(generations, key=lambda pid: (generations[pid], pid))
+        rows = {}
+        for start in range(0, len(person_ids), self.PERSON_BATCH_SIZE):
+            batch = person_ids[start:start + self.PERSON_BATCH_SIZE]
+            statement = select(Person.id, Person.name, Person.gender, Person.birth_date, Person.is_living,
+                               Person.generation) \
+                .where(Person.id.in_(batch))
+            for row in self.db.execute(statement):
+                rows[row.id] = row
+        return [
+            {
+                'id': pid,
+                'name': rows[pid].name,
+                'gender': rows[pid].gender,
+                'birth_date': rows[pid].birth_date,
+                'birth_year': rows[pid].birth_date.year if rows[pid].birth_date else None,
+                'is_living': rows[pid].is_living,
+                'generation': rows[pid].generation,
+                'depth': generations[pid]
+            }
+            for pid in person_ids if pid in rows
+        ]
+
+    def _edges(self, node_ids) -> List[Dict[str, Any]]:
+        """子图内的关系边（父母→子女、配偶各一条，去重）"""
+        edges = []
+        for pid in sorted(node_ids):
+            for parent_id in sorted(self.graph.parents(pid) & node_ids):
+                edges.append({'from': parent_id, 'to': pid, 'type': 'parent'})
+            for spouse_id in sorted(self.graph.spouses(pid) & node_ids):
+                if pid < spouse_id:
+                    edges.append({'from': pid, 'to': spouse_id, 'type': 'spouse'})
+        return edges
+
+    def get_tree(self, person_id: int, up: int = 3, down: int = 3, spouses: bool = True,
+                 max_nodes: int = 500) -> Dict[str, Any]:
+        """获取以 person_id 为中心、向上 up 代、向下 down 代的家族树子图"""
+        self.graph.ensure_loaded(self.db)
+        generations, truncated = self._collect(person_id, up, down, spouses, max_nodes)
+        nodes = self._load_nodes(generations)
+        node_ids = {node['id'] for node in nodes}
+        return {
+            'root_id': person_id,
+            'up': up,
+            'down': down,
+            'total': len(nodes),
+            'truncated': truncated,
+            'nodes': nodes,
+            'edges': self._edges(node_ids)
+        }
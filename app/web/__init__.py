@@ -1,7 +1,10 @@
 from flask import Flask
+from fastapi import FastAPI
+from fastapi.middleware.wsgi import WSGIMiddleware
 from app.controllers.person_controller import person_bp
 from app.controllers.relationship_controller import relationship_bp
 from app.controllers.web_controller import web_bp
+from app.controllers.api_client import apply_api_validators
 import os
 
 def create_web_app():
@@ -34,4 +37,18 @@ def create_web_app():
     app.register_blueprint(person_bp)
     app.register_blueprint(relationship_bp)
 
-    return app
\ No newline at end of file
+    # 条件 GET：透传 API 的 ETag / Last-Modified，API 返回 304 时直接返回 304
+    app.after_request(apply_api_validators)
+
+    return app
+
+
+def create_asgi_web_app(lifespan=None):
+    """单进程部署（WEB_API_MODE=inprocess）：网页与 /api/* 由同一个 ASGI 应用提供
+
+    Flask 网页层挂载在 ASGI 应用下，控制器在进程内直接调用 API 路由函数，
+    浏览器请求只经过一次 HTTP 解析和 JSON 编码，无需单独运行 8000 端口的 API 服务。
+    """
+    asgi_app = FastAPI(lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    asgi_app.mount("/", WSGIMiddleware(create_web_app()))
+    return asgi_app
\ No newline at end of file
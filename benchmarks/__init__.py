@@ -0,0 +1,3 @@
+"""
+性能压测脚本
+"""
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""API 读接口压测：对比同步与异步数据库模式（API_ASYNC_DB）下的吞吐量与延迟分位数
+
+在临时 SQLite 库中导入若干人员，分别以两种模式启动 uvicorn，用 N 个并发客户端请求人员详情、
+人员列表和按性别筛选三类读接口，输出每秒请求数及 p50/p99 延迟。
+
+--db-latency-ms 在每条 SQL 执行前加入固定等待，模拟经网络访问 MySQL 的往返时间：
+同步模式下等待占用线程池中的线程，异步模式下等待发生在驱动线程中、不阻塞事件循环。
+
+用法（在项目根目录）：
+    python -m benchmarks.api_read_benchmark
+    python -m benchmarks.api_read_benchmark --clients 500 --db-latency-ms 0 5
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 服务进程中每条 SQL 的模拟等待（秒）
+LATENCY_ENV = 'BENCH_DB_LATENCY_MS'
+
+
+class _SlowCursor(sqlite3.Cursor):
+    """执行每条 SQL 前先等待固定时长（模拟数据库网络往返）"""
+    delay = 0.0
+
+    def execute(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super().executemany(*args, **kwargs)
+
+
+class _SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=None):
+        return super().cursor(factory or _SlowCursor)
+
+
+def _add_latency(engine, delay: float):
+    """让该引擎新建的 SQLite 连接都使用带等待的游标"""
+    from sqlalchemy import event
+
+    _SlowCursor.delay = delay
+
+    @event.listens_for(engine, 'do_connect')
+    def _use_slow_connection(dialect, conn_rec, cargs, cparams):
+        cparams['factory'] = _SlowConnection
+
+
+def create_app():
+    """服务进程入口（uvicorn --factory）：与 main.py 相同的 API 路由，按环境变量加入模拟等待"""
+    from fastapi import FastAPI
+    from app.api import api_router, dependencies
+    from config import Config
+
+    delay = float(os.getenv(LATENCY_ENV, '0')) / 1000
+    if delay:
+        _add_latency(dependencies.db_manager.engine, delay)
+        if Config.API_ASYNC_DB:
+            _add_latency(dependencies.db_manager.async_engine.sync_engine, delay)
+
+    app = FastAPI()
+    app.include_router(api_router)
+    return app
+
+
+def seed_database(path: str, persons: int):
+    """建表并导入 persons 个人员"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models.base import Base
+    from app.services.person_import import PersonImportService
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rows = "name,gender,birth_date\n" + "".join(
+        f"人员{i},{'MF'[i % 2]},{1900 + i % 100}-01-01\n" for i in range(persons)
+    )
+    with sessionmaker(bind=engine)() as session:
+        PersonImportService(session).import_persons(io.StringIO(rows), 'csv')
+    engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _request_urls(persons: int, rng: random.Random) -> List[str]:
+    return [
+        f'/api/persons/{rng.randint(1, persons)}',
+        '/api/persons?limit=20',
+        '/api/persons/filter/gender?gender=F&limit=20&include_total=false',
+    ]
+
+
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, url: str) -> int:
+    """在保持的连接上发送一个 GET 请求，读完响应体，返回状态码"""
+    writer.write(f"GET {url} HTTP/1.1\r\nHost: benchmark\r\n\r\n".encode())
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    headers = dict(line.split(': ', 1) for line in head[1:] if line)
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(head[0].split()[1])
+
+
+async def _run_load(host: str, port: int, args) -> Dict[str, float]:
+    """clients 个并发客户端各发 requests 个请求，返回吞吐量、延迟分位数（毫秒）及失败请求数
+
+    每个客户端一条保持连接、直接读写 HTTP/1.1，尽量减少压测端在同一台机器上占用的 CPU。
+    """
+    rng = random.Random(args.seed)
+    latencies: List[float] = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(args.requests):
+                url = rng.choice(_request_urls(args.persons, rng))
+                start = time.perf_counter()
+                try:
+                    failed = await asyncio.wait_for(_get(reader, writer, url), args.timeout) != 200
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    failed = True
+                    writer.close()
+                    reader, writer = await asyncio.open_connection(host, port)
+                latencies.append(time.perf_counter() - start)
+                errors += failed
+        finally:
+            writer.close()
+
+    # 预热：加载搜索索引、统计计数等首次请求才建立的缓存
+    reader, writer = await asyncio.open_connection(host, port)
+    for url in _request_urls(args.persons, rng):
+        await _get(reader, writer, url)
+    writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        'requests': count,
+        'rps': count / elapsed,
+        'p50': latencies[count // 2] * 1000,
+        'p99': latencies[min(count - 1, int(count * 0.99))] * 1000,
+        'errors': errors,
+    }
+
+
+def _wait_until_ready(port: int, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not become ready")
+
+
+def run_mode(db_path: str, mode: str, latency_ms: float, args) -> Dict[str, float]:
+    """以指定模式启动 uvicorn 并压测"""
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}",
+               API_ASYNC_DB='true' if mode == 'async' else 'false',
+               **{LATENCY_ENV: str(latency_ms)})
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'benchmarks.api_read_benchmark:create_app', '--factory',
+         '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+        cwd=ROOT, env=env
+    )
+    try:
+        _wait_until_ready(port, server)
+        return asyncio.run(_run_load('127.0.0.1', port, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 读接口同步/异步模式压测")
+    parser.add_argument('--persons', type=int, default=20000, help="导入的人员数")
+    parser.add_argument('--clients', type=int, default=500, help="并发客户端数")
+    parser.add_argument('--requests', type=int, default=10, help="每个客户端的请求数")
+    parser.add_argument('--db-latency-ms', type=float, nargs='+', default=[0, 5],
+                        help="每条 SQL 的模拟等待（毫秒），可给多个值")
+    parser.add_argument('--modes', nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+    parser.add_argument('--timeout', type=float, default=120, help="单个请求超时（秒）")
+    parser.add_argument('--seed', type=int, default=0, help="随机数种子")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'family_tree.db')
+        print(f"📥 导入 {args.persons} 个人员...")
+        seed_database(db_path, args.persons)
+        print(f"🚀 {args.clients} 个并发客户端 × {args.requests} 个请求，CPU 核数 {os.cpu_count()}")
+        print(f"{'模式':<6}{'SQL 等待(ms)':>12}{'请求数':>8}{'每秒请求':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'失败':>6}")
+        for latency_ms in args.db_latency_ms:
+            for mode in args.modes:
+                result = run_mode(db_path, mode, latency_ms, args)
+                print(f"{mode:<6}{latency_ms:>12g}{result['requests']:>8}{result['rps']:>10.0f}"
+                      f"{result['p50']:>10.0f}{result['p99']:>10.0f}{result['errors']:>6}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
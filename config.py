@@ -14,8 +14,37 @@ class Config:
     DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
     DB_NAME = os.getenv("DB_NAME", "family_tree")
 
-    # 数据库URL
-    SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # 数据库URL（可用 DATABASE_URL 整体覆盖，如本地测试使用 sqlite:///family_tree.db）
+    SQLALCHEMY_DATABASE_URL = os.getenv(
+        "DATABASE_URL", f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
+
+    # API 读接口使用异步数据库驱动（MySQL 使用 aiomysql，SQLite 使用 aiosqlite）
+    API_ASYNC_DB = os.getenv("API_ASYNC_DB", "False").lower() == "true"
+    # 异步连接池大小及溢出连接数
+    ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+    ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "40"))
+
+    # Web 层调用 API 的方式：http（经 HTTP 调用 8000 端口的 API 服务）或
+    # inprocess（网页与 /api/* 由同一个 ASGI 进程提供，控制器在进程内直接调用 API 路由）
+    WEB_API_MODE = os.getenv("WEB_API_MODE", "http").lower()
+
+    # Web 层调用的 API 服务地址及连接池配置（WEB_API_MODE=http 时使用）
+    API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+    API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))
+    API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "32"))
+    API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+    API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "10"))
+    API_RETRIES = int(os.getenv("API_RETRIES", "2"))
+    API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.2"))
+
+    # 统计计数对账间隔（秒，0 表示不启用后台对账）
+    STATS_RECONCILE_INTERVAL = int(os.getenv("STATS_RECONCILE_INTERVAL", "300"))
+
+    # 家族树布局：缓存条数、布局进程池大小（0 表示不使用进程池）、交给进程池计算的最少节点数
+    TREE_LAYOUT_CACHE_SIZE = int(os.getenv("TREE_LAYOUT_CACHE_SIZE", "256"))
+    TREE_LAYOUT_WORKERS = int(os.getenv("TREE_LAYOUT_WORKERS", "2"))
+    TREE_LAYOUT_POOL_THRESHOLD = int(os.getenv("TREE_LAYOUT_POOL_THRESHOLD", "300"))
 
     # 其他配置
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
\ No newline at end of file
@@ -4,19 +4,36 @@ from app.cli import FamilyTreeCLI
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware  # 新增导入
 from app.api import api_router
-from app.web import create_web_app
+from app.api import dependencies as api_dependencies
+from app.web import create_web_app, create_asgi_web_app
 from app.models.base import DatabaseManager
+from app.services.stats_service import StatsReconciler
+from app.services.tree_layout import TreeLayoutService
 from config import Config
+from contextlib import asynccontextmanager
 import requests
 import threading
 import time
 import psutil
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """API 服务生命周期：启动统计计数后台对账，退出时关闭异步连接池及布局进程池"""
+    reconciler = StatsReconciler(db_manager.SessionLocal, Config.STATS_RECONCILE_INTERVAL)
+    reconciler.start()
+    yield
+    reconciler.stop()
+    TreeLayoutService.shutdown()
+    await api_dependencies.db_manager.dispose_async_engine()
+
+
 # 初始化 FastAPI 应用
 app = FastAPI(
     title="Family Tree API",
     description="家族谱系系统 RESTful API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 添加CORS中间件 - 解决跨域问题
@@ -146,6 +163,18 @@ def main():
         uvicorn.run("main:app", host=host, port=8000, reload=True)
 
     elif mode == "web":
+        if Config.WEB_API_MODE == 'inprocess':
+            # 单进程部署：网页与 /api/* 由同一个 ASGI 应用提供，不再启动独立的 API 服务
+            import uvicorn
+            print(f"🌐 启动 Web 模式（单进程）：http://{host}:5000")
+            print("🎯 可用页面：")
+            print("   - 首页：http://localhost:5000")
+            print("   - 人员管理：http://localhost:5000/persons")
+            print("   - 家族树：http://localhost:5000/family-tree")
+            print("=" * 50)
+            uvicorn.run(create_asgi_web_app(lifespan=lifespan), host=host, port=5000)
+            return
+
         # 启动 Web 模式（自动启动 API）
         print("🌐 启动 Web 模式（自动启动 API 服务）")
 
@@ -0,0 +1,49 @@
+"""
+Alembic 迁移环境（数据库地址与模型元数据均复用项目配置）
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.models import Base
+from config import Config
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """命令行 -x url=... 优先，其次 alembic.ini 的 sqlalchemy.url，默认使用项目配置"""
+    return context.get_x_argument(as_dictionary=True).get('url') \
+        or config.get_main_option('sqlalchemy.url') \
+        or Config.SQLALCHEMY_DATABASE_URL
+
+
+def run_migrations_offline():
+    """离线模式：只生成 SQL 脚本，不连接数据库"""
+    context.configure(url=get_url(), target_metadata=target_metadata, literal_binds=True,
+                      dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """在线模式：连接数据库执行迁移（SQLite 使用批量模式以支持修改表结构）"""
+    engine = create_engine(get_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata,
+                          render_as_batch=connection.dialect.name == 'sqlite')
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
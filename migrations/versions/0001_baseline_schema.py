@@ -0,0 +1,78 @@
+"""基线表结构（persons / relationships / stats_counters）
+
+已由 Base.metadata.create_all 建好表的数据库直接跳过已存在的表，
+执行 alembic upgrade head 即可纳入迁移管理。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    """表是否已存在（离线生成 SQL 时按不存在处理）"""
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    if not _has_table('persons'):
+        op.create_table(
+            'persons',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, comment='人员ID'),
+            sa.Column('name', sa.String(100), nullable=False, comment='姓名'),
+            sa.Column('gender', sa.Enum('M', 'F'), nullable=False, comment='性别'),
+            sa.Column('birth_date', sa.Date(), nullable=False, comment='出生日期'),
+            sa.Column('birth_date_type', sa.Enum('solar', 'lunar'), nullable=False, comment='出生日期类型'),
+            sa.Column('birth_date_accuracy', sa.Enum('exact', 'year_month', 'year_only'), comment='出生日期精确度'),
+            sa.Column('death_date', sa.Date(), comment='逝世日期'),
+            sa.Column('death_date_type', sa.Enum('solar', 'lunar'), comment='逝世日期类型'),
+            sa.Column('death_date_accuracy', sa.Enum('exact', 'year_month', 'year_only'), comment='逝世日期精确度'),
+            sa.Column('phone', sa.String(20), comment='电话'),
+            sa.Column('email', sa.String(100), comment='邮箱'),
+            sa.Column('birth_place', sa.String(200), comment='出生地'),
+            sa.Column('avatar_path', sa.String(500), comment='头像路径'),
+            sa.Column('is_living', sa.Boolean(), comment='是否在世'),
+            sa.Column('biography', sa.Text(), comment='生平简介'),
+            sa.Column('created_at', sa.TIMESTAMP(), comment='创建时间'),
+            sa.Column('updated_at', sa.TIMESTAMP(), comment='更新时间'),
+        )
+
+    if not _has_table('relationships'):
+        op.create_table(
+            'relationships',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, comment='Relationship ID'),
+            sa.Column('from_person_id', sa.Integer(), sa.ForeignKey('persons.id'), nullable=False,
+                      comment='Source person ID'),
+            sa.Column('to_person_id', sa.Integer(), sa.ForeignKey('persons.id'), nullable=False,
+                      comment='Target person ID'),
+            sa.Column('relationship_type', sa.String(20), nullable=False,
+                      comment='Relationship type: parent, child, spouse'),
+            sa.Column('sub_type', sa.String(20),
+                      comment='Relationship sub-type: father, mother, son, daughter, husband, wife'),
+        )
+        op.create_index('idx_relationship_from_to', 'relationships', ['from_person_id', 'to_person_id'])
+        op.create_index('idx_relationship_type', 'relationships', ['relationship_type'])
+
+    if not _has_table('stats_counters'):
+        op.create_table(
+            'stats_counters',
+            sa.Column('name', sa.String(50), primary_key=True, comment='计数器名称'),
+            sa.Column('value', sa.BigInteger(), nullable=False, comment='计数值'),
+            sa.Column('updated_at', sa.TIMESTAMP(), comment='更新时间'),
+        )
+
+
+def downgrade():
+    op.drop_table('stats_counters')
+    op.drop_table('relationships')
+    op.drop_table('persons')
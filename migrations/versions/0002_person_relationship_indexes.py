@@ -0,0 +1,70 @@
+"""人员查询索引、关系按 to_person_id 查询的覆盖索引及 (from, to, type) 唯一约束
+
+添加唯一约束前删除重复的关系行（每组保留 ID 最小的一行）；
+删除后统计计数由定期对账（或「系统维护 → 统计计数对账」）修正。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+PERSON_INDEXES = {
+    'idx_person_name': ['name'],
+    'idx_person_birth_date': ['birth_date'],
+    'idx_person_gender': ['gender'],
+    'idx_person_is_living': ['is_living'],
+    'idx_person_updated_at': ['updated_at'],
+}
+
+# 基线（0001）建立的索引
+BASELINE_INDEXES = {
+    'persons': set(),
+    'relationships': {'idx_relationship_from_to', 'idx_relationship_type'},
+}
+
+
+def _index_names(table: str) -> set:
+    """表上已有的索引名（离线生成 SQL 时按基线的索引处理）"""
+    if context.is_offline_mode():
+        return BASELINE_INDEXES[table]
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    existing = _index_names('persons')
+    for name, columns in PERSON_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'persons', columns)
+
+    existing = _index_names('relationships')
+    if 'uq_relationship_from_to_type' not in existing:
+        # 外层再包一层派生表：MySQL 不允许 DELETE 的子查询直接引用被删除的表
+        op.execute(
+            "DELETE FROM relationships WHERE id NOT IN ("
+            "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM relationships "
+            "GROUP BY from_person_id, to_person_id, relationship_type) AS keep_rows)"
+        )
+        op.create_index('uq_relationship_from_to_type', 'relationships',
+                        ['from_person_id', 'to_person_id', 'relationship_type'], unique=True)
+    if 'idx_relationship_to_type_from' not in existing:
+        op.create_index('idx_relationship_to_type_from', 'relationships',
+                        ['to_person_id', 'relationship_type', 'from_person_id'])
+    # (from, to) 索引是唯一索引的前缀，不再需要（MySQL 外键所需的索引由唯一索引提供）
+    if 'idx_relationship_from_to' in existing:
+        op.drop_index('idx_relationship_from_to', table_name='relationships')
+
+
+def downgrade():
+    op.create_index('idx_relationship_from_to', 'relationships', ['from_person_id', 'to_person_id'])
+    op.drop_index('idx_relationship_to_type_from', table_name='relationships')
+    op.drop_index('uq_relationship_from_to_type', table_name='relationships')
+    for name in reversed(list(PERSON_INDEXES)):
+        op.drop_index(name, table_name='persons')
@@ -0,0 +1,42 @@
+"""祖先闭包表 ancestry_closure
+
+表在此创建，内容在首次使用时由 AncestryClosureService 按 relationships 表全量建立
+（也可在「系统维护 → 重建祖先闭包表」中手动重建）。
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    """表是否已存在（离线生成 SQL 时按不存在处理）"""
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    if _has_table('ancestry_closure'):
+        return
+    op.create_table(
+        'ancestry_closure',
+        sa.Column('ancestor_id', sa.Integer(), primary_key=True, autoincrement=False, comment='祖先ID'),
+        sa.Column('descendant_id', sa.Integer(), primary_key=True, autoincrement=False, comment='后代ID'),
+        sa.Column('depth', sa.Integer(), primary_key=True, autoincrement=False,
+                  comment='相隔代数（1 为父母与子女）'),
+        sa.Column('path_count', sa.Integer(), nullable=False, comment='路径条数'),
+    )
+    op.create_index('idx_ancestry_descendant', 'ancestry_closure', ['descendant_id', 'ancestor_id', 'depth'])
+
+
+def downgrade():
+    op.drop_table('ancestry_closure')
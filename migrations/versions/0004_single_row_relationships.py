@@ -0,0 +1,135 @@
+"""每条家庭关系只存一行，并提供两个方向的兼容视图 relationship_edges
+
+原先每条关系存两行（parent + child、两行 spouse），合并为一行：父子关系保留 父母 → 子女 的 parent 行，
+配偶关系保留 ID 小 → 大 的一行，反方向的子类型存入 opposite_sub_type。只有反方向一行的关系换算为存储方向
+后保留。合并后关系ID由存储行导出（正方向 = 行ID × 2，反方向 = 行ID × 2 + 1），与应用接口及
+relationship_edges 视图一致。统计计数按两个方向统计，合并前后不变；进程内的关系图索引需重启后重新加载。
+由 Base.metadata.create_all 建表的数据库已有 opposite_sub_type 列（关系行已是每条一行），跳过加列与合并。
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _column_names(table: str) -> set:
+    """表上已有的列名（离线生成 SQL 时按 0003 的表结构处理）"""
+    if context.is_offline_mode():
+        return set()
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _has_view(name: str) -> bool:
+    """视图是否已存在（离线生成 SQL 时按不存在处理）"""
+    if context.is_offline_mode():
+        return False
+    return name in sa.inspect(op.get_bind()).get_view_names()
+
+
+def _reverse_rows(alias: str = '') -> str:
+    """非存储方向的行：child 行、ID 大 → 小的 spouse 行"""
+    prefix = f'{alias}.' if alias else ''
+    return (f"({prefix}relationship_type = 'child' OR ({prefix}relationship_type = 'spouse' "
+            f"AND {prefix}from_person_id > {prefix}to_person_id))")
+
+
+# 由性别得到子类型（{column} 为关系中该方向出发的人员ID列）
+SUB_TYPE_BY_GENDER = (
+    "(SELECT CASE {relationship_type} WHEN 'parent' THEN CASE p.gender WHEN 'M' THEN 'father' ELSE 'mother' END "
+    "WHEN 'child' THEN CASE p.gender WHEN 'M' THEN 'son' ELSE 'daughter' END "
+    "ELSE CASE p.gender WHEN 'M' THEN 'husband' ELSE 'wife' END END "
+    "FROM persons p WHERE p.id = {column})"
+)
+
+EDGES_VIEW = (
+    "CREATE VIEW relationship_edges AS "
+    "SELECT id * 2 AS id, id AS link_id, from_person_id, to_person_id, relationship_type, sub_type "
+    "FROM relationships "
+    "UNION ALL "
+    "SELECT id * 2 + 1 AS id, id AS link_id, to_person_id AS from_person_id, from_person_id AS to_person_id, "
+    "CASE relationship_type WHEN 'parent' THEN 'child' ELSE relationship_type END AS relationship_type, "
+    "opposite_sub_type AS sub_type "
+    "FROM relationships"
+)
+
+
+def _collapse_rows():
+    """添加 opposite_sub_type 列，并将每条关系的两行合并为一行"""
+    with op.batch_alter_table('relationships') as batch_op:
+        batch_op.add_column(sa.Column('opposite_sub_type', sa.String(20),
+                                      comment='Sub-type of the reverse direction: son, daughter, husband, wife'))
+
+    # 1. 存储方向的行取反方向行的子类型（派生表加 DISTINCT 使 MySQL 先物化，允许引用被更新的表）
+    op.execute(
+        "UPDATE relationships SET opposite_sub_type = ("
+        "SELECT o.sub_type FROM (SELECT DISTINCT from_person_id, to_person_id, relationship_type, sub_type "
+        "FROM relationships) AS o "
+        "WHERE o.from_person_id = relationships.to_person_id AND o.to_person_id = relationships.from_person_id "
+        "AND o.relationship_type = CASE relationships.relationship_type WHEN 'parent' THEN 'child' "
+        "ELSE 'spouse' END) "
+        f"WHERE NOT {_reverse_rows()}"
+    )
+
+    # 2. 只有反方向一行的关系：按存储方向插入一行
+    op.execute(
+        "INSERT INTO relationships (from_person_id, to_person_id, relationship_type, sub_type, opposite_sub_type) "
+        "SELECT r.to_person_id, r.from_person_id, "
+        "CASE r.relationship_type WHEN 'child' THEN 'parent' ELSE 'spouse' END, NULL, r.sub_type "
+        "FROM (SELECT DISTINCT from_person_id, to_person_id, relationship_type, sub_type FROM relationships) AS r "
+        f"WHERE {_reverse_rows('r')} "
+        "AND NOT EXISTS (SELECT 1 FROM (SELECT DISTINCT from_person_id, to_person_id, relationship_type "
+        "FROM relationships) AS o "
+        "WHERE o.from_person_id = r.to_person_id AND o.to_person_id = r.from_person_id "
+        "AND o.relationship_type = CASE r.relationship_type WHEN 'child' THEN 'parent' ELSE 'spouse' END)"
+    )
+
+    # 3. 删除反方向的行
+    op.execute(f"DELETE FROM relationships WHERE {_reverse_rows()}")
+
+
+def upgrade():
+    # 由 Base.metadata.create_all 建表的数据库已有 opposite_sub_type 列，关系行也已按每条关系一行写入，
+    # 只需补齐子类型及视图
+    if 'opposite_sub_type' not in _column_names('relationships'):
+        _collapse_rows()
+
+    # 4. 缺少的子类型按人员性别补齐
+    op.execute(
+        "UPDATE relationships SET sub_type = "
+        + SUB_TYPE_BY_GENDER.format(relationship_type='relationships.relationship_type',
+                                  column='relationships.from_person_id')
+        + " WHERE sub_type IS NULL"
+    )
+    op.execute(
+        "UPDATE relationships SET opposite_sub_type = "
+        + SUB_TYPE_BY_GENDER.format(
+            relationship_type="CASE relationships.relationship_type WHEN 'parent' THEN 'child' ELSE 'spouse' END",
+            column='relationships.to_person_id'
+        )
+        + " WHERE opposite_sub_type IS NULL"
+    )
+
+    if not _has_view('relationship_edges'):
+        op.execute(EDGES_VIEW)
+
+
+def downgrade():
+    op.execute("DROP VIEW relationship_edges")
+    # 恢复每个方向各一行
+    op.execute(
+        "INSERT INTO relationships (from_person_id, to_person_id, relationship_type, sub_type) "
+        "SELECT r.to_person_id, r.from_person_id, "
+        "CASE r.relationship_type WHEN 'parent' THEN 'child' ELSE 'spouse' END, r.opposite_sub_type "
+        "FROM (SELECT DISTINCT from_person_id, to_person_id, relationship_type, opposite_sub_type "
+        "FROM relationships) AS r"
+    )
+    with op.batch_alter_table('relationships') as batch_op:
+        batch_op.drop_column('opposite_sub_type')
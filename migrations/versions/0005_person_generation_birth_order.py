@@ -0,0 +1,50 @@
+"""人员辈分 generation 与排行 birth_order
+
+两列在此添加（已有人员为空），由 GenerationService 在首次使用时按祖先闭包与 relationships 表全量计算
+（也可在「系统维护 → 重算辈分与排行」中手动重算），之后随父子关系、出生日期的变化增量维护。
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def _existing(table: str):
+    """表上已有的列名及索引名（离线生成 SQL 时按 0004 的表结构处理）"""
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    return ({column['name'] for column in inspector.get_columns(table)},
+            {index['name'] for index in inspector.get_indexes(table)})
+
+
+def upgrade():
+    # 由 Base.metadata.create_all 建表的数据库已有这两列及索引，跳过已存在的部分
+    columns, indexes = _existing('persons')
+    new_columns = [
+        column for column in (
+            sa.Column('generation', sa.Integer(), comment='辈分：所在世代（没有父母记录的人为第 1 代）'),
+            sa.Column('birth_order', sa.Integer(), comment='排行：在同父同母的兄弟姐妹中的出生顺序'),
+        ) if column.name not in columns
+    ]
+    if new_columns:
+        with op.batch_alter_table('persons') as batch_op:
+            for column in new_columns:
+                batch_op.add_column(column)
+    if 'idx_person_generation_birth_order' not in indexes:
+        op.create_index('idx_person_generation_birth_order', 'persons', ['generation', 'birth_order'])
+
+
+def downgrade():
+    op.drop_index('idx_person_generation_birth_order', table_name='persons')
+    with op.batch_alter_table('persons') as batch_op:
+        batch_op.drop_column('birth_order')
+        batch_op.drop_column('generation')
@@ -30,6 +30,7 @@ class ApiService {
         if (params.gender) queryParams.append('gender', params.gender);
         if (params.skip !== undefined) queryParams.append('skip', params.skip);
         if (params.limit !== undefined) queryParams.append('limit', params.limit);
+        if (params.cursor) queryParams.append('cursor', params.cursor);
 
         return this.request(`/api/persons?${queryParams.toString()}`);
     }
@@ -6,6 +6,9 @@ class PersonList {
         this.totalPersons = 0;
         this.searchKeyword = '';
         this.searchGender = '';
+        // 各页的分页游标（页码 → 上一页返回的 next_cursor），筛选条件变化时清空
+        this.pageCursors = {};
+        this.cursorFilterKey = '';
 
         this.pagination = null;
         this.dataTable = null;
@@ -109,16 +112,27 @@ class PersonList {
 
             this.dataTable?.showLoading();
 
+            const filterKey = `${this.searchKeyword}|${this.searchGender}|${this.pageSize}`;
+            if (filterKey !== this.cursorFilterKey) {
+                this.pageCursors = {};
+                this.cursorFilterKey = filterKey;
+            }
+
+            // 已知该页游标时按游标翻页（避免深分页的 OFFSET 扫描），否则按 skip
             const params = {
                 keyword: this.searchKeyword,
                 gender: this.searchGender,
                 skip: (this.currentPage - 1) * this.pageSize,
-                limit: this.pageSize
+                limit: this.pageSize,
+                cursor: this.pageCursors[this.currentPage]
             };
 
             const result = await ApiService.getPersons(params);
             const persons = result.data || [];
             this.totalPersons = result.total || 0;
+            if (result.next_cursor) {
+                this.pageCursors[this.currentPage + 1] = result.next_cursor;
+            }
 
             if (this.dataTable) {
                 this.dataTable.render(persons);
@@ -0,0 +1,100 @@
+"""
+祖先闭包的批量维护：一批父子关系的增删结果与全量计算一致，且语句数与关系条数无关
+"""
+
+import random
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.ancestry_closure import AncestryClosure
+from app.models.base import Base
+from app.services.ancestry_closure import AncestryClosureService, compute_closure
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'family_tree.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@contextmanager
+def recorded_statements(db):
+    """记录期间执行的 SQL 语句"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def stored_closure(db):
+    rows = db.execute(select(AncestryClosure.ancestor_id, AncestryClosure.descendant_id,
+                             AncestryClosure.depth, AncestryClosure.path_count))
+    return {(a, d, depth): count for a, d, depth, count in rows}
+
+
+def is_ancestor(edges, ancestor_id, person_id):
+    """在 (父母ID, 子女ID) 中判断 ancestor_id 是否为 person_id 本人或祖先"""
+    pending, seen = [person_id], set()
+    while pending:
+        node = pending.pop()
+        if node == ancestor_id:
+            return True
+        if node not in seen:
+            seen.add(node)
+            pending.extend(parent_id for parent_id, child_id in edges if child_id == node)
+    return False
+
+
+def test_batched_pairs_match_full_computation(db):
+    rng = random.Random(0)
+    service = AncestryClosureService(db)
+    edges = []  # 已计入闭包的父子关系
+    for _ in range(30):
+        if edges and rng.random() < 0.4:
+            removed = rng.sample(edges, rng.randint(1, min(5, len(edges))))
+            service.remove_pairs(removed)
+            edges = [edge for edge in edges if edge not in removed]
+        else:
+            # 与关系服务一样，同一对父子只写入一次
+            batch = list(dict.fromkeys(tuple(rng.sample(range(1, 41), 2)) for _ in range(rng.randint(1, 15))))
+            batch = [pair for pair in batch if pair not in edges]
+            service.add_pairs(batch)
+            for parent_id, child_id in batch:
+                if not is_ancestor(edges, child_id, parent_id):
+                    edges.append((parent_id, child_id))
+        assert stored_closure(db) == dict(compute_closure(edges))
+
+
+def test_pairs_in_one_batch_build_on_each_other(db):
+    service = AncestryClosureService(db)
+    service.add_pairs([(1, 2), (2, 3), (3, 4), (4, 1), (3, 3)])
+    assert stored_closure(db) == dict(compute_closure([(1, 2), (2, 3), (3, 4)]))
+
+    service.remove_pairs([(2, 3), (1, 2)])
+    assert stored_closure(db) == {(3, 4, 1): 1}
+
+
+@pytest.mark.parametrize('child_count', [10, 300])
+def test_add_pairs_statement_count_is_constant(db, child_count):
+    service = AncestryClosureService(db)
+    service.add_pairs([(1, 2), (2, 3)])
+    pairs = [(3, 100 + i) for i in range(child_count)]
+
+    with recorded_statements(db) as statements:
+        service.add_pairs(pairs)
+    assert len(stored_closure(db)) == 3 + 3 * child_count
+    assert len(statements) <= 5
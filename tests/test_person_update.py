@@ -0,0 +1,54 @@
+"""
+更新人员：必填列显式置为 null 时返回 422，而不是写库时报 500
+"""
+
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import api_router
+from app.api.dependencies import get_db
+from app.models.base import Base
+from app.models.person import Person
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'family_tree.db'}")
+    Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine, autoflush=False)
+
+    def get_test_db():
+        db = make_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(api_router)
+    app.dependency_overrides[get_db] = get_test_db
+    with make_session() as db:
+        db.add(Person(name='张三', gender='M', birth_date=date(1950, 1, 1), birth_date_type='solar'))
+        db.commit()
+    yield TestClient(app, raise_server_exceptions=False)
+    engine.dispose()
+
+
+@pytest.mark.parametrize('field', ['name', 'gender', 'birth_date', 'birth_date_type'])
+def test_required_field_cannot_be_null(client, field):
+    response = client.put('/api/persons/1', json={field: None})
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', field]
+    assert client.get('/api/persons/1').json()['name'] == '张三'
+
+
+def test_optional_fields_can_be_cleared(client):
+    response = client.put('/api/persons/1', json={'name': '李四', 'phone': None, 'biography': None})
+    assert response.status_code == 200
+    assert response.json()['name'] == '李四'
+    assert response.json()['phone'] is None
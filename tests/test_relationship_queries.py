@@ -0,0 +1,104 @@
+"""
+关系查询的 SQL 语句数：获取某人全部关系的语句数与关联人数无关，只用ID的查询不联表加载人员
+"""
+
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.person import Person
+from app.models.relationship import Relationship
+from app.services.relationship_service import RelationshipService
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'family_tree.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@contextmanager
+def recorded_statements(db):
+    """记录期间执行的 SQL 语句"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def add_family(db, child_count: int) -> int:
+    """一对夫妻及 child_count 个子女，返回父亲ID"""
+    def person(name, gender, year):
+        person = Person(name=name, gender=gender, birth_date=date(year, 1, 1), birth_date_type='solar')
+        db.add(person)
+        return person
+
+    father = person('父亲', 'M', 1950)
+    mother = person('母亲', 'F', 1952)
+    children = [person(f'子女{i}', 'M' if i % 2 else 'F', 1975 + i) for i in range(child_count)]
+    db.flush()
+    db.add(Relationship(from_person_id=father.id, to_person_id=mother.id, relationship_type='spouse',
+                        sub_type='husband', opposite_sub_type='wife'))
+    for child in children:
+        for parent in (father, mother):
+            db.add(Relationship(from_person_id=parent.id, to_person_id=child.id, relationship_type='parent',
+                                sub_type='father' if parent is father else 'mother',
+                                opposite_sub_type='son' if child.gender == 'M' else 'daughter'))
+    father_id = father.id
+    db.commit()
+    db.expunge_all()
+    return father_id
+
+
+def load_details(db, person_id: int):
+    """获取全部关系并读取关联人员的姓名，返回 (各类人数, 执行的语句)"""
+    with recorded_statements(db) as statements:
+        details = RelationshipService(db).get_person_relationship_details(person_id)
+        counts = {category: len([person.name for person, _ in entries]) for category, entries in details.items()}
+    db.expunge_all()
+    return counts, statements
+
+
+def test_person_relationship_details_query_count_is_constant(db):
+    small_family = add_family(db, child_count=1)
+    large_family = add_family(db, child_count=30)
+
+    small_counts, small_statements = load_details(db, small_family)
+    large_counts, large_statements = load_details(db, large_family)
+
+    assert small_counts == {'parents': 0, 'spouses': 1, 'children': 1}
+    assert large_counts == {'parents': 0, 'spouses': 1, 'children': 30}
+    assert len(small_statements) == len(large_statements) == 1
+
+
+def test_relationship_lists_do_not_join_persons(db):
+    father_id = add_family(db, child_count=5)
+    service = RelationshipService(db)
+
+    with recorded_statements(db) as statements:
+        assert len(service.get_all_relationships()) == 22
+        assert len(service.get_relationships(from_person_id=father_id)) == 6
+    assert len(statements) == 2
+    assert not any('JOIN persons' in statement for statement in statements)
+
+    db.expunge_all()
+    with recorded_statements(db) as statements:
+        names = [(edge.from_person.name, edge.to_person.name)
+                 for edge in service.get_all_relationships(load_persons=True)]
+    assert len(names) == 22
+    assert len(statements) == 1